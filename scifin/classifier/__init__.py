@@ -7,7 +7,9 @@ __author__ = "Fabien Nugier"
 The :mod:`scifin.classifier` module includes methods for classification and clustering.
 """
 
-from .classifier import euclidean_distance, dtw_distance
+from .classifier import euclidean_distance, dtw_distance, \
+                         embedding_matrix, neighbor_counts, entropies, \
+                         sample_entropy, approximate_entropy, entropy_features
 
 
 
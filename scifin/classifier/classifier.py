@@ -6,11 +6,14 @@
 from datetime import datetime
 from datetime import timedelta
 import random as random
+from concurrent.futures import ProcessPoolExecutor
 
 # Third party imports
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.spatial import cKDTree
 
 # Local application imports
 from .. import timeseries
@@ -114,5 +117,222 @@ def dtw_distance(ts1, ts2, window=None):
 
 
 
+### COMPLEXITY MEASURES ###
 
-#---------#---------#---------#---------#---------#---------#---------#---------#---------#
\ No newline at end of file
+def embedding_matrix(x, m, delay=1):
+    """
+    Returns the delay embedding matrix of a series, whose rows are
+    the templates (x_i, x_{i+delay}, ..., x_{i+(m-1)delay}).
+    
+    Parameters
+    ----------
+    x : numpy.ndarray
+      Values of the series.
+    m : int
+      Embedding dimension.
+    delay : int
+      Delay between coordinates.
+      
+    Returns
+    -------
+    numpy.ndarray
+      Read-only view of shape (n-(m-1)delay, m).
+    """
+    
+    x = np.asarray(x, dtype=float)
+    
+    return sliding_window_view(x, (m-1)*delay+1)[:, ::delay]
+
+
+def neighbor_counts(x, m, r):
+    """
+    Returns the number of templates of length m and m+1 within a
+    Chebyshev distance r of each template (itself included).
+    
+    Parameters
+    ----------
+    x : numpy.ndarray
+      Values of the series.
+    m : int
+      Embedding dimension.
+    r : float
+      Tolerance (absolute).
+      
+    Returns
+    -------
+    numpy.ndarray, numpy.ndarray
+      Counts for the n-m+1 templates of length m
+      and for the n-m templates of length m+1.
+      
+    Notes
+    -----
+      Counting uses range queries on KD-trees, which scales close to
+      O(n log n) for usual tolerances instead of O(n^2) for all pairs.
+    """
+    
+    counts = []
+    for dim in [m, m+1]:
+        E = embedding_matrix(x, dim)
+        tree = cKDTree(E)
+        counts.append(tree.query_ball_point(E, r, p=np.inf, return_length=True))
+    
+    return counts[0], counts[1]
+
+
+def entropies(x, m=2, r=0.2, relative=True):
+    """
+    Returns the sample entropy and the approximate entropy of an array of values.
+    
+    Parameters
+    ----------
+    x : numpy.ndarray
+      Values of the series.
+    m : int
+      Embedding dimension.
+    r : float
+      Tolerance.
+    relative : bool
+      If True, the tolerance is r times the standard deviation of the values.
+      
+    Returns
+    -------
+    float, float
+      Sample entropy and approximate entropy.
+    """
+    
+    # Checks
+    x = np.asarray(x, dtype=float).flatten()
+    assert(isinstance(m, int) and m>0)
+    if len(x) <= m+1:
+        raise ValueError("Series is too short for embedding dimension m.")
+    
+    # Initializations
+    n = len(x)
+    if relative:
+        r = r * np.std(x)
+    Cm, Cm1 = neighbor_counts(x, m, r)
+    
+    # Sample entropy: pairs of distinct templates among the first n-m templates,
+    # removing the matches with the last template of length m by symmetry
+    B = np.sum(Cm[:n-m] - 1) - (Cm[n-m] - 1)
+    A = np.sum(Cm1 - 1)
+    sampen = -np.log(A / B) if (A > 0 and B > 0) else np.inf
+    
+    # Approximate entropy: self-matches included
+    phi_m = np.mean(np.log(Cm / (n-m+1)))
+    phi_m1 = np.mean(np.log(Cm1 / (n-m)))
+    apen = phi_m - phi_m1
+    
+    return sampen, apen
+
+
+def sample_entropy(ts, m=2, r=0.2, relative=True):
+    """
+    Returns the sample entropy (SampEn) of a TimeSeries.
+    
+    Parameters
+    ----------
+    ts : TimeSeries
+      Time series to analyse.
+    m : int
+      Embedding dimension.
+    r : float
+      Tolerance.
+    relative : bool
+      If True, the tolerance is r times the standard deviation of the series.
+      
+    Returns
+    -------
+    float
+      Sample entropy, infinite when no template of length m+1 matches.
+      
+    Notes
+    -----
+      To learn more about sample entropy, please refer to:
+      https://en.wikipedia.org/wiki/Sample_entropy
+    """
+    
+    # Checks
+    if ts.type != 'TimeSeries':
+        raise TypeError("Series has to be of type TimeSeries.")
+    
+    return entropies(ts.data.values, m=m, r=r, relative=relative)[0]
+
+
+def approximate_entropy(ts, m=2, r=0.2, relative=True):
+    """
+    Returns the approximate entropy (ApEn) of a TimeSeries.
+    
+    Parameters
+    ----------
+    ts : TimeSeries
+      Time series to analyse.
+    m : int
+      Embedding dimension.
+    r : float
+      Tolerance.
+    relative : bool
+      If True, the tolerance is r times the standard deviation of the series.
+      
+    Returns
+    -------
+    float
+      Approximate entropy.
+      
+    Notes
+    -----
+      To learn more about approximate entropy, please refer to:
+      https://en.wikipedia.org/wiki/Approximate_entropy
+    """
+    
+    # Checks
+    if ts.type != 'TimeSeries':
+        raise TypeError("Series has to be of type TimeSeries.")
+    
+    return entropies(ts.data.values, m=m, r=r, relative=relative)[1]
+
+
+def entropy_features(Series, m=2, r=0.2, relative=True, n_jobs=1):
+    """
+    Returns the sample and approximate entropies of many time series,
+    e.g. as features for classification.
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Time series or panel.
+    m : int
+      Embedding dimension.
+    r : float
+      Tolerance.
+    relative : bool
+      If True, the tolerance is r times the standard deviation of each series.
+    n_jobs : int
+      Number of processes used to treat series in parallel.
+      
+    Returns
+    -------
+    DataFrame
+      Sample and approximate entropies, one row per series.
+    """
+    
+    # Initializations
+    panel = timeseries.build_panel(Series)
+    columns = [panel[c].dropna().values for c in panel.columns]
+    args = ([m]*len(columns), [r]*len(columns), [relative]*len(columns))
+    
+    # Loop over series, in parallel if required
+    if n_jobs == 1:
+        results = list(map(entropies, columns, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(entropies, columns, *args))
+    
+    return pd.DataFrame(data=results, index=panel.columns,
+                        columns=['sample_entropy', 'approximate_entropy'])
+
+
+
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
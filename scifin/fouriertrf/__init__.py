@@ -1,3 +1,9 @@
 # __init__.py
 __version__ = "0.0.9"
 __author__ = "Fabien Nugier"
+
+"""
+The :mod:`scifin.fouriertrf` module includes methods based on Fourier transforms.
+"""
+
+from .fouriertrf import cross_correlation, lead_lag, lead_lag_panel
@@ -10,10 +10,171 @@ from datetime import datetime
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+from scipy import fft as sfft
 
 # Local application imports
-# /
+from .. import timeseries
 
 
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
 
 
+def standardized_transforms(X, nfft):
+    """
+    Returns the real Fourier transforms of standardized series (zero mean,
+    unit variance), zero-padded to nfft points.
+    
+    Parameters
+    ----------
+    X : numpy.ndarray
+      Values of shape (T, N), one column per series.
+    nfft : int
+      Length of the transforms.
+    
+    Returns
+    -------
+    numpy.ndarray
+      Transforms of shape (N, nfft//2+1).
+    """
+    
+    Z = (X - X.mean(axis=0)) / X.std(axis=0)
+    
+    return sfft.rfft(Z.T, n=nfft, axis=1)
+
+
+def lags_from_circular(circ, T, max_lag):
+    """
+    Reorders circular cross-correlations into lags -max_lag, ..., max_lag.
+    """
+    
+    return np.concatenate([circ[..., circ.shape[-1]-max_lag:], circ[..., :max_lag+1]], axis=-1) / T
+
+
+def cross_correlation(ts1, ts2, max_lag=None):
+    """
+    Returns the cross-correlation between two TimeSeries for all lags,
+    computed with Fast Fourier Transforms in O(T log T).
+    
+    The cross-correlation at lag l is the correlation between x_t and y_{t+l},
+    so that a peak at a positive lag means that ts1 leads ts2.
+    
+    Parameters
+    ----------
+    ts1 : TimeSeries
+      First time series.
+    ts2 : TimeSeries
+      Second time series.
+    max_lag : int or None
+      Maximum lag to return. If None, all lags up to T-1 are returned.
+    
+    Returns
+    -------
+    Pandas Series
+      Cross-correlation values indexed by lag.
+    
+    Notes
+    -----
+      Series are standardized and the sums are divided by T,
+      i.e. the usual (biased) estimator of the autocorrelation function.
+    """
+    
+    # Checks and initializations
+    panel = timeseries.build_panel([ts1, ts2])
+    T = panel.shape[0]
+    max_lag = T-1 if max_lag is None else max_lag
+    assert(isinstance(max_lag, int) and 0 <= max_lag < T)
+    nfft = sfft.next_fast_len(2*T-1, real=True)
+    
+    # Cross-correlation from the product of transforms
+    F = standardized_transforms(panel.values, nfft)
+    circ = sfft.irfft(np.conj(F[0]) * F[1], n=nfft)
+    xcorr = lags_from_circular(circ, T, max_lag)
+    
+    return pd.Series(index=np.arange(-max_lag, max_lag+1), data=xcorr)
+
+
+def lead_lag(ts1, ts2, max_lag=None):
+    """
+    Returns the lag at which the absolute cross-correlation between
+    two TimeSeries is maximal, and the cross-correlation at that lag.
+    
+    Parameters
+    ----------
+    ts1 : TimeSeries
+      First time series.
+    ts2 : TimeSeries
+      Second time series.
+    max_lag : int or None
+      Maximum lag to scan.
+    
+    Returns
+    -------
+    int, float
+      Peak lag (positive when ts1 leads ts2) and peak correlation.
+    """
+    
+    xcorr = cross_correlation(ts1, ts2, max_lag=max_lag)
+    peak = np.argmax(np.abs(xcorr.values))
+    
+    return int(xcorr.index[peak]), float(xcorr.values[peak])
+
+
+def lead_lag_panel(Series, max_lag, batch_size=256):
+    """
+    Scans all pairs of series of a panel for lead-lag relationships,
+    i.e. the lag of maximal absolute cross-correlation for each pair.
+    
+    Parameters
+    ----------
+    Series : list of TimeSeries or DataFrame
+      Panel of time series sharing the same index.
+    max_lag : int
+      Maximum lag to scan.
+    batch_size : int
+      Number of pairs whose inverse transforms are computed together.
+    
+    Returns
+    -------
+    DataFrame, DataFrame
+      Peak lags and peak correlations (N, N). The element [i,j]
+      refers to the pair (i,j), a positive lag meaning that i leads j.
+    
+    Notes
+    -----
+      The transform of each series is computed once and reused
+      for all the pairs it belongs to. Pairs are processed by batches
+      of inverse transforms to keep memory bounded.
+    """
+    
+    # Initializations
+    panel = timeseries.build_panel(Series)
+    T, N = panel.shape
+    assert(isinstance(max_lag, int) and 0 <= max_lag < T)
+    nfft = sfft.next_fast_len(2*T-1, real=True)
+    F = standardized_transforms(panel.values, nfft)
+    
+    # List of pairs (i<j)
+    I, J = np.triu_indices(N, k=1)
+    peak_lag = np.zeros((N,N), dtype=int)
+    peak_corr = np.eye(N)
+    lags = np.arange(-max_lag, max_lag+1)
+    
+    # Batches of pairs
+    for b in range(0, len(I), batch_size):
+        i, j = I[b:b+batch_size], J[b:b+batch_size]
+        circ = sfft.irfft(np.conj(F[i]) * F[j], n=nfft, axis=1)
+        xcorr = lags_from_circular(circ, T, max_lag)
+        peak = np.argmax(np.abs(xcorr), axis=1)
+        peak_lag[i,j] = lags[peak]
+        peak_lag[j,i] = -lags[peak]
+        peak_corr[i,j] = peak_corr[j,i] = xcorr[np.arange(len(i)), peak]
+    
+    names = panel.columns
+    
+    return pd.DataFrame(peak_lag, index=names, columns=names), \
+           pd.DataFrame(peak_corr, index=names, columns=names)
+
+
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
@@ -19,3 +19,5 @@ from .simuldata  import create_market, set_market_names, is_index_valid, create_
                         visualize_portfolios_1, visualize_portfolios_2, show_allocation_distrib, \
                         config_4n, plot_diff_GenPort_CW, plot_asset_evol
 
+from .factors    import windowed_sums, rolling_regression, rolling_beta
+
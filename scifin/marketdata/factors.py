@@ -0,0 +1,213 @@
+# Created on 2020/9/17
+
+# This module is for regressing assets on factors such as market indices.
+
+# Standard library imports
+# /
+
+# Third party imports
+import numpy as np
+import pandas as pd
+
+# Local application imports
+from .. import timeseries as ts
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+def windowed_sums(values, window=None):
+    """
+    Returns the sums of values over rolling windows (or expanding windows
+    when window is None) along the first axis, from cumulative sums.
+    
+    Parameters
+    ----------
+    values : numpy.ndarray
+      Values of shape (T, ...).
+    window : int or None
+      Size of the rolling window.
+    
+    Returns
+    -------
+    numpy.ndarray
+      Sums of shape (T, ...), where element t sums values up to t included.
+    """
+    
+    S = np.cumsum(values, axis=0)
+    if window is None:
+        return S
+    
+    out = S.copy()
+    out[window:] -= S[:-window]
+    
+    return out
+
+
+def singular_windows(Sxx, f_var, rtol=1e-8):
+    """
+    Returns the windows in which the factors are (nearly) collinear or constant,
+    from the windowed sums of cross-products of the intercept and factors.
+    
+    Parameters
+    ----------
+    Sxx : numpy.ndarray
+      Windowed sums of shape (T, K+1, K+1), the intercept being first.
+    f_var : numpy.ndarray
+      Variances of the K factors over the whole sample, used as scales.
+    rtol : float
+      Threshold on the smallest eigenvalue of the scaled window covariance.
+    
+    Returns
+    -------
+    numpy.ndarray
+      Boolean array of shape (T,).
+    """
+    
+    n = Sxx[:,0,0]
+    m = Sxx[:,0,1:]
+    scale = np.sqrt(np.outer(f_var, f_var))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        C = (Sxx[:,1:,1:] - m[:,:,None] * m[:,None,:] / n[:,None,None]) / (n[:,None,None] * scale)
+    ok = np.isfinite(C).all(axis=(1,2))
+    eig = np.full(len(n), -np.inf)
+    eig[ok] = np.linalg.eigvalsh(C[ok])[:,0]
+    
+    return ~(eig > rtol)
+
+
+def rolling_regression(assets, factors, window=None, min_periods=None):
+    """
+    Regresses many assets on one or more factors (e.g. an EW or CW market index)
+    over rolling windows, or expanding windows when window is None.
+    
+    The model is, for each asset i and each window:
+    y_{it} = alpha_i + Sum_k beta_{ik} f_{kt} + e_{it}.
+    
+    Parameters
+    ----------
+    assets : DataFrame, TimeSeries or list of TimeSeries
+      Panel of asset values (T, N), typically returns.
+    factors : DataFrame, TimeSeries or list of TimeSeries
+      Panel of factor values (T, K) with the same index as assets.
+    window : int or None
+      Size of the rolling window. If None, expanding windows are used.
+    min_periods : int or None
+      Minimum number of observations to return a value. Default is window,
+      or K+2 for expanding windows.
+    
+    Returns
+    -------
+    dict
+      'alpha' (DataFrame T x N), 'betas' (dict of DataFrames T x N, one per factor),
+      'resid_vol' (DataFrame T x N) and 'r2' (DataFrame T x N).
+      Dates with fewer than min_periods observations have NaN values.
+    
+    Notes
+    -----
+      Rolling sums of the cross-products f f', f y and y^2 are obtained from
+      cumulative sums, and the (K+1) x (K+1) normal equations of all windows
+      are solved at once, which costs O(T N K^2) without any loop over windows.
+      Values are centered beforehand to limit round-off errors in cumulative sums.
+      Missing (NaN) values are zeroed in the sums and excluded from the counts
+      of observations, so that they only affect the windows containing them.
+      Assets with missing values need their own factor cross-products
+      and are solved one by one.
+      Windows in which the factors are constant or collinear, relative to
+      their variances over the whole sample, give NaN values.
+    """
+    
+    # Initializations
+    Y_df = ts.build_panel(assets)
+    F_df = ts.build_panel(factors)
+    if not Y_df.index.equals(F_df.index):
+        raise IndexError("Assets and factors need to have the same index.")
+    Y = Y_df.values.astype(float)
+    F = F_df.values.astype(float)
+    T, N = Y.shape
+    K = F.shape[1]
+    if min_periods is None:
+        min_periods = window if window is not None else K+2
+    assert(min_periods >= K+2)
+    
+    # Masks of valid observations
+    valid_f = np.isfinite(F).all(axis=1)
+    valid_y = np.isfinite(Y) & valid_f[:,None]
+    
+    # Center values, add the intercept and zero the missing values
+    y_mean = np.nanmean(np.where(valid_y, Y, np.nan), axis=0)
+    f_mean = F[valid_f].mean(axis=0)
+    Yc = np.where(valid_y, Y - y_mean, 0.)
+    X = np.concatenate([np.ones((T,1)), F - f_mean], axis=1)
+    X = np.where(valid_f[:,None], X, 0.)
+    
+    # Windowed sums of cross-products and numbers of observations
+    Sxx = windowed_sums(X[:,:,None] * X[:,None,:], window)
+    Sxy = windowed_sums(X[:,:,None] * Yc[:,None,:], window)
+    Syy = windowed_sums(Yc**2, window)
+    n = windowed_sums(valid_y.astype(float), window)
+    
+    # Solve the normal equations of all windows, except where the factors are constant
+    f_var = np.maximum(F[valid_f].var(axis=0), 1e-300)
+    valid = (n >= min_periods) & ~singular_windows(Sxx, f_var)[:,None]
+    B = np.full((T,K+1,N), np.nan)
+    complete = np.flatnonzero(valid_y.sum(axis=0) == valid_f.sum())
+    rows = valid[:,complete].any(axis=1) if len(complete) > 0 else np.zeros(T, dtype=bool)
+    B[np.ix_(rows, np.arange(K+1), complete)] = np.linalg.solve(Sxx[rows], Sxy[rows][:,:,complete])
+    for i in np.setdiff1d(np.arange(N), complete):
+        Xi = X * valid_y[:,i,None]
+        Sxx_i = windowed_sums(Xi[:,:,None] * Xi[:,None,:], window)
+        rows_i = valid[:,i] & ~singular_windows(Sxx_i, f_var)
+        valid[:,i] = rows_i
+        B[rows_i,:,i] = np.linalg.solve(Sxx_i[rows_i], Sxy[rows_i,:,i,None])[:,:,0]
+    B[~np.broadcast_to(valid[:,None,:], B.shape)] = np.nan
+    
+    # Residual volatility and R^2
+    ssr = Syy - np.einsum('tkn,tkn->tn', B, Sxy)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sst = Syy - Sxy[:,0,:]**2 / n
+        resid_vol = np.sqrt(np.maximum(ssr, 0.) / (n - K - 1))
+        r2 = 1. - ssr / sst
+    
+    # Intercept back in original (uncentered) units
+    alpha = B[:,0,:] + y_mean[None,:] - np.einsum('tkn,k->tn', B[:,1:,:], f_mean)
+    
+    # Make data frames
+    idx, cols = Y_df.index, Y_df.columns
+    results = {'alpha': pd.DataFrame(alpha, index=idx, columns=cols),
+               'betas': {f: pd.DataFrame(B[:,k+1,:], index=idx, columns=cols)
+                         for k,f in enumerate(F_df.columns)},
+               'resid_vol': pd.DataFrame(resid_vol, index=idx, columns=cols),
+               'r2': pd.DataFrame(r2, index=idx, columns=cols)}
+    
+    return results
+
+
+def rolling_beta(assets, index, window=None):
+    """
+    Returns the rolling (or expanding) betas of many assets
+    with respect to a single index, e.g. from market_EWindex().
+    
+    Parameters
+    ----------
+    assets : DataFrame, TimeSeries or list of TimeSeries
+      Panel of asset values (T, N), typically returns.
+    index : TimeSeries or DataFrame
+      Index values (T, 1) with the same index as assets.
+    window : int or None
+      Size of the rolling window. If None, expanding windows are used.
+    
+    Returns
+    -------
+    DataFrame
+      Betas of shape (T, N).
+    """
+    
+    results = rolling_regression(assets, index, window=window)
+    
+    return list(results['betas'].values())[0]
+
+
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
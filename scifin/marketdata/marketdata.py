@@ -255,7 +255,8 @@ def market_EWindex(market, name="Market EW Index"):
     """
     
     # Checks
-    assert(asset.count(np.nan)!=0)
+    if market.isnull().values.any():
+        raise ValueError("Market contains NaN values, clean it first (e.g. with timeseries.clean_series).")
     
     df = pd.DataFrame(market.sum(axis=1))
     EWindex_ts = ts.TimeSeries(df, name=name)
@@ -6,5 +6,6 @@ __author__ = "Fabien Nugier"
 The :mod:`scifin.montecarlo` module includes methods for Monte Carlo simulations.
 """
 
-from .montecarlo import generate_series
+from .montecarlo import generate_series, simulate_panel, aggregate_series, \
+                         RunningMoments, HistogramQuantiles, P2Quantiles, StreamingHistogram
 
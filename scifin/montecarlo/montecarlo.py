@@ -6,6 +6,10 @@
 from datetime import datetime
 from datetime import timedelta
 import random as random
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import inspect
+import warnings
 
 # Third party imports
 import matplotlib.pyplot as plt
@@ -19,7 +23,7 @@ from .. import timeseries
 #---------#---------#---------#---------#---------#---------#---------#---------#---------#
 
 # start_date=None, end_date=None, frequency=None, n=1, 
-def generate_series(n=1, series_model=None, **kwargs):
+def generate_series(n=1, series_model=None, seed=None, n_jobs=1, as_panel=False, chunk_size=10000, **kwargs):
     """
     Generate a list of `n` series of the type `series_model`.
     Here all series have the same building parameters.
@@ -29,28 +33,713 @@ def generate_series(n=1, series_model=None, **kwargs):
     n : int
       Number of time series to be generated.
     series_model : function
-      TimeSeries generating function.
+      TimeSeries generating function, accepting a `seed` argument
+      (e.g. from timeseries.randomseries) when seed is not None or n_jobs > 1.
+    seed : None, int or SeedSequence
+      Root seed from which an independent stream is spawned for each series.
+      If None and n_jobs=1, the global NumPy random state is used.
+    n_jobs : int
+      Number of processes generating series in parallel.
+    as_panel : bool
+      Option to return a panel instead of a list, using simulate_panel().
+    chunk_size : int
+      Number of series generated per chunk when as_panel is True.
+      Each chunk has its own stream, so results for a given seed depend on it.
     **kwargs
         Arbitrary keyword arguments.
       
     Returns
     -------
-    List of TimeSeries
-      The n time series that were generated.
+    List of TimeSeries or DataFrame
+      The n time series that were generated, or a panel with one column per series.
+    
+    Notes
+    -----
+      Results for a given seed do not depend on n_jobs, since
+      the stream of each series is fixed before distributing the work.
     """
     
     # Checks
     assert(isinstance(n,int))
-
-    # Create list
-    L = []
-    for i in range(n):
-        L.append(series_model(**kwargs))
+    assert(isinstance(n_jobs,int) and n_jobs>0)
+    
+    if as_panel:
+        return simulate_panel(n, series_model, seed=seed, n_jobs=n_jobs, chunk_size=chunk_size, **kwargs)
+    
+    # Global random state
+    if seed is None and n_jobs == 1:
+        return [series_model(**kwargs) for i in range(n)]
+    
+    # Independent streams, one per series
+    generators = timeseries.spawn_generators(n, seed=seed)
+    model = functools.partial(call_with_seed, series_model, kwargs)
+    if n_jobs == 1:
+        L = list(map(model, generators))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            L = list(executor.map(model, generators))
     
     return L
 
 
+def call_with_seed(series_model, kwargs, seed):
+    """
+    Calls a series generating function with a given seed.
+    """
+    return series_model(seed=seed, **kwargs)
+
+
+def model_capabilities(series_model):
+    """
+    Returns the names of the arguments of a series generating function
+    among 'n_paths', 'as_array', 'seed' and 'verbose'.
+    """
+    
+    parameters = inspect.signature(series_model).parameters
+    
+    return {x for x in ['n_paths', 'as_array', 'seed', 'verbose'] if x in parameters}
+
+
+def simulate_chunk(series_model, kwargs, n_paths, seed):
+    """
+    Generates a chunk of paths of a series generating function.
+    
+    Parameters
+    ----------
+    series_model : function
+      TimeSeries generating function.
+    kwargs : dict
+      Keyword arguments of the function.
+    n_paths : int
+      Number of paths of the chunk.
+    seed : SeedSequence or None
+      Seed of the chunk, None to use the global NumPy random state.
+    
+    Returns
+    -------
+    numpy.ndarray, Index or None
+      Values of shape (n_paths, T), and the index of the series
+      if it was built (i.e. for non-vectorized functions).
+    
+    Notes
+    -----
+      Vectorized functions (accepting n_paths and as_array) generate the
+      chunk in one call. Other functions are called once per path, each
+      with its own stream spawned from the seed of the chunk, or after
+      seeding the global random state if they do not accept a seed.
+      In the latter case, the global random state of the caller is restored.
+    """
+    
+    capabilities = model_capabilities(series_model)
+    kwargs = dict(kwargs)
+    if 'verbose' in capabilities:
+        kwargs.setdefault('verbose', False)
+    
+    # Vectorized generators
+    if {'n_paths', 'as_array', 'seed'} <= capabilities:
+        values = series_model(n_paths=n_paths, as_array=True, seed=seed, **kwargs)
+        return np.asarray(values).reshape(n_paths, -1), None
+    
+    # Other generators, one path at a time
+    if 'seed' in capabilities:
+        seeds = [None] * n_paths if seed is None else seed.spawn(n_paths)
+        series = [series_model(seed=s, **kwargs) for s in seeds]
+    elif seed is None:
+        series = [series_model(**kwargs) for i in range(n_paths)]
+    else:
+        # Seed the global random state, then restore the caller's one
+        state = np.random.get_state()
+        try:
+            np.random.seed(seed.generate_state(4))
+            series = [series_model(**kwargs) for i in range(n_paths)]
+        finally:
+            np.random.set_state(state)
+    values = np.array([x.data.values.flatten() for x in series])
+    
+    return values, series[0].data.index
+
+
+def iterate_chunks(n, series_model, seed=None, n_jobs=1, chunk_size=10000, **kwargs):
+    """
+    Generates `n` series of the type `series_model` by chunks, in order.
+    
+    Parameters
+    ----------
+    n : int
+      Number of time series to be generated.
+    series_model : function
+      TimeSeries generating function.
+    seed : None, int or SeedSequence
+      Root seed from which an independent stream is spawned for each chunk.
+      If None and n_jobs=1, the global NumPy random state is used.
+    n_jobs : int
+      Number of processes generating chunks in parallel.
+    chunk_size : int
+      Number of series generated per chunk.
+      Each chunk has its own stream, so results for a given seed depend on it.
+    **kwargs
+        Arbitrary keyword arguments.
+    
+    Yields
+    ------
+    numpy.ndarray, Index or None
+      Values of each chunk, of shape (chunk_size, T), and the index of the series
+      (see simulate_chunk()).
+    
+    Notes
+    -----
+      With a process pool, at most 2 n_jobs chunks are pending at any time,
+      so that memory does not grow with the number of chunks.
+    """
+    
+    # Checks
+    assert(isinstance(n,int) and n>0)
+    assert(isinstance(n_jobs,int) and n_jobs>0)
+    assert(isinstance(chunk_size,int) and chunk_size>0)
+    
+    # Chunks and their independent streams
+    sizes = [min(chunk_size, n - i) for i in range(0, n, chunk_size)]
+    if seed is None and n_jobs == 1:
+        seeds = [None] * len(sizes)
+    else:
+        root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        seeds = root.spawn(len(sizes))
+    
+    # Generate chunks
+    if n_jobs == 1:
+        for size, s in zip(sizes, seeds):
+            yield simulate_chunk(series_model, kwargs, size, s)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            pending = []
+            for size, s in zip(sizes, seeds):
+                pending.append(executor.submit(simulate_chunk, series_model, kwargs, size, s))
+                if len(pending) >= 2 * n_jobs:
+                    yield pending.pop(0).result()
+            for future in pending:
+                yield future.result()
+
+
+def shared_index(index, kwargs):
+    """
+    Returns the index shared by simulated series, built from the dates
+    in the keyword arguments when chunks did not return one.
+    """
+    
+    if index is None and {'start_date', 'end_date', 'frequency'} <= set(kwargs):
+        index = timeseries.date_index(kwargs['start_date'], kwargs['end_date'], kwargs['frequency'])
+        if kwargs.get('tz') is not None:
+            index = index.tz_localize(kwargs['tz'])
+    
+    return index
+
+
+def simulate_panel(n, series_model, seed=None, n_jobs=1, chunk_size=10000, **kwargs):
+    """
+    Generates `n` series of the type `series_model` and returns them as a panel.
+    
+    Parameters
+    ----------
+    n : int
+      Number of time series to be generated.
+    series_model : function
+      TimeSeries generating function.
+    seed : None, int or SeedSequence
+      Root seed from which an independent stream is spawned for each chunk.
+      If None and n_jobs=1, the global NumPy random state is used.
+    n_jobs : int
+      Number of processes generating chunks in parallel.
+    chunk_size : int
+      Number of series generated per chunk.
+      Each chunk has its own stream, so results for a given seed depend on it.
+    **kwargs
+        Arbitrary keyword arguments.
+    
+    Returns
+    -------
+    DataFrame
+      Panel with one column per series, sharing a single index.
+    
+    Notes
+    -----
+      Vectorized generators (e.g. from timeseries.randomseries) produce a block of
+      chunk_size paths as a raw array in a single call, so that no TimeSeries is
+      built per path. Other generators are called path by path within chunks.
+      Chunks are distributed over a process pool when n_jobs > 1.
+      Results for a given seed do not depend on n_jobs, but they do depend
+      on chunk_size, since each chunk draws from its own stream.
+    """
+    
+    # Assemble the panel directly in its final layout
+    values = None
+    start = 0
+    for x, index in iterate_chunks(n, series_model, seed=seed, n_jobs=n_jobs,
+                                   chunk_size=chunk_size, **kwargs):
+        if values is None:
+            values = np.empty((x.shape[1], n))
+            first_index = index
+        values[:, start:start + x.shape[0]] = x.T
+        start += x.shape[0]
+    
+    return pd.DataFrame(values, index=shared_index(first_index, kwargs))
+
+
+
+### STREAMING AGGREGATORS ###
+
+# These classes summarize paths chunk by chunk, in a memory independent
+# of the number of paths. Chunks are arrays of shape (n_paths, T).
+
+class RunningMoments:
+    """
+    Class computing the running mean and variance of paths at each date,
+    with Welford's algorithm generalized to chunks (Chan et al.).
+    
+    Attributes
+    ----------
+    count : int
+      Number of paths aggregated.
+    mean : numpy.ndarray
+      Mean at each date.
+    m2 : numpy.ndarray
+      Sum of squared deviations from the mean at each date.
+    """
+    
+    def __init__(self):
+        """
+        Initializes the aggregator.
+        """
+        self.count = 0
+        self.mean = None
+        self.m2 = None
+    
+    
+    def update(self, X):
+        """
+        Adds a chunk of paths of shape (n_paths, T).
+        """
+        
+        X = np.asarray(X, dtype=float)
+        n = X.shape[0]
+        mean = X.mean(axis=0)
+        m2 = np.sum((X - mean)**2, axis=0)
+        
+        if self.count == 0:
+            self.count, self.mean, self.m2 = n, mean, m2
+            return
+        
+        # Merge of the two sets of moments
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean = self.mean + delta * n / total
+        self.m2 = self.m2 + m2 + delta**2 * self.count * n / total
+        self.count = total
+    
+    
+    def variance(self, ddof=1):
+        """
+        Returns the variance at each date.
+        """
+        return self.m2 / (self.count - ddof)
+    
+    
+    def result(self, index=None):
+        """
+        Returns the mean and standard deviation at each date.
+        """
+        return pd.DataFrame({'mean': self.mean, 'std': np.sqrt(self.variance())}, index=index)
+
+
+
+class P2Quantiles:
+    """
+    Class estimating quantiles of paths at each date with the P-square algorithm
+    of Jain and Chlamtac (1985), which keeps 5 markers per quantile and date.
+    
+    Attributes
+    ----------
+    probs : numpy.ndarray
+      Probabilities of the quantiles.
+    count : int
+      Number of paths aggregated.
+    heights : numpy.ndarray
+      Heights of the markers, of shape (5, n_probs, T).
+    positions : numpy.ndarray
+      Positions of the markers, of shape (5, n_probs, T).
+    
+    Notes
+    -----
+      Observations are processed one path at a time, but each update
+      is vectorized over all dates and quantiles. Estimates are exact
+      for up to 5 paths and approximate afterwards.
+      The cost is a few dozen NumPy operations per path, i.e. about 0.3 s
+      per thousand paths of 250 dates, and extreme quantiles can converge
+      slowly when the first paths are unrepresentative. For many paths,
+      HistogramQuantiles is much faster and is the recommended choice.
+    """
+    
+    def __init__(self, probs=(0.05, 0.5, 0.95)):
+        """
+        Initializes the aggregator.
+        """
+        
+        self.probs = np.asarray(probs, dtype=float)
+        assert(np.all((self.probs > 0) & (self.probs < 1)))
+        self.count = 0
+        self.first = []
+        self.heights = None
+        self.positions = None
+        p = self.probs
+        self.increments = np.stack([0.*p, p/2, p, (1+p)/2, 1.+0.*p])
+    
+    
+    def update(self, X):
+        """
+        Adds a chunk of paths of shape (n_paths, T).
+        """
+        for x in np.asarray(X, dtype=float):
+            self.add(x)
+    
+    
+    def add(self, x):
+        """
+        Adds a single path of shape (T,).
+        """
+        
+        self.count += 1
+        
+        # Initialization with the first 5 paths
+        if self.heights is None:
+            self.first.append(x)
+            if len(self.first) == 5:
+                q = np.sort(np.array(self.first), axis=0)
+                shape = (5, len(self.probs), len(x))
+                self.heights = np.broadcast_to(q[:,np.newaxis,:], shape).copy()
+                self.positions = np.broadcast_to(np.arange(5.)[:,np.newaxis,np.newaxis], shape).copy()
+                self.desired = np.broadcast_to((4 * self.increments)[:,:,np.newaxis], shape).copy()
+                self.first = []
+            return
+        
+        q, n = self.heights, self.positions
+        
+        # Cell of the new observation and update of extreme markers
+        q[0] = np.minimum(q[0], x)
+        q[4] = np.maximum(q[4], x)
+        k = np.sum(x >= q[1:4], axis=0)
+        n += np.arange(5)[:,np.newaxis,np.newaxis] > k
+        self.desired += self.increments[:,:,np.newaxis]
+        
+        # Adjustment of the middle markers
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            move = ((d >= 1) & (n[i+1] - n[i] > 1)) | ((d <= -1) & (n[i-1] - n[i] < -1))
+            d = np.sign(d)
+            parabolic = q[i] + d / (n[i+1] - n[i-1]) * (
+                (n[i] - n[i-1] + d) * (q[i+1] - q[i]) / (n[i+1] - n[i])
+                + (n[i+1] - n[i] - d) * (q[i] - q[i-1]) / (n[i] - n[i-1]))
+            neighbor_q = np.where(d > 0, q[i+1], q[i-1])
+            neighbor_n = np.where(d > 0, n[i+1], n[i-1])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                linear = q[i] + d * (neighbor_q - q[i]) / (neighbor_n - n[i])
+            inside = (q[i-1] < parabolic) & (parabolic < q[i+1])
+            q[i] = np.where(move, np.where(inside, parabolic, linear), q[i])
+            n[i] = n[i] + np.where(move, d, 0.)
+    
+    
+    def quantiles(self):
+        """
+        Returns the estimated quantiles of shape (n_probs, T).
+        """
+        
+        if self.heights is None:
+            return np.quantile(np.array(self.first), self.probs, axis=0)
+        
+        return self.heights[2].copy()
+    
+    
+    def result(self, index=None):
+        """
+        Returns the estimated quantiles at each date, one column per probability.
+        """
+        return pd.DataFrame(self.quantiles().T, index=index, columns=self.probs)
+
+
+
+class StreamingHistogram:
+    """
+    Class accumulating histograms of paths with fixed bins,
+    at each date or only at the last date (terminal values).
+    
+    Attributes
+    ----------
+    edges : numpy.ndarray
+      Edges of the bins.
+    terminal : bool
+      Whether only terminal values are accumulated.
+    counts : numpy.ndarray
+      Counts of shape (T, n_bins), or (1, n_bins) for terminal values.
+    underflow : numpy.ndarray
+      Counts of values below the first edge, at each date.
+    overflow : numpy.ndarray
+      Counts of values above the last edge, at each date.
+    """
+    
+    def __init__(self, bins=100, range=None, terminal=True):
+        """
+        Initializes the aggregator. The bins are given by a number of bins
+        in a (min, max) range, or directly by their edges.
+        """
+        
+        if np.ndim(bins) == 0:
+            assert(range is not None)
+            self.edges = np.linspace(range[0], range[1], bins + 1)
+        else:
+            self.edges = np.asarray(bins, dtype=float)
+        self.terminal = terminal
+        self.counts = None
+        self.underflow = None
+        self.overflow = None
+    
+    
+    def update(self, X):
+        """
+        Adds a chunk of paths of shape (n_paths, T).
+        """
+        
+        X = np.asarray(X, dtype=float)
+        if self.terminal:
+            X = X[:,-1:]
+        n_bins = len(self.edges) - 1
+        T = X.shape[1]
+        if self.counts is None:
+            self.counts = np.zeros((T, n_bins), dtype=np.int64)
+            self.underflow = np.zeros(T, dtype=np.int64)
+            self.overflow = np.zeros(T, dtype=np.int64)
+        
+        # Bin of each value (the last edge is included in the last bin)
+        idx = np.searchsorted(self.edges, X, side='right') - 1
+        idx[X == self.edges[-1]] = n_bins - 1
+        self.underflow += np.sum(idx < 0, axis=0)
+        self.overflow += np.sum(idx >= n_bins, axis=0)
+        
+        # Counts of all dates with a single bincount
+        valid = (idx >= 0) & (idx < n_bins)
+        flat = (np.arange(T) * n_bins + idx)[valid]
+        self.counts += np.bincount(flat, minlength=T * n_bins).reshape(T, n_bins)
+    
+    
+    def result(self, index=None):
+        """
+        Returns the counts, one row per date (or a single row for terminal values)
+        and one column per bin, named by the left edge of the bin.
+        """
+        
+        if self.terminal and index is not None:
+            index = index[-1:]
+        
+        return pd.DataFrame(self.counts, index=index, columns=self.edges[:-1])
 
 
 
-#---------#---------#---------#---------#---------#---------#---------#---------#---------#
\ No newline at end of file
+class HistogramQuantiles:
+    """
+    Class estimating quantiles of paths at each date from histograms
+    with uniform bins, whose range at each date is set by the first paths.
+    
+    Attributes
+    ----------
+    probs : numpy.ndarray
+      Probabilities of the quantiles.
+    n_bins : int
+      Number of bins at each date.
+    margin : float
+      Widening of the range of the first paths, as a fraction of its width on each side.
+    n_init : int
+      Minimum number of paths buffered before setting the ranges.
+    count : int
+      Number of paths aggregated.
+    first : list
+      Chunks buffered until n_init paths are reached.
+    lower : numpy.ndarray
+      Lower edges of the histograms, at each date.
+    width : numpy.ndarray
+      Widths of the bins, at each date.
+    counts : numpy.ndarray
+      Counts of shape (T, n_bins).
+    underflow : numpy.ndarray
+      Counts of values below the lower edge, at each date.
+    overflow : numpy.ndarray
+      Counts of values above the upper edge, at each date.
+    
+    Notes
+    -----
+      A chunk is binned with a few vectorized operations, in O(n_paths T),
+      which makes it much faster than P2Quantiles for many paths,
+      for a memory of T n_bins counts. Quantiles are interpolated linearly
+      within bins, so their resolution is the width of a bin. Quantiles
+      falling out of the range of the histograms are NaN, hence the
+      buffering of at least n_init paths before fixing the ranges.
+      Non-finite values (e.g. of exploding paths) are ignored.
+    """
+    
+    def __init__(self, probs=(0.05, 0.5, 0.95), bins=1000, margin=0.5, n_init=1000):
+        """
+        Initializes the aggregator.
+        """
+        
+        self.probs = np.asarray(probs, dtype=float)
+        assert(np.all((self.probs > 0) & (self.probs < 1)))
+        assert(isinstance(bins, int) and bins>0)
+        assert(margin >= 0)
+        assert(isinstance(n_init, int) and n_init>0)
+        self.n_bins = bins
+        self.margin = margin
+        self.n_init = n_init
+        self.count = 0
+        self.first = []
+        self.lower = None
+        self.width = None
+        self.counts = None
+        self.underflow = None
+        self.overflow = None
+    
+    
+    def update(self, X):
+        """
+        Adds a chunk of paths of shape (n_paths, T).
+        """
+        
+        X = np.asarray(X, dtype=float)
+        self.count += X.shape[0]
+        
+        # Ranges of the histograms from the first n_init paths
+        if self.counts is None:
+            self.first.append(X)
+            if sum(len(x) for x in self.first) < self.n_init:
+                return
+            X = np.concatenate(self.first)
+            self.first = []
+            self.set_ranges(X)
+        
+        # Bin of each finite value and counts of all dates with a single bincount
+        T = X.shape[1]
+        finite = np.isfinite(X)
+        idx = np.floor((np.where(finite, X, 0.) - self.lower) / self.width)
+        under = finite & (idx < 0)
+        over = finite & (idx >= self.n_bins)
+        self.underflow += np.sum(under, axis=0)
+        self.overflow += np.sum(over, axis=0)
+        valid = finite & ~(under | over)
+        flat = (idx + np.arange(T) * self.n_bins)[valid].astype(np.int64)
+        self.counts += np.bincount(flat, minlength=T * self.n_bins).reshape(T, self.n_bins)
+    
+    
+    def set_ranges(self, X):
+        """
+        Sets the ranges of the histograms from paths of shape (n_paths, T).
+        """
+        
+        T = X.shape[1]
+        finite = np.isfinite(X)
+        low = np.min(np.where(finite, X, np.inf), axis=0)
+        high = np.max(np.where(finite, X, -np.inf), axis=0)
+        # Dates without finite values get an arbitrary range
+        low = np.where(finite.any(axis=0), low, 0.)
+        high = np.where(finite.any(axis=0), high, 0.)
+        span = np.where(high > low, high - low, 1.)
+        self.lower = low - self.margin * span
+        self.width = (1. + 2. * self.margin) * span / self.n_bins
+        self.counts = np.zeros((T, self.n_bins), dtype=np.int64)
+        self.underflow = np.zeros(T, dtype=np.int64)
+        self.overflow = np.zeros(T, dtype=np.int64)
+    
+    
+    def quantiles(self):
+        """
+        Returns the estimated quantiles of shape (n_probs, T).
+        """
+        
+        # Fewer than n_init paths: exact quantiles of the buffered paths
+        if self.counts is None:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                return np.nanquantile(np.concatenate(self.first), self.probs, axis=0)
+        
+        T = self.counts.shape[0]
+        cum = np.cumsum(self.counts, axis=1) + self.underflow[:,np.newaxis]
+        total = cum[:,-1] + self.overflow
+        rows = np.arange(T)
+        out = np.empty((len(self.probs), T))
+        
+        for j, p in enumerate(self.probs):
+            # Bin in which the cumulative count of finite values reaches the target
+            target = p * total
+            k = np.minimum(np.sum(cum < target[:,np.newaxis], axis=1), self.n_bins - 1)
+            inside = (total > 0) & (target > self.underflow) & (cum[:,-1] >= target)
+            n_bin = self.counts[rows, k]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                frac = (target - (cum[rows, k] - n_bin)) / n_bin
+            out[j] = np.where(inside, self.lower + (k + frac) * self.width, np.nan)
+        
+        return out
+    
+    
+    def result(self, index=None):
+        """
+        Returns the estimated quantiles at each date, one column per probability.
+        """
+        return pd.DataFrame(self.quantiles().T, index=index, columns=self.probs)
+
+
+
+def aggregate_series(n, series_model, aggregators, seed=None, n_jobs=1, chunk_size=10000, **kwargs):
+    """
+    Generates `n` series of the type `series_model` by chunks and feeds
+    them to streaming aggregators, without keeping the paths in memory.
+    
+    Parameters
+    ----------
+    n : int
+      Number of time series to be generated.
+    series_model : function
+      TimeSeries generating function.
+    aggregators : list
+      Aggregators with update() and result() methods,
+      e.g. RunningMoments, HistogramQuantiles, P2Quantiles or StreamingHistogram.
+    seed : None, int or SeedSequence
+      Root seed from which an independent stream is spawned for each chunk.
+    n_jobs : int
+      Number of processes generating chunks in parallel.
+    chunk_size : int
+      Number of series generated per chunk.
+      Each chunk has its own stream, so results for a given seed depend on it.
+    **kwargs
+        Arbitrary keyword arguments.
+    
+    Returns
+    -------
+    List of DataFrame
+      Results of the aggregators, indexed by the dates of the series.
+    
+    Notes
+    -----
+      Memory is bounded by the size of a chunk (and of pending chunks
+      when n_jobs > 1) plus the states of the aggregators.
+    """
+    
+    first_index = None
+    for i, (x, index) in enumerate(iterate_chunks(n, series_model, seed=seed, n_jobs=n_jobs,
+                                                  chunk_size=chunk_size, **kwargs)):
+        if i == 0:
+            first_index = index
+        for aggregator in aggregators:
+            aggregator.update(x)
+    
+    index = shared_index(first_index, kwargs)
+    
+    return [aggregator.result(index=index) for aggregator in aggregators]
+
+
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
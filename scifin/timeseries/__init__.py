@@ -8,8 +8,35 @@ The :mod:`scifin.timeseries` module includes methods for time series analysis.
 
 from .timeseries import Series, TimeSeries, CatTimeSeries, \
                         get_list_timezones, build_from_csv, build_from_list, build_from_lists, \
-                        multi_plot, multi_plot_distrib
+                        multi_plot, multi_plot_distrib, build_panel, lag_panel, lag_batches
 
 from .randomseries import constant, auto_regressive, random_walk, drift_random_walk, moving_average, \
-                          arma, rca, arch, garch, charma
+                          arma, rca, arch, garch, charma, garch_paths, \
+                          get_generator, spawn_generators, date_index, \
+                          ornstein_uhlenbeck, heston, merton_jump_diffusion, \
+                          fgn_autocovariances, davies_harte, fractional_gaussian_noise, \
+                          fractional_brownian_motion
 
+from .alignment import merge_indexes, asof_values, align_series
+
+from .cleaning import expected_index, detect_gaps, fill_gaps, hampel_filter, clean_series
+
+from .regimes import log_gaussian_densities, forward_backward, viterbi, fit_gaussian_hmm, hmm_regimes
+
+from .changepoints import prefix_sums, segment_cost, pelt, binary_segmentation, \
+                          detect_changepoints, changepoints_panel
+
+from .statespace import state_space_matrices, kalman_filter, fit_state_space, kalman_smoother
+
+from .smoothing import initial_states, holt_winters_recursion, fit_holt_winters, holt_winters_forecast
+
+from .cointegration import hedge_ratios, adf_statistics, cointegration_scan
+
+from .indicators import sma, ema, wilder_smoothing, rsi, macd, bollinger_bands, true_range, atr, stochastic
+
+from .fractal import window_scales, hurst_rs, dfa
+
+from .caching import FitCache, enable_fit_cache, disable_fit_cache, clear_fit_cache
+
+from .estimators import autocovariances, levinson_durbin, yule_walker, burg, hannan_rissanen, \
+                         garch_loglikelihood, fit_garch
@@ -0,0 +1,185 @@
+# Created on 2020/9/1
+
+# This module is for aligning time series sampled on different indexes.
+
+# Standard library imports
+# /
+
+# Third party imports
+import numpy as np
+import pandas as pd
+
+# Local application imports
+from .timeseries import TimeSeries, index_to_int64
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+def merge_indexes(list_idx, how='union'):
+    """
+    Merges sorted int64 indexes into their union or intersection.
+    
+    Parameters
+    ----------
+    list_idx : list of numpy.ndarray
+      Sorted int64 indexes, possibly with repeated values.
+    how : str
+      Either 'union' or 'intersection'.
+    
+    Returns
+    -------
+    numpy.ndarray
+      Sorted int64 index.
+    
+    Notes
+    -----
+      The indexes are concatenated and sorted with a stable sort (Timsort),
+      which detects the already sorted runs and merges them,
+      i.e. performs a k-way merge in O(n log k) for n values in total.
+      Union and intersection are then obtained in a single linear pass.
+      For the intersection, repeated values are first dropped from each index,
+      so that each index contributes a value at most once.
+    """
+    
+    # Checks
+    if how not in ['union', 'intersection']:
+        raise ValueError("how must be 'union' or 'intersection'.")
+    K = len(list_idx)
+    assert(K>0)
+    
+    # Drop repeated values within each index for the intersection
+    if how == 'intersection':
+        list_idx = [x[np.concatenate([[True], x[1:] != x[:-1]])] if len(x) > 0 else x
+                    for x in list_idx]
+    
+    # K-way merge
+    merged = np.sort(np.concatenate(list_idx), kind='stable')
+    if len(merged)==0:
+        return merged
+    
+    # Union: keep first value of each run
+    if how == 'union':
+        keep = np.empty(len(merged), dtype=bool)
+        keep[0] = True
+        keep[1:] = merged[1:] != merged[:-1]
+        return merged[keep]
+    
+    # Intersection: a value belongs to all indexes if it appears K times
+    if len(merged) < K:
+        return merged[:0]
+    return merged[:len(merged)-K+1][merged[K-1:] == merged[:len(merged)-K+1]]
+
+
+def asof_values(idx, values, grid, tolerance=None):
+    """
+    Returns the values of a series at the dates of a grid
+    using the last observation available at each date (as-of semantics).
+    
+    Parameters
+    ----------
+    idx : numpy.ndarray
+      Sorted int64 index of the series.
+    values : numpy.ndarray
+      Values of the series.
+    grid : numpy.ndarray
+      Sorted int64 grid on which values are evaluated.
+    tolerance : int or None
+      Maximum age (in nanoseconds) of the last observation.
+    
+    Returns
+    -------
+    numpy.ndarray
+      Values on the grid, NaN when no valid observation exists.
+    """
+    
+    # No observation at all
+    out = np.full(len(grid), np.nan)
+    if len(idx) == 0:
+        return out
+    
+    # Position of the last observation at or before each grid date
+    # (the last one for repeated dates)
+    pos = np.searchsorted(idx, grid, side='right') - 1
+    valid = pos >= 0
+    if tolerance is not None:
+        valid &= (grid - idx[np.maximum(pos,0)]) <= tolerance
+    
+    # Extract values
+    out[valid] = values[pos[valid]]
+    
+    return out
+
+
+def align_series(Series, how='union', reference=None, tolerance=None):
+    """
+    Aligns several time series on a common index with as-of (last observation)
+    semantics and returns them as a panel.
+    
+    Parameters
+    ----------
+    Series : list of TimeSeries
+      Time series to align, possibly with different indexes.
+    how : str
+      Common index to use: 'union', 'intersection' or 'reference'.
+    reference : TimeSeries, DatetimeIndex or None
+      Reference grid, required when how='reference'.
+    tolerance : str, Timedelta or None
+      Maximum age of the last observation used for a date (e.g. '5min').
+      Older observations give NaN. None means no limit.
+    
+    Returns
+    -------
+    DataFrame
+      Panel of shape (T, N) with the common index and one column per series.
+    
+    Raises
+    ------
+      ValueError: when how is not recognized or the reference is missing.
+    
+    Notes
+    -----
+      All the work is done on int64 indexes: the common index is built with
+      a single k-way merge and values are picked by binary search,
+      without any reindexing of the underlying DataFrames.
+    """
+    
+    # Checks
+    assert(len(Series)>0)
+    for s in Series:
+        assert(s.type=='TimeSeries')
+    if how not in ['union', 'intersection', 'reference']:
+        raise ValueError("how must be 'union', 'intersection' or 'reference'.")
+    
+    # Initializations
+    list_idx = [index_to_int64(s.data.index) for s in Series]
+    list_vals = [s.data.values[:,0] for s in Series]
+    names = [s.name if s.name != "" else "TS " + str(i) for i,s in enumerate(Series)]
+    tol = None if tolerance is None else pd.Timedelta(tolerance).value
+    
+    # Build the common index
+    if how == 'reference':
+        if reference is None:
+            raise ValueError("A reference must be given when how='reference'.")
+        ref_index = reference.data.index if isinstance(reference, TimeSeries) else reference
+        grid = index_to_int64(pd.DatetimeIndex(ref_index))
+    else:
+        grid = merge_indexes(list_idx, how=how)
+    
+    # Fill the panel
+    values = np.empty((len(grid), len(Series)))
+    for i in range(len(Series)):
+        values[:,i] = asof_values(list_idx[i], list_vals[i], grid, tolerance=tol)
+    
+    # Build the index, keeping the time zone of the first series
+    new_index = pd.DatetimeIndex(grid.astype('datetime64[ns]'))
+    tz = getattr(Series[0].data.index, 'tz', None)
+    if tz is not None:
+        new_index = new_index.tz_localize('UTC').tz_convert(tz)
+    
+    return pd.DataFrame(index=new_index, data=values, columns=names)
+
+
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
@@ -0,0 +1,276 @@
+# Created on 2020/9/22
+
+# This module is for caching the results of expensive fits of time series.
+
+# Standard library imports
+from collections import OrderedDict
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+
+# Third party imports
+import pandas as pd
+
+# Local application imports
+# /
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+class FitCache:
+    """
+    Class defining a two-tier cache for results of fits, with an in-memory
+    LRU tier and an optional on-disk tier, both bounded in size.
+    
+    Attributes
+    ----------
+    max_memory : int
+      Maximum size in bytes of the results kept in memory.
+    directory : str or None
+      Directory of the on-disk tier, None to keep results in memory only.
+    max_disk : int
+      Maximum size in bytes of the results kept on disk.
+    hits : int
+      Number of results found in the cache.
+    misses : int
+      Number of results not found in the cache.
+    
+    Notes
+    -----
+      Results are stored pickled, so that the objects returned by the cache
+      are fresh copies which can be modified without altering the cache.
+    """
+    
+    def __init__(self, max_memory=100*2**20, directory=None, max_disk=1*2**30):
+        """
+        Initializes the cache.
+        """
+        
+        # Checks
+        assert(max_memory >= 0 and max_disk >= 0)
+        
+        self.max_memory = max_memory
+        self.directory = directory
+        self.max_disk = max_disk
+        self.memory = OrderedDict()
+        self.memory_size = 0
+        self.hits = 0
+        self.misses = 0
+        
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+    
+    
+    def path(self, key):
+        """
+        Returns the path of the file storing a key in the on-disk tier.
+        """
+        return os.path.join(self.directory, key + '.pkl')
+    
+    
+    def get(self, key):
+        """
+        Returns the result stored for a key, or None if the key is absent.
+        """
+        
+        # Memory tier
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return pickle.loads(self.memory[key])
+        
+        # Disk tier, the result is promoted to memory
+        if self.directory is not None:
+            try:
+                with open(self.path(key), 'rb') as f:
+                    blob = f.read()
+                os.utime(self.path(key))
+            except OSError:
+                blob = None
+            if blob is not None:
+                self.put_memory(key, blob)
+                self.hits += 1
+                return pickle.loads(blob)
+        
+        self.misses += 1
+        return None
+    
+    
+    def put(self, key, result):
+        """
+        Stores the result of a fit for a key.
+        """
+        
+        blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        self.put_memory(key, blob)
+        if self.directory is not None:
+            self.put_disk(key, blob)
+    
+    
+    def put_memory(self, key, blob):
+        """
+        Stores a pickled result in memory, evicting the least recently used ones.
+        """
+        
+        if key in self.memory:
+            self.memory_size -= len(self.memory.pop(key))
+        if len(blob) > self.max_memory:
+            return
+        
+        self.memory[key] = blob
+        self.memory_size += len(blob)
+        while self.memory_size > self.max_memory:
+            _, old_blob = self.memory.popitem(last=False)
+            self.memory_size -= len(old_blob)
+    
+    
+    def put_disk(self, key, blob):
+        """
+        Stores a pickled result on disk, evicting the least recently used files.
+        """
+        
+        if len(blob) > self.max_disk:
+            return
+        
+        # Atomic write, so that concurrent sessions never read partial files
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(blob)
+        os.replace(tmp_path, self.path(key))
+        
+        # Eviction by last access time
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.pkl'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(e[1] for e in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_disk:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+    
+    
+    def clear(self):
+        """
+        Removes all the results from memory and disk.
+        """
+        
+        self.memory.clear()
+        self.memory_size = 0
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith('.pkl'):
+                    os.remove(os.path.join(self.directory, name))
+
+
+
+# Cache used by the fitting methods, None when caching is disabled
+fit_cache = None
+
+
+def enable_fit_cache(max_memory=100*2**20, directory=None, max_disk=1*2**30):
+    """
+    Enables the caching of the results of expensive fits
+    (TimeSeries.polyfit, decompose and gaussian_process).
+    
+    Parameters
+    ----------
+    max_memory : int
+      Maximum size in bytes of the results kept in memory.
+    directory : str or None
+      Directory of the on-disk tier, None to keep results in memory only.
+    max_disk : int
+      Maximum size in bytes of the results kept on disk.
+    
+    Returns
+    -------
+    FitCache
+      Cache now in use.
+    """
+    
+    global fit_cache
+    fit_cache = FitCache(max_memory=max_memory, directory=directory, max_disk=max_disk)
+    
+    return fit_cache
+
+
+def disable_fit_cache():
+    """
+    Disables the caching of fits. Files of the on-disk tier are kept.
+    """
+    
+    global fit_cache
+    fit_cache = None
+
+
+def clear_fit_cache():
+    """
+    Removes all the results of the current cache.
+    """
+    
+    if fit_cache is not None:
+        fit_cache.clear()
+
+
+def fit_key(series, method_name, arguments):
+    """
+    Returns a key identifying a fit from the content of a series
+    (values, index, time zone) and the parameters of the call.
+    """
+    
+    h = hashlib.sha256()
+    h.update(pd.util.hash_pandas_object(series.data, index=True).values.tobytes())
+    h.update(repr((type(series).__name__, str(series.tz), method_name,
+                   sorted(arguments.items()))).encode())
+    
+    return h.hexdigest()
+
+
+def cached_fit(method):
+    """
+    Decorator caching the results of a fitting method of a series
+    when the fit cache is enabled.
+    
+    Notes
+    -----
+      Calls with plotting=True are not cached, as plotting is a side effect.
+    """
+    
+    signature = inspect.signature(method)
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        
+        if fit_cache is None:
+            return method(self, *args, **kwargs)
+        
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        del arguments['self']
+        if arguments.get('plotting', False):
+            return method(self, *args, **kwargs)
+        
+        key = fit_key(self, method.__qualname__, arguments)
+        result = fit_cache.get(key)
+        if result is None:
+            result = method(self, *args, **kwargs)
+            fit_cache.put(key, result)
+        
+        return result
+    
+    return wrapper
+
+
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
@@ -0,0 +1,358 @@
+# Created on 2020/9/7
+
+# This module is for detecting changepoints in time series.
+
+# Standard library imports
+# /
+
+# Third party imports
+import numpy as np
+import pandas as pd
+
+# Local application imports
+from .timeseries import TimeSeries, CatTimeSeries, build_panel
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+def prefix_sums(X):
+    """
+    Returns the prefix sums of values and squared values along the first axis,
+    starting with a row of zeros, so that sums over x[s:t] are S[t]-S[s].
+    
+    Parameters
+    ----------
+    X : numpy.ndarray
+      Values of shape (T,) or (T, N).
+    
+    Returns
+    -------
+    numpy.ndarray, numpy.ndarray
+      Prefix sums of values and of squared values, of length T+1.
+    """
+    
+    X = np.asarray(X, dtype=float)
+    zeros = np.zeros((1,) + X.shape[1:])
+    S1 = np.concatenate([zeros, np.cumsum(X, axis=0)])
+    S2 = np.concatenate([zeros, np.cumsum(X**2, axis=0)])
+    
+    return S1, S2
+
+
+def segment_cost(S1, S2, start, end, model='meanvar', min_var=1e-12):
+    """
+    Returns the cost of segments x[start:end] from prefix sums, in O(1) per segment.
+    
+    Parameters
+    ----------
+    S1, S2 : numpy.ndarray
+      Prefix sums of values and of squared values.
+    start : int or numpy.ndarray
+      Starting positions of segments (included).
+    end : int or numpy.ndarray
+      Ending positions of segments (excluded).
+    model : str
+      'mean' for changes in mean (squared error cost),
+      'meanvar' for changes in mean and variance (Gaussian likelihood cost).
+    min_var : float
+      Floor of the variance of segments for model='meanvar'.
+    
+    Returns
+    -------
+    float or numpy.ndarray
+      Costs of the segments.
+    """
+    
+    n = end - start
+    s1 = S1[end] - S1[start]
+    sse = (S2[end] - S2[start]) - s1**2 / n
+    
+    if model == 'mean':
+        return sse
+    elif model == 'meanvar':
+        return n * np.log(np.maximum(sse / n, min_var))
+    else:
+        raise ValueError("model must be 'mean' or 'meanvar'.")
+
+
+def default_penalty(x, model='meanvar'):
+    """
+    Returns a BIC-like default penalty for a series, i.e. log(n)
+    times the number of parameters added by a changepoint
+    (location and mean, plus variance for model='meanvar').
+    
+    Notes
+    -----
+      For changes in mean the penalty is scaled by a robust estimate
+      of the noise variance, obtained from the median absolute deviation
+      of the first differences.
+    """
+    
+    n = len(x)
+    if model == 'mean':
+        sigma = 1.4826 * np.median(np.abs(np.diff(x) - np.median(np.diff(x)))) / np.sqrt(2)
+        return 2. * np.log(n) * max(sigma, 1e-12)**2
+    
+    return 3. * np.log(n)
+
+
+def variance_floor(x, rel=1e-3):
+    """
+    Returns the floor of the variance of segments, as a fraction of
+    the variance of the whole series.
+    
+    Notes
+    -----
+      Without it, short segments of equal values (e.g. prices rounded
+      to a tick) have a zero variance and an unbounded gain
+      that beats any penalty.
+    """
+    return max(rel * np.var(x), 1e-12)
+
+
+def pelt(x, penalty=None, model='meanvar', min_size=2):
+    """
+    Detects changepoints with the Pruned Exact Linear Time (PELT) algorithm.
+    
+    Parameters
+    ----------
+    x : numpy.ndarray
+      Values of the series.
+    penalty : float or None
+      Penalty added for each changepoint. If None, a BIC-like penalty is used.
+    model : str
+      Cost model, 'mean' or 'meanvar'.
+    min_size : int
+      Minimum length of a segment.
+    
+    Returns
+    -------
+    list of int
+      Positions at which new segments start.
+    
+    Notes
+    -----
+      Segment costs come from prefix sums in O(1) and candidates are pruned
+      when they can no longer be optimal, which gives a running time
+      close to linear when the number of changepoints grows with n.
+      See R. Killick, P. Fearnhead and I. A. Eckley (2012),
+      https://doi.org/10.1080/01621459.2012.737745
+    """
+    
+    # Checks
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    assert(isinstance(min_size, int) and min_size>0)
+    assert(n >= 2 * min_size)
+    beta = default_penalty(x, model) if penalty is None else penalty
+    
+    # Initializations
+    S1, S2 = prefix_sums(x)
+    min_var = variance_floor(x)
+    F = np.empty(n+1)
+    F[0] = -beta
+    last = np.zeros(n+1, dtype=int)
+    R = np.array([0])
+    
+    # Dynamic programming with pruning
+    for t in range(min_size, n+1):
+        if t - min_size >= min_size:
+            R = np.append(R, t - min_size)
+        costs = F[R] + segment_cost(S1, S2, R, t, model, min_var)
+        best = np.argmin(costs)
+        F[t] = costs[best] + beta
+        last[t] = R[best]
+        R = R[costs <= F[t]]
+    
+    # Backtracking
+    bkps = []
+    t = last[n]
+    while t > 0:
+        bkps.append(int(t))
+        t = last[t]
+    
+    return sorted(bkps)
+
+
+def binary_segmentation(x, n_bkps=None, penalty=None, model='meanvar', min_size=2):
+    """
+    Detects changepoints with binary segmentation.
+    
+    Parameters
+    ----------
+    x : numpy.ndarray
+      Values of the series.
+    n_bkps : int or None
+      Number of changepoints to find. If None, the penalty is used to stop.
+    penalty : float or None
+      Minimum gain to accept a split. If None, a BIC-like penalty is used.
+    model : str
+      Cost model, 'mean' or 'meanvar'.
+    min_size : int
+      Minimum length of a segment.
+    
+    Returns
+    -------
+    list of int
+      Positions at which new segments start.
+    
+    Notes
+    -----
+      The gains of all the splits of a segment are computed at once
+      from prefix sums, so each split costs O(n) and the whole
+      procedure O(n log n) for balanced segmentations.
+    """
+    
+    # Checks
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    assert(isinstance(min_size, int) and min_size>0)
+    beta = default_penalty(x, model) if penalty is None else penalty
+    
+    # Initializations
+    S1, S2 = prefix_sums(x)
+    min_var = variance_floor(x)
+    
+    def best_split(a, b):
+        ks = np.arange(a+min_size, b-min_size+1)
+        if len(ks)==0:
+            return -np.inf, None
+        gains = segment_cost(S1, S2, a, b, model, min_var) - segment_cost(S1, S2, a, ks, model, min_var) \
+                - segment_cost(S1, S2, ks, b, model, min_var)
+        i = np.argmax(gains)
+        return gains[i], ks[i]
+    
+    # Greedy splits of the segment with largest gain
+    segments = {(0,n): best_split(0,n)}
+    bkps = []
+    while len(segments) > 0:
+        (a,b), (gain,k) = max(segments.items(), key=lambda item: item[1][0])
+        if k is None:
+            break
+        if n_bkps is None and gain <= beta:
+            break
+        if n_bkps is not None and len(bkps) == n_bkps:
+            break
+        bkps.append(int(k))
+        del segments[(a,b)]
+        segments[(a,k)] = best_split(a,k)
+        segments[(k,b)] = best_split(k,b)
+    
+    return sorted(bkps)
+
+
+def detect_changepoints(ts, method='pelt', model='meanvar', penalty=None, n_bkps=None,
+                        min_size=2, as_cat=False, name=""):
+    """
+    Detects the changepoints of a time series, i.e. the dates
+    at which its mean (and variance) change.
+    
+    Parameters
+    ----------
+    ts : TimeSeries
+      Time series to segment.
+    method : str
+      Either 'pelt' or 'binseg' (binary segmentation).
+    model : str
+      Cost model, 'mean' or 'meanvar'.
+    penalty : float or None
+      Penalty per changepoint. If None, a BIC-like penalty is used.
+    n_bkps : int or None
+      Number of changepoints, only for method='binseg'.
+    min_size : int
+      Minimum length of a segment.
+    as_cat : bool
+      Option to return the segments as a CatTimeSeries.
+    name : str
+      Name or nickname of the categorical time series.
+    
+    Returns
+    -------
+    DatetimeIndex or CatTimeSeries
+      Starting dates of the new segments,
+      or segments labelled 'Segment 0', 'Segment 1', ...
+    """
+    
+    # Checks
+    assert(ts.type=='TimeSeries')
+    if method not in ['pelt', 'binseg']:
+        raise ValueError("method must be 'pelt' or 'binseg'.")
+    
+    # Detect changepoints
+    x = ts.data.values[:,0]
+    if method == 'pelt':
+        bkps = pelt(x, penalty=penalty, model=model, min_size=min_size)
+    else:
+        bkps = binary_segmentation(x, n_bkps=n_bkps, penalty=penalty,
+                                   model=model, min_size=min_size)
+    
+    if as_cat == False:
+        return ts.data.index[bkps]
+    
+    # Make a categorical time series from segments
+    segments = np.zeros(len(x), dtype=int)
+    segments[bkps] = 1
+    labels = np.array(["Segment " + str(k) for k in np.cumsum(segments)])
+    cts = CatTimeSeries(pd.DataFrame(index=ts.data.index, data=labels), tz=ts.tz, name=name)
+    
+    return cts
+
+
+def changepoints_panel(Series, method='pelt', model='meanvar', penalty=None,
+                       n_bkps=None, min_size=2):
+    """
+    Detects the changepoints of all the series of a panel.
+    
+    Parameters
+    ----------
+    Series : list of TimeSeries or DataFrame
+      Panel of time series sharing the same index.
+    method : str
+      Either 'pelt' or 'binseg' (binary segmentation).
+    model : str
+      Cost model, 'mean' or 'meanvar'.
+    penalty : float or None
+      Penalty per changepoint. If None, a BIC-like penalty is used per series.
+    n_bkps : int or None
+      Number of changepoints, only for method='binseg'.
+    min_size : int
+      Minimum length of a segment.
+    
+    Returns
+    -------
+    DataFrame
+      Segment numbers (starting at 0) of shape (T, N).
+    
+    Notes
+    -----
+      The series are segmented one after the other with pelt or
+      binary_segmentation, since pruning keeps different candidates
+      for each series; only the panel building and the labelling are batched.
+    """
+    
+    # Checks
+    if method not in ['pelt', 'binseg']:
+        raise ValueError("method must be 'pelt' or 'binseg'.")
+    
+    # Initializations
+    panel = build_panel(Series)
+    values = panel.values
+    segments = np.zeros(values.shape, dtype=int)
+    
+    # Loop over series
+    for i in range(values.shape[1]):
+        if method == 'pelt':
+            bkps = pelt(values[:,i], penalty=penalty, model=model, min_size=min_size)
+        else:
+            bkps = binary_segmentation(values[:,i], n_bkps=n_bkps, penalty=penalty,
+                                       model=model, min_size=min_size)
+        segments[bkps,i] = 1
+    
+    return pd.DataFrame(index=panel.index, data=np.cumsum(segments, axis=0),
+                        columns=panel.columns)
+
+
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
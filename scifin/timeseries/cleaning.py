@@ -0,0 +1,245 @@
+# Created on 2020/9/2
+
+# This module is for cleaning time series from gaps, missing values and outliers.
+
+# Standard library imports
+# /
+
+# Third party imports
+import numpy as np
+import pandas as pd
+
+# Local application imports
+from .timeseries import TimeSeries, build_panel, same_type_as, index_to_int64
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+def expected_index(index, freq=None):
+    """
+    Returns the index expected from the frequency of a series,
+    between its first and last dates.
+    
+    Parameters
+    ----------
+    index : DatetimeIndex
+      Index of the series.
+    freq : str, DateOffset or None
+      Expected frequency. If None, the most common interval between dates is used.
+    
+    Returns
+    -------
+    DatetimeIndex
+      Expected (complete) index.
+    """
+    
+    # Checks
+    assert(len(index)>1)
+    
+    # Infer the step from the most common interval
+    if freq is None:
+        diffs = np.diff(index_to_int64(index))
+        steps, counts = np.unique(diffs, return_counts=True)
+        freq = pd.Timedelta(int(steps[np.argmax(counts)]), unit='ns')
+    
+    return pd.date_range(start=index[0], end=index[-1], freq=freq)
+
+
+def detect_gaps(Series, freq=None):
+    """
+    Detects the gaps of a time series, i.e. the runs of dates
+    that are expected from the frequency but absent from the index.
+    
+    Parameters
+    ----------
+    Series : TimeSeries or DataFrame
+      Time series or panel to inspect.
+    freq : str, DateOffset or None
+      Expected frequency. If None, the most common interval between dates is used.
+    
+    Returns
+    -------
+    DataFrame
+      One row per gap with its first and last missing dates
+      and the number of missing dates.
+    """
+    
+    # Initializations
+    index = build_panel(Series).index
+    full_index = expected_index(index, freq=freq)
+    
+    # Missing dates and their runs
+    missing = ~full_index.isin(index)
+    edges = np.diff(np.concatenate([[0], missing.astype(np.int8), [0]]))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1) - 1
+    
+    gaps = pd.DataFrame({'start': full_index[run_starts],
+                         'end': full_index[run_ends],
+                         'n_missing': run_ends - run_starts + 1})
+    
+    return gaps
+
+
+def fill_gaps(Series, freq=None, method='ffill'):
+    """
+    Reindexes a time series or panel on its expected index
+    and fills the missing values.
+    
+    Parameters
+    ----------
+    Series : TimeSeries or DataFrame
+      Time series or panel to fill.
+    freq : str, DateOffset or None
+      Expected frequency. If None, the most common interval between dates is used.
+    method : str
+      Filling method: 'ffill' (last value), 'interpolate' (linear in time)
+      or 'mark' (leave NaN values to mark the missing data).
+    
+    Returns
+    -------
+    TimeSeries or DataFrame
+      Filled time series or panel, of the same type as the input.
+    
+    Notes
+    -----
+      Dates of the series that are not on the expected index (off-grid dates)
+      are kept, so that no observation is lost: the new index is the union
+      of the original and expected indexes.
+    """
+    
+    # Checks
+    if method not in ['ffill', 'interpolate', 'mark']:
+        raise ValueError("method must be 'ffill', 'interpolate' or 'mark'.")
+    
+    # Reindex
+    panel = build_panel(Series)
+    new_panel = panel.reindex(panel.index.union(expected_index(panel.index, freq=freq)))
+    
+    # Fill
+    if method == 'ffill':
+        new_panel = new_panel.ffill()
+    elif method == 'interpolate':
+        new_panel = new_panel.interpolate(method='time', limit_area='inside')
+    
+    return same_type_as(new_panel, Series)
+
+
+def hampel_filter(Series, window, n_sigmas=3., replace='median'):
+    """
+    Filters the outliers of a time series or panel with a Hampel filter,
+    i.e. values deviating from the rolling median by more than
+    n_sigmas times the rolling (scaled) median absolute deviation.
+    
+    Parameters
+    ----------
+    Series : TimeSeries or DataFrame
+      Time series or panel to filter.
+    window : int
+      Size of the centered rolling window.
+    n_sigmas : float
+      Threshold in units of robust standard deviation.
+    replace : str
+      Replacement of the outliers: 'median' (rolling median) or 'nan'.
+    
+    Returns
+    -------
+    TimeSeries or DataFrame, DataFrame
+      Filtered time series or panel, and boolean DataFrame of detected outliers.
+    
+    Notes
+    -----
+      Rolling medians are computed by pandas with a skip list,
+      i.e. in O(n log w) per column, all columns of a panel at once.
+      The median absolute deviation is taken as the rolling median of the
+      deviations to the local median, a common fast approximation
+      of the exact window MAD. The factor 1.4826 makes it consistent
+      with the standard deviation for Gaussian data.
+      Next to forward-filled gaps the MAD is zero or close to it, and any
+      move would exceed the threshold, so the MAD is floored at the
+      robust noise scale of the nonzero first differences of each column.
+    """
+    
+    # Checks
+    assert(isinstance(window, int) and window>2)
+    if replace not in ['median', 'nan']:
+        raise ValueError("replace must be 'median' or 'nan'.")
+    
+    # Rolling median and median absolute deviation
+    panel = build_panel(Series)
+    median = panel.rolling(window, center=True, min_periods=1).median()
+    deviation = (panel - median).abs()
+    mad = 1.4826 * deviation.rolling(window, center=True, min_periods=1).median()
+    
+    # Floor of the MAD from the scale of the nonzero first differences
+    diffs = panel.diff().abs()
+    scale = 1.4826 * diffs[diffs > 0].median() / np.sqrt(2)
+    mad = mad.clip(lower=scale.fillna(0.), axis=1)
+    
+    # Detect and replace outliers
+    outliers = (deviation > n_sigmas * mad) & (mad > 0)
+    if replace == 'median':
+        new_panel = panel.mask(outliers, median)
+    else:
+        new_panel = panel.mask(outliers)
+    
+    return same_type_as(new_panel, Series), outliers
+
+
+def clean_series(Series, freq=None, method='ffill', window=None, n_sigmas=3.):
+    """
+    Cleans a time series or a panel in one call: fills the gaps and
+    missing values, then filters the outliers, and reports what changed.
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Time series or panel to clean.
+    freq : str, DateOffset or None
+      Expected frequency. If None, the most common interval between dates is used.
+    method : str
+      Filling method: 'ffill', 'interpolate' or 'mark'.
+    window : int or None
+      Window of the Hampel filter. If None, outliers are not filtered.
+    n_sigmas : float
+      Threshold of the Hampel filter.
+    
+    Returns
+    -------
+    TimeSeries or DataFrame, DataFrame
+      Cleaned time series or panel, and report with one row per series
+      giving the number of dates added, NaN values filled, outliers replaced
+      and values found off the expected index (which are kept).
+    """
+    
+    # Initializations
+    panel = build_panel(Series)
+    n_nans = panel.isnull().sum()
+    off_grid = ~panel.index.isin(expected_index(panel.index, freq=freq))
+    n_off_grid = panel[off_grid].notnull().sum()
+    
+    # Gaps and missing values
+    filled = fill_gaps(panel, freq=freq, method=method)
+    n_added = pd.Series(len(filled) - len(panel), index=panel.columns)
+    n_filled = n_added + n_nans - filled.isnull().sum()
+    
+    # Outliers
+    if window is not None:
+        filled, outliers = hampel_filter(filled, window=window, n_sigmas=n_sigmas)
+        n_outliers = outliers.sum()
+    else:
+        n_outliers = pd.Series(0, index=panel.columns)
+    
+    # Report
+    report = pd.DataFrame({'dates_added': n_added,
+                           'values_filled': n_filled,
+                           'outliers_replaced': n_outliers,
+                           'off_grid_values': n_off_grid})
+    
+    return same_type_as(filled, Series), report
+
+
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
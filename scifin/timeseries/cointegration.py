@@ -0,0 +1,213 @@
+# Created on 2020/9/15
+
+# This module is for scanning a universe of time series for cointegrated pairs.
+
+# Standard library imports
+from concurrent.futures import ProcessPoolExecutor
+
+# Third party imports
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.adfvalues import mackinnonp
+
+# Local application imports
+from .timeseries import build_panel
+
+
+# Values of the panel shared by the worker processes
+worker_values = None
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+def hedge_ratios(X):
+    """
+    Returns the OLS hedge ratios and intercepts of all pairs of series,
+    i.e. the coefficients of y_i = intercept[i,j] + ratio[i,j] * y_j + e_t.
+    
+    Parameters
+    ----------
+    X : numpy.ndarray
+      Values of shape (T, N), one column per series.
+    
+    Returns
+    -------
+    numpy.ndarray, numpy.ndarray
+      Hedge ratios and intercepts of shape (N, N).
+    
+    Notes
+    -----
+      The normal equations of all the N^2 regressions only involve
+      the means and the covariance matrix, obtained from one matrix product.
+    """
+    
+    means = X.mean(axis=0)
+    Xc = X - means
+    cov = Xc.T @ Xc
+    ratios = cov / np.diag(cov)[None,:]
+    intercepts = means[:,None] - ratios * means[None,:]
+    
+    return ratios, intercepts
+
+
+def adf_statistics(E, nlags=1):
+    """
+    Returns the Augmented Dickey-Fuller statistics of several series at once,
+    for a regression without constant (as used on cointegration residuals).
+    
+    The regression is:
+    De_t = g e_{t-1} + d_1 De_{t-1} + ... + d_p De_{t-p} + u_t
+    and the statistic is the t-value of g.
+    
+    Parameters
+    ----------
+    E : numpy.ndarray
+      Series of shape (B, T).
+    nlags : int
+      Number of lagged differences p.
+    
+    Returns
+    -------
+    numpy.ndarray
+      ADF statistics of shape (B,).
+    
+    Notes
+    -----
+      All the regressions are solved together with batched normal equations.
+    """
+    
+    # Checks
+    assert(isinstance(nlags, int) and nlags>=0)
+    
+    # Build the design of each regression, shape (B, T-p-1, p+1)
+    dE = np.diff(E, axis=1)
+    T1 = dE.shape[1] - nlags
+    y = dE[:, nlags:]
+    cols = [E[:, nlags:-1]] + [dE[:, nlags-k:nlags-k+T1] for k in range(1, nlags+1)]
+    D = np.stack(cols, axis=2)
+    
+    # Batched normal equations
+    DtD = np.einsum('btk,btl->bkl', D, D)
+    Dty = np.einsum('btk,bt->bk', D, y)
+    coefs = np.linalg.solve(DtD, Dty[:,:,None])[:,:,0]
+    resid = y - np.einsum('btk,bk->bt', D, coefs)
+    s2 = (resid**2).sum(axis=1) / (T1 - nlags - 1)
+    inv00 = np.linalg.inv(DtD)[:,0,0]
+    
+    return coefs[:,0] / np.sqrt(s2 * inv00)
+
+
+def scan_pairs_chunk(I, J, ratios, intercepts, nlags, X=None):
+    """
+    Returns the ADF statistics of the Engle-Granger residuals
+    of a chunk of pairs (I[k] regressed on J[k]).
+    
+    Parameters
+    ----------
+    I, J : numpy.ndarray
+      Positions of the dependent and explanatory series of each pair.
+    ratios, intercepts : numpy.ndarray
+      Hedge ratios and intercepts of the pairs.
+    nlags : int
+      Number of lagged differences in the ADF regressions.
+    X : numpy.ndarray or None
+      Values of shape (T, N). If None, the values shared with the worker are used.
+    
+    Returns
+    -------
+    numpy.ndarray
+      ADF statistics of the pairs.
+    """
+    
+    X = worker_values if X is None else X
+    
+    # Residuals and ADF statistics
+    E = (X[:,I] - intercepts - ratios * X[:,J]).T
+    
+    return adf_statistics(E, nlags=nlags)
+
+
+def set_worker_values(X):
+    """
+    Shares the values of the panel with a worker process.
+    """
+    global worker_values
+    worker_values = X
+
+
+def cointegration_scan(Series, nlags=1, n_jobs=1, chunk_size=2000, top=None):
+    """
+    Scans all pairs of a universe of time series for cointegration
+    with the Engle-Granger two-step method, and ranks them.
+    
+    Parameters
+    ----------
+    Series : list of TimeSeries or DataFrame
+      Panel of time series (e.g. log-prices) sharing the same index.
+    nlags : int
+      Number of lagged differences in the ADF regressions on residuals.
+    n_jobs : int
+      Number of processes. With 1, everything runs in the current process.
+    chunk_size : int
+      Number of pairs processed together.
+    top : int or None
+      Number of best pairs to return. If None, all pairs are returned.
+    
+    Returns
+    -------
+    DataFrame
+      One row per pair with the dependent and explanatory series,
+      hedge ratio, intercept, ADF statistic and MacKinnon p-value,
+      sorted from the most to the least cointegrated.
+    
+    Notes
+    -----
+      Each unordered pair (i,j) with i<j is tested once, regressing i on j.
+      Hedge ratios of all the pairs come from the normal equations solved
+      at once (see hedge_ratios), and the ADF regressions of a chunk
+      of pairs are solved together.
+      P-values are approximations from J. G. MacKinnon (1994) for two series.
+    """
+    
+    # Checks
+    assert(isinstance(n_jobs, int) and n_jobs>0)
+    assert(isinstance(chunk_size, int) and chunk_size>0)
+    
+    # Initializations
+    panel = build_panel(Series)
+    X = np.ascontiguousarray(panel.values, dtype=float)
+    N = X.shape[1]
+    I, J = np.triu_indices(N, k=1)
+    
+    # Hedge ratios of all pairs at once
+    all_ratios, all_intercepts = hedge_ratios(X)
+    ratios, intercepts = all_ratios[I,J], all_intercepts[I,J]
+    chunks = [(I[k:k+chunk_size], J[k:k+chunk_size], ratios[k:k+chunk_size],
+               intercepts[k:k+chunk_size], nlags) for k in range(0, len(I), chunk_size)]
+    
+    # Run the chunks
+    if n_jobs == 1:
+        results = [scan_pairs_chunk(*c, X=X) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=set_worker_values,
+                                 initargs=(X,)) as executor:
+            results = list(executor.map(scan_pairs_chunk, *zip(*chunks)))
+    
+    # Gather and rank the results
+    stats = np.concatenate(results)
+    names = np.asarray(panel.columns)
+    table = pd.DataFrame({'series_y': names[I], 'series_x': names[J],
+                          'hedge_ratio': ratios, 'intercept': intercepts,
+                          'adf_stat': stats})
+    table = table.sort_values('adf_stat').reset_index(drop=True)
+    if top is not None:
+        table = table.iloc[:top].copy()
+    table['pvalue'] = np.vectorize(lambda x: mackinnonp(x, regression='c', N=2))(table['adf_stat'].values)
+    
+    return table
+
+
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
@@ -0,0 +1,405 @@
+# Created on 2020/9/25
+
+# This module is for estimating the parameters of AR, ARMA and GARCH models from time series.
+
+# Standard library imports
+# /
+
+# Third party imports
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+
+# Local application imports
+from .timeseries import TimeSeries, build_panel
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+### HELPER FUNCTIONS ###
+
+def format_params(values, names, panel, Series):
+    """
+    Returns estimated parameters of shape (N, k) as a pandas.Series for a TimeSeries
+    and as a DataFrame with one row per series for a panel.
+    """
+    
+    if isinstance(Series, TimeSeries):
+        return pd.Series(values[0], index=names)
+    
+    return pd.DataFrame(values, index=panel.columns, columns=names)
+
+
+def autocovariances(X, nlags):
+    """
+    Returns the (biased) autocovariances of each column of an array of shape (T, N),
+    computed with a zero-padded FFT.
+    
+    Parameters
+    ----------
+    X : numpy.ndarray
+      Values of shape (T,) or (T, N).
+    nlags : int
+      Maximum lag.
+    
+    Returns
+    -------
+    numpy.ndarray
+      Autocovariances for lags 0 to nlags, of shape (nlags+1, N).
+    """
+    
+    X = np.asarray(X, dtype=float)
+    if X.ndim == 1:
+        X = X[:,np.newaxis]
+    T = X.shape[0]
+    
+    # Zero-padding to avoid circular correlations
+    nfft = 1 << int(np.ceil(np.log2(2*T - 1)))
+    F = np.fft.rfft(X - X.mean(axis=0), n=nfft, axis=0)
+    acov = np.fft.irfft(np.abs(F)**2, n=nfft, axis=0)[:nlags+1]
+    
+    return acov / T
+
+
+def levinson_durbin(acov, order):
+    """
+    Solves the Yule-Walker equations with the Levinson-Durbin recursion,
+    for several series at once.
+    
+    Parameters
+    ----------
+    acov : numpy.ndarray
+      Autocovariances of shape (order+1, N).
+    order : int
+      Order of the AR model.
+    
+    Returns
+    -------
+    numpy.ndarray, numpy.ndarray
+      AR coefficients of shape (order, N) and innovation variances of shape (N,).
+    """
+    
+    # Initializations
+    N = acov.shape[1]
+    phi = np.zeros((order, N))
+    sigma2 = acov[0].copy()
+    
+    # Recursion on the order
+    for k in range(1, order+1):
+        acc = acov[k] - np.sum(phi[:k-1] * acov[k-1:0:-1], axis=0)
+        kappa = acc / sigma2
+        phi[:k-1] = phi[:k-1] - kappa * phi[k-2::-1] if k > 1 else phi[:k-1]
+        phi[k-1] = kappa
+        sigma2 = sigma2 * (1. - kappa**2)
+    
+    return phi, sigma2
+
+
+def ar_residuals(X, phi):
+    """
+    Returns the residuals x_t - Sum_k phi[k-1] x_{t-k} of each column,
+    for t >= order, with AR coefficients phi of shape (order, N).
+    """
+    
+    order = phi.shape[0]
+    E = X[order:].copy()
+    for k in range(1, order+1):
+        E -= phi[k-1] * X[order-k:X.shape[0]-k]
+    
+    return E
+
+
+def ar_names(order, prefix='coeff'):
+    """
+    Returns the names of AR coefficients.
+    """
+    return [prefix + '_' + str(k) for k in range(1, order+1)]
+
+
+
+### AUTO-REGRESSIVE MODELS ###
+
+def yule_walker(Series, order):
+    """
+    Estimates an AR model x_t = cst + coeff_1 x_{t-1} + ... + coeff_P x_{t-P} + a_t
+    with the Yule-Walker equations.
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Time series or panel.
+    order : int
+      Order of the process (i.e. value of P).
+    
+    Returns
+    -------
+    pandas.Series or DataFrame
+      Parameters cst, coeff_1, ..., coeff_P and sigma (standard deviation
+      of the white noise), as in randomseries.auto_regressive,
+      with one row per series for a panel.
+    
+    Notes
+    -----
+      Autocovariances are computed by FFT and the equations are solved
+      by the Levinson-Durbin recursion, for all series at once.
+    """
+    
+    # Checks
+    assert(isinstance(order, int) and order>0)
+    
+    panel = build_panel(Series)
+    X = panel.values.astype(float)
+    phi, sigma2 = levinson_durbin(autocovariances(X, order), order)
+    cst = X.mean(axis=0) * (1. - phi.sum(axis=0))
+    
+    values = np.column_stack([cst, phi.T, np.sqrt(sigma2)])
+    
+    return format_params(values, ['cst'] + ar_names(order) + ['sigma'], panel, Series)
+
+
+def burg(Series, order):
+    """
+    Estimates an AR model x_t = cst + coeff_1 x_{t-1} + ... + coeff_P x_{t-P} + a_t
+    with Burg's method.
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Time series or panel.
+    order : int
+      Order of the process (i.e. value of P).
+    
+    Returns
+    -------
+    pandas.Series or DataFrame
+      Parameters cst, coeff_1, ..., coeff_P and sigma, as in
+      randomseries.auto_regressive, with one row per series for a panel.
+    
+    Notes
+    -----
+      Burg's method estimates the reflection coefficients from forward
+      and backward prediction errors, which gives less biased estimates
+      than Yule-Walker for short series. All series are updated at once.
+    """
+    
+    # Checks
+    assert(isinstance(order, int) and order>0)
+    
+    # Initializations
+    panel = build_panel(Series)
+    X = panel.values.astype(float)
+    mean = X.mean(axis=0)
+    X = X - mean
+    N = X.shape[1]
+    a = np.zeros((order+1, N))
+    a[0] = 1.
+    sigma2 = np.mean(X**2, axis=0)
+    f = X[1:]
+    b = X[:-1]
+    
+    # Recursion on the order
+    for k in range(1, order+1):
+        kappa = -2. * np.sum(f * b, axis=0) / np.sum(f**2 + b**2, axis=0)
+        a[:k+1] = a[:k+1] + kappa * a[k::-1]
+        sigma2 = sigma2 * (1. - kappa**2)
+        f, b = (f + kappa * b)[1:], (b + kappa * f)[:-1]
+    
+    phi = -a[1:]
+    cst = mean * (1. - phi.sum(axis=0))
+    values = np.column_stack([cst, phi.T, np.sqrt(sigma2)])
+    
+    return format_params(values, ['cst'] + ar_names(order) + ['sigma'], panel, Series)
+
+
+
+### AUTO-REGRESSIVE MOVING AVERAGE MODELS ###
+
+def hannan_rissanen(Series, ar_order, ma_order, long_order=None):
+    """
+    Estimates an ARMA model
+    x_t = cst + Sum_{i=1}^{P} ARcoeff_i x_{t-i} + a_t + Sum_{j=1}^{Q} MAcoeff_j a_{t-j}
+    with the Hannan-Rissanen method.
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Time series or panel.
+    ar_order : int
+      Order of the AR part (i.e. value of P).
+    ma_order : int
+      Order of the MA part (i.e. value of Q).
+    long_order : int or None
+      Order of the long AR model giving the initial residuals,
+      by default max(log(T)^2, 2 max(P,Q)).
+    
+    Returns
+    -------
+    pandas.Series or DataFrame
+      Parameters cst, ARcoeff_1, ..., ARcoeff_P, MAcoeff_1, ..., MAcoeff_Q and sigma,
+      as in randomseries.arma, with one row per series for a panel.
+    
+    Notes
+    -----
+      A long AR model is first fitted (Yule-Walker) to estimate the innovations,
+      then x_t is regressed on its lags and on the lagged innovations.
+      Both steps are done for all series at once, the regressions being
+      solved as a batch of small normal equations.
+    """
+    
+    # Checks
+    assert(ar_order >= 0 and ma_order >= 0 and ar_order + ma_order > 0)
+    
+    # Initializations
+    panel = build_panel(Series)
+    X = panel.values.astype(float)
+    T, N = X.shape
+    P, Q = ar_order, ma_order
+    if long_order is None:
+        long_order = max(int(np.floor(np.log(T)**2)), 2*max(P,Q))
+    m = long_order
+    
+    # Innovations from a long AR model (defined for t >= m)
+    phi_long, _ = levinson_durbin(autocovariances(X, m), m)
+    E = ar_residuals(X - X.mean(axis=0), phi_long)
+    
+    # Regression on lagged values and innovations, for t >= start
+    start = max(P, m + Q)
+    n = T - start
+    regressors = [np.ones((n, N))]
+    regressors += [X[start-i:T-i] for i in range(1, P+1)]
+    regressors += [E[start-m-j:T-m-j] for j in range(1, Q+1)]
+    Z = np.stack(regressors)
+    y = X[start:]
+    
+    # Batched normal equations, one system per series
+    ZtZ = np.einsum('itn,jtn->nij', Z, Z)
+    Zty = np.einsum('itn,tn->ni', Z, y)
+    beta = np.linalg.solve(ZtZ, Zty[:,:,np.newaxis])[:,:,0]
+    resid = y - np.einsum('itn,ni->tn', Z, beta)
+    sigma = np.sqrt(np.mean(resid**2, axis=0))
+    
+    names = ['cst'] + ar_names(P, 'ARcoeff') + ar_names(Q, 'MAcoeff') + ['sigma']
+    
+    return format_params(np.column_stack([beta, sigma]), names, panel, Series)
+
+
+
+### HETEROSCEDASTIC MODELS ###
+
+def garch_loglikelihood(params, A, gradient=True):
+    """
+    Returns the Gaussian log-likelihood of GARCH(1,1) models
+    sig_t^2 = cst + coeff_a a_{t-1}^2 + coeff_sig sig_{t-1}^2
+    for several series, and its analytic gradient.
+    
+    Parameters
+    ----------
+    params : numpy.ndarray
+      Parameters (cst, coeff_a, coeff_sig) of shape (3, N).
+    A : numpy.ndarray
+      Centered values a_t of shape (T, N).
+    gradient : bool
+      Option to compute the gradient.
+    
+    Returns
+    -------
+    numpy.ndarray, numpy.ndarray
+      Log-likelihoods of shape (N,) and their gradients of shape (3, N).
+    
+    Notes
+    -----
+      The recursion is started from the sample variance (backcasting).
+      Derivatives of sig_t^2 follow the same recursion
+      d_t = (1, a_{t-1}^2, sig_{t-1}^2) + coeff_sig d_{t-1},
+      and are propagated along with the variances, for all series at once.
+    """
+    
+    # Initializations
+    omega, alpha, beta = params
+    T, N = A.shape
+    A2 = A**2
+    sig2 = np.empty((T, N))
+    sig2[0] = A2.mean(axis=0)
+    if gradient:
+        dsig2 = np.empty((T, 3, N))
+        dsig2[0] = 0.
+    
+    # Time recursion for all series
+    for t in range(1, T):
+        sig2[t] = omega + alpha * A2[t-1] + beta * sig2[t-1]
+        if gradient:
+            dsig2[t,0] = 1. + beta * dsig2[t-1,0]
+            dsig2[t,1] = A2[t-1] + beta * dsig2[t-1,1]
+            dsig2[t,2] = sig2[t-1] + beta * dsig2[t-1,2]
+    
+    loglik = -0.5 * np.sum(np.log(2*np.pi) + np.log(sig2) + A2 / sig2, axis=0)
+    if not gradient:
+        return loglik, None
+    
+    weights = -0.5 * (1. / sig2 - A2 / sig2**2)
+    grad = np.einsum('tn,tkn->kn', weights, dsig2)
+    
+    return loglik, grad
+
+
+def fit_garch(Series, maxiter=200):
+    """
+    Estimates GARCH(1,1) models
+    x_t = mean + a_t,  a_t = sig_t * eps_t,
+    sig_t^2 = cst + coeff_a a_{t-1}^2 + coeff_sig sig_{t-1}^2
+    by Gaussian maximum likelihood.
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Time series or panel of returns.
+    maxiter : int
+      Maximum number of iterations of the optimizer.
+    
+    Returns
+    -------
+    pandas.Series or DataFrame
+      Parameters mean, cst, coeff_a_1, coeff_sig_1 (as in randomseries.garch)
+      and the log-likelihood, with one row per series for a panel.
+    
+    Notes
+    -----
+      Series are standardized before the fit and cst is rescaled afterwards.
+      The log-likelihoods of all series are summed into a single objective,
+      separable in the parameters of each series, which is maximized with
+      L-BFGS-B using the analytic gradient, so that one evaluation processes
+      the whole panel.
+      
+      Coefficients are bounded to [0, 1) but stationarity
+      (coeff_a + coeff_sig < 1) is not imposed.
+    """
+    
+    # Initializations
+    panel = build_panel(Series)
+    X = panel.values.astype(float)
+    T, N = X.shape
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    A = (X - mean) / scale
+    
+    # Objective on all series
+    def objective(theta):
+        loglik, grad = garch_loglikelihood(theta.reshape(3, N), A)
+        return -loglik.sum() / T, -grad.ravel() / T
+    
+    x0 = np.repeat([[0.05], [0.05], [0.9]], N, axis=1).ravel()
+    bounds = [(1e-8, None)]*N + [(0., 0.999)]*N + [(0., 0.999)]*N
+    res = minimize(objective, x0, jac=True, method='L-BFGS-B', bounds=bounds,
+                   options={'maxiter': maxiter})
+    params = res.x.reshape(3, N)
+    loglik = garch_loglikelihood(params, A, gradient=False)[0] - T * np.log(scale)
+    
+    values = np.column_stack([mean, params[0] * scale**2, params[1], params[2], loglik])
+    
+    return format_params(values, ['mean', 'cst', 'coeff_a_1', 'coeff_sig_1', 'loglik'], panel, Series)
+
+
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
@@ -0,0 +1,224 @@
+# Created on 2020/9/20
+
+# This module is for fractal and long-memory estimators (Hurst exponent, DFA) of time series.
+
+# Standard library imports
+# /
+
+# Third party imports
+import numpy as np
+import pandas as pd
+
+# Local application imports
+from .timeseries import TimeSeries, build_panel
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+def window_scales(n, min_size=10, max_size=None, n_scales=20):
+    """
+    Returns logarithmically spaced window sizes between min_size and max_size.
+    
+    Parameters
+    ----------
+    n : int
+      Length of the series.
+    min_size : int
+      Smallest window size.
+    max_size : int or None
+      Largest window size, by default n//4.
+    n_scales : int
+      Maximum number of window sizes.
+    
+    Returns
+    -------
+    numpy.ndarray
+      Unique window sizes (integers).
+    """
+    
+    if max_size is None:
+        max_size = n // 4
+    
+    # Checks
+    assert(min_size >= 4)
+    if max_size <= min_size:
+        raise ValueError("Series is too short for the requested window sizes.")
+    
+    scales = np.logspace(np.log10(min_size), np.log10(max_size), n_scales)
+    
+    return np.unique(np.floor(scales).astype(int))
+
+
+def windows(X, scale):
+    """
+    Returns the non-overlapping windows of size scale of an array of shape (T, N)
+    as an array of shape (scale, n_windows, N), dropping the last incomplete window.
+    """
+    
+    n_windows = X.shape[0] // scale
+    
+    return X[:n_windows*scale].reshape(n_windows, scale, X.shape[1]).transpose(1,0,2)
+
+
+def rescaled_ranges(X, scale):
+    """
+    Returns the rescaled range R/S averaged over all the windows of size scale,
+    for each column of an array of increments of shape (T, N).
+    """
+    
+    W = windows(X, scale)
+    deviations = np.cumsum(W - W.mean(axis=0), axis=0)
+    R = deviations.max(axis=0) - deviations.min(axis=0)
+    S = W.std(axis=0)
+    
+    # Windows with zero variance are discarded
+    with np.errstate(divide='ignore', invalid='ignore'):
+        RS = np.where(S > 0, R / S, np.nan)
+    
+    return np.nanmean(RS, axis=0)
+
+
+def dfa_fluctuations(profile, scale, order=1):
+    """
+    Returns the DFA fluctuation function at a given scale, i.e. the root mean square
+    of the residuals of polynomial fits of order `order` in all the windows of size scale,
+    for each column of a profile of shape (T, N).
+    
+    Notes
+    -----
+      All windows share the same design matrix, so the fits of all windows
+      of all columns are done with one least-squares projection.
+    """
+    
+    W = windows(profile, scale)
+    shape = W.shape
+    Y = W.reshape(scale, -1)
+    
+    # Batched least-squares for all windows
+    t = np.arange(scale, dtype=float) / scale
+    V = np.vander(t, order+1)
+    coefs = np.linalg.lstsq(V, Y, rcond=None)[0]
+    residuals = (Y - V @ coefs).reshape(shape)
+    
+    return np.sqrt(np.mean(residuals**2, axis=(0,1)))
+
+
+def loglog_slopes(scales, F):
+    """
+    Returns the slopes of the regressions of log(F) on log(scales),
+    for all columns of F of shape (n_scales, N), with one least-squares.
+    """
+    
+    X = np.column_stack([np.ones(len(scales)), np.log(scales)])
+    
+    return np.linalg.lstsq(X, np.log(F), rcond=None)[0][1]
+
+
+def format_exponents(exponents, panel, Series):
+    """
+    Returns a float for a TimeSeries and a pandas.Series indexed by columns otherwise.
+    """
+    
+    if isinstance(Series, TimeSeries):
+        return float(exponents[0])
+    
+    return pd.Series(exponents, index=panel.columns)
+
+
+def hurst_rs(Series, scales=None, min_size=10, max_size=None, difference=False):
+    """
+    Estimates the Hurst exponent with the rescaled range (R/S) analysis.
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Time series or panel of increments (e.g. returns).
+    scales : list of int or None
+      Window sizes, by default log-spaced between min_size and max_size.
+    min_size : int
+      Smallest window size when scales is None.
+    max_size : int or None
+      Largest window size when scales is None, by default T//4.
+    difference : bool
+      If True, the values are differenced first (e.g. for prices).
+    
+    Returns
+    -------
+    float or pandas.Series
+      Hurst exponent, for each series of a panel.
+    
+    Notes
+    -----
+      Close to 0.5 for uncorrelated increments, above for persistent series
+      and below for anti-persistent ones. The plain R/S estimator is biased
+      upwards in small windows.
+    """
+    
+    # Initializations
+    panel = build_panel(Series)
+    X = panel.values.astype(float)
+    if difference:
+        X = np.diff(X, axis=0)
+    if scales is None:
+        scales = window_scales(X.shape[0], min_size=min_size, max_size=max_size)
+    scales = np.asarray(scales)
+    
+    # Rescaled ranges for all scales and series
+    RS = np.array([rescaled_ranges(X, s) for s in scales])
+    
+    return format_exponents(loglog_slopes(scales, RS), panel, Series)
+
+
+def dfa(Series, scales=None, order=1, min_size=10, max_size=None, difference=False):
+    """
+    Estimates the scaling exponent alpha of the Detrended Fluctuation Analysis (DFA).
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Time series or panel of increments (e.g. returns).
+    scales : list of int or None
+      Window sizes, by default log-spaced between min_size and max_size.
+    order : int
+      Order of the polynomial detrending (1 for DFA-1).
+    min_size : int
+      Smallest window size when scales is None.
+    max_size : int or None
+      Largest window size when scales is None, by default T//4.
+    difference : bool
+      If True, the values are differenced first (e.g. for prices).
+    
+    Returns
+    -------
+    float or pandas.Series
+      DFA exponent, for each series of a panel.
+    
+    Notes
+    -----
+      For stationary increments, alpha estimates the Hurst exponent
+      (0.5 for uncorrelated increments).
+    """
+    
+    # Checks
+    assert(isinstance(order, int) and order >= 0)
+    
+    # Initializations
+    panel = build_panel(Series)
+    X = panel.values.astype(float)
+    if difference:
+        X = np.diff(X, axis=0)
+    if scales is None:
+        scales = window_scales(X.shape[0], min_size=max(min_size, order+3), max_size=max_size)
+    scales = np.asarray(scales)
+    
+    # Profile and fluctuations for all scales and series
+    profile = np.cumsum(X - X.mean(axis=0), axis=0)
+    F = np.array([dfa_fluctuations(profile, s, order=order) for s in scales])
+    
+    return format_exponents(loglog_slopes(scales, F), panel, Series)
+
+
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
@@ -0,0 +1,375 @@
+# Created on 2020/9/18
+
+# This module is for technical indicators computed on time series and panels.
+
+# Standard library imports
+# /
+
+# Third party imports
+import numpy as np
+import pandas as pd
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
+from scipy.signal import lfilter
+
+# Local application imports
+from .timeseries import build_panel, same_type_as
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+### BUILDING BLOCKS ON ARRAYS ###
+
+# These functions work column-wise on arrays of shape (T, N).
+
+def exp_filter(X, alpha):
+    """
+    Returns the exponential moving average y_t = alpha x_t + (1-alpha) y_{t-1}
+    of each column, initialized with the first value, using a linear IIR filter.
+    NaN values are skipped: the output is NaN at these dates and the recursion
+    carries on from the previous valid value.
+    """
+    
+    X = np.asarray(X, dtype=float)
+    if X.ndim == 1:
+        return exp_filter(X[:,np.newaxis], alpha)[:,0]
+    missing = np.isnan(X)
+    
+    # Complete columns are filtered in one call
+    out = np.full(X.shape, np.nan)
+    complete = ~missing.any(axis=0)
+    zi = (1-alpha) * X[:1,complete]
+    out[:,complete] = lfilter([alpha], [1., -(1-alpha)], X[:,complete], axis=0, zi=zi)[0]
+    
+    # Columns with NaN values are filtered on their valid values
+    for j in np.flatnonzero(~complete):
+        valid = ~missing[:,j]
+        x = X[valid,j]
+        if len(x) > 0:
+            out[valid,j] = lfilter([alpha], [1., -(1-alpha)], x, zi=(1-alpha)*x[:1])[0]
+    
+    return out
+
+
+def window_sum(X, window):
+    """
+    Returns the trailing moving sum of each column from cumulative sums,
+    with NaN values for the first window-1 dates and for the windows
+    containing NaN values (which do not spread to later windows).
+    """
+    
+    X = np.asarray(X, dtype=float)
+    missing = np.isnan(X)
+    S = np.cumsum(np.where(missing, 0., X), axis=0)
+    M = np.cumsum(missing, axis=0)
+    out = np.full(X.shape, np.nan)
+    out[window-1] = S[window-1]
+    out[window:] = S[window:] - S[:-window]
+    n_missing = M.copy()
+    n_missing[window:] -= M[:-window]
+    out[n_missing > 0] = np.nan
+    
+    return out
+
+
+def window_mean(X, window):
+    """
+    Returns the trailing moving average of each column from cumulative sums,
+    with NaN values for the first window-1 dates and for the windows
+    containing NaN values.
+    """
+    return window_sum(X, window) / window
+
+
+def window_std(X, window):
+    """
+    Returns the trailing moving (population) standard deviation of each column
+    from cumulative sums of values and squared values.
+    """
+    
+    X = np.asarray(X, dtype=float)
+    # Shift by the first valid value of each column to limit round-off errors
+    first = np.argmax(np.isfinite(X), axis=0)
+    shift = np.nan_to_num(np.take_along_axis(X, first[np.newaxis], axis=0))
+    mean = window_mean(X - shift, window)
+    mean2 = window_mean((X - shift)**2, window)
+    
+    return np.sqrt(np.maximum(mean2 - mean**2, 0.))
+
+
+def window_extremum(X, window, kind='max'):
+    """
+    Returns the trailing moving maximum or minimum of each column,
+    with NaN values for the first window-1 dates and for the windows
+    containing NaN values.
+    """
+    
+    X = np.asarray(X, dtype=float)
+    filt = maximum_filter1d if kind == 'max' else minimum_filter1d
+    # Shift the origin so that the window ends at the current date
+    out = filt(X, size=window, axis=0, origin=(window-1)//2)
+    out[:window-1] = np.nan
+    out[window_sum(np.isnan(X), window) > 0] = np.nan
+    
+    return out
+
+
+
+### INDICATORS ON TIMESERIES AND PANELS ###
+
+# All the functions below accept a TimeSeries or a panel (DataFrame or
+# list of TimeSeries), process all columns in one call, and return
+# TimeSeries for TimeSeries inputs and DataFrames otherwise.
+# Values are expected to be clean (see cleaning.clean_series).
+
+def sma(Series, window):
+    """
+    Returns the Simple Moving Average over a trailing window.
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Time series or panel.
+    window : int
+      Size of the window.
+    
+    Returns
+    -------
+    TimeSeries or DataFrame
+      Moving average, NaN for the first window-1 dates.
+    """
+    
+    # Checks
+    assert(isinstance(window, int) and window>0)
+    
+    panel = build_panel(Series)
+    new_panel = pd.DataFrame(window_mean(panel.values, window), index=panel.index, columns=panel.columns)
+    
+    return same_type_as(new_panel, Series)
+
+
+def ema(Series, span=None, alpha=None):
+    """
+    Returns the Exponential Moving Average.
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Time series or panel.
+    span : int or None
+      Span of the average, giving alpha = 2/(span+1).
+    alpha : float or None
+      Smoothing factor, used when span is None.
+    
+    Returns
+    -------
+    TimeSeries or DataFrame
+      Exponential moving average, initialized with the first value.
+    """
+    
+    # Checks
+    if span is not None:
+        alpha = 2. / (span + 1.)
+    assert(alpha is not None and 0 < alpha <= 1)
+    
+    panel = build_panel(Series)
+    new_panel = pd.DataFrame(exp_filter(panel.values, alpha), index=panel.index, columns=panel.columns)
+    
+    return same_type_as(new_panel, Series)
+
+
+def wilder_smoothing(Series, period=14):
+    """
+    Returns Wilder's smoothing, i.e. an exponential moving average
+    with alpha = 1/period.
+    """
+    return ema(Series, alpha=1./period)
+
+
+def rsi(Series, period=14):
+    """
+    Returns the Relative Strength Index (between 0 and 100).
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Time series or panel of prices.
+    period : int
+      Period of Wilder's smoothing of gains and losses.
+    
+    Returns
+    -------
+    TimeSeries or DataFrame
+      RSI, NaN for the first date.
+    
+    Notes
+    -----
+      Average gains and losses are smoothed recursively from the first change,
+      instead of being initialized with a simple average over the first period.
+    """
+    
+    # Checks
+    assert(isinstance(period, int) and period>0)
+    
+    # Gains and losses
+    panel = build_panel(Series)
+    diff = np.diff(panel.values.astype(float), axis=0)
+    gains = exp_filter(np.maximum(diff, 0.), 1./period)
+    losses = exp_filter(np.maximum(-diff, 0.), 1./period)
+    
+    # Index
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = 100. * gains / (gains + losses)
+    values = np.concatenate([np.full((1,panel.shape[1]), np.nan), values])
+    new_panel = pd.DataFrame(values, index=panel.index, columns=panel.columns)
+    
+    return same_type_as(new_panel, Series)
+
+
+def macd(Series, fast=12, slow=26, signal=9):
+    """
+    Returns the Moving Average Convergence Divergence (MACD)
+    line, its signal line and their difference (histogram).
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Time series or panel of prices.
+    fast : int
+      Span of the fast exponential moving average.
+    slow : int
+      Span of the slow exponential moving average.
+    signal : int
+      Span of the exponential moving average of the MACD line.
+    
+    Returns
+    -------
+    List of 3 TimeSeries or DataFrames
+      MACD line, signal line and histogram.
+    """
+    
+    # Checks
+    assert(fast < slow)
+    
+    panel = build_panel(Series)
+    X = panel.values.astype(float)
+    line = exp_filter(X, 2./(fast+1.)) - exp_filter(X, 2./(slow+1.))
+    sig = exp_filter(line, 2./(signal+1.))
+    
+    return [same_type_as(pd.DataFrame(x, index=panel.index, columns=panel.columns), Series)
+            for x in [line, sig, line - sig]]
+
+
+def bollinger_bands(Series, window=20, n_std=2.):
+    """
+    Returns the Bollinger bands, i.e. the moving average
+    and the bands at plus and minus n_std moving standard deviations.
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Time series or panel of prices.
+    window : int
+      Size of the window.
+    n_std : float
+      Number of standard deviations of the bands.
+    
+    Returns
+    -------
+    List of 3 TimeSeries or DataFrames
+      Middle, upper and lower bands.
+    """
+    
+    # Checks
+    assert(isinstance(window, int) and window>1)
+    
+    panel = build_panel(Series)
+    X = panel.values.astype(float)
+    middle = window_mean(X, window)
+    width = n_std * window_std(X, window)
+    
+    return [same_type_as(pd.DataFrame(x, index=panel.index, columns=panel.columns), Series)
+            for x in [middle, middle + width, middle - width]]
+
+
+def true_range(high, low, close):
+    """
+    Returns the true range max(h_t - l_t, |h_t - c_{t-1}|, |l_t - c_{t-1}|)
+    as an array of shape (T, N), the first date using h_t - l_t.
+    """
+    
+    H = build_panel(high).values.astype(float)
+    L = build_panel(low).values.astype(float)
+    C = build_panel(close).values.astype(float)
+    prev = np.concatenate([C[:1], C[:-1]])
+    
+    return np.maximum(H - L, np.maximum(np.abs(H - prev), np.abs(L - prev)))
+
+
+def atr(high, low, close, period=14):
+    """
+    Returns the Average True Range, i.e. Wilder's smoothing of the true range.
+    
+    Parameters
+    ----------
+    high, low, close : TimeSeries, list of TimeSeries or DataFrame
+      High, low and close prices with the same shape and index.
+    period : int
+      Period of Wilder's smoothing.
+    
+    Returns
+    -------
+    TimeSeries or DataFrame
+      Average true range.
+    """
+    
+    panel = build_panel(close)
+    values = exp_filter(true_range(high, low, close), 1./period)
+    new_panel = pd.DataFrame(values, index=panel.index, columns=panel.columns)
+    
+    return same_type_as(new_panel, close)
+
+
+def stochastic(high, low, close, k_window=14, d_window=3):
+    """
+    Returns the stochastic oscillator %K = 100 (c_t - LL) / (HH - LL),
+    where LL and HH are the lowest low and highest high over a trailing window,
+    and its moving average %D.
+    
+    Parameters
+    ----------
+    high, low, close : TimeSeries, list of TimeSeries or DataFrame
+      High, low and close prices with the same shape and index.
+    k_window : int
+      Size of the window of %K.
+    d_window : int
+      Size of the moving average giving %D.
+    
+    Returns
+    -------
+    List of 2 TimeSeries or DataFrames
+      %K and %D.
+    
+    Notes
+    -----
+      Moving extrema are computed with van Herk/Gil-Werman filters,
+      in O(T) whatever the window size.
+      When the range is flat (HH = LL), %K is set to 50.
+    """
+    
+    panel = build_panel(close)
+    C = panel.values.astype(float)
+    HH = window_extremum(build_panel(high).values, k_window, kind='max')
+    LL = window_extremum(build_panel(low).values, k_window, kind='min')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        K = np.where(HH == LL, 50., 100. * (C - LL) / (HH - LL))
+    D = np.full(K.shape, np.nan)
+    D[k_window-1:] = window_mean(K[k_window-1:], d_window)
+    
+    return [same_type_as(pd.DataFrame(x, index=panel.index, columns=panel.columns), close)
+            for x in [K, D]]
+
+
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
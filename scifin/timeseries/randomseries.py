@@ -4,26 +4,209 @@
 
 # Standard library imports
 from datetime import datetime
+import functools
 
 # Third party imports
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+from scipy.linalg import solve_banded
+from scipy.signal import lfilter, lfiltic
 
 # Local application imports
 from . import TimeSeries
+from .timeseries import NSPY, index_to_int64
 
 
 #---------#---------#---------#---------#---------#---------#---------#---------#---------#
 
 
+### RANDOM NUMBERS GENERATORS ###
+
+def get_generator(seed=None):
+    """
+    Returns the generator of random numbers to use for a seed.
+    
+    Parameters
+    ----------
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers.
+    
+    Returns
+    -------
+    numpy.random.Generator or numpy.random module
+      A new Generator for an int or a SeedSequence, the same Generator for a Generator,
+      and the global NumPy random state (i.e. np.random.seed applies) for None.
+    """
+    
+    if seed is None:
+        return np.random
+    
+    return np.random.default_rng(seed)
+
+
+def spawn_generators(n, seed=None):
+    """
+    Returns independent generators of random numbers,
+    e.g. to be used by parallel simulations.
+    
+    Parameters
+    ----------
+    n : int
+      Number of generators.
+    seed : None, int or SeedSequence
+      Root seed, fresh entropy from the OS if None.
+    
+    Returns
+    -------
+    List of numpy.random.Generator
+      Generators built from the children of a SeedSequence.
+    
+    Notes
+    -----
+      Streams spawned from a SeedSequence are statistically independent,
+      and the same root seed always gives the same streams.
+    """
+    
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    
+    return [np.random.default_rng(s) for s in seed.spawn(n)]
+
+
+
+### LINEAR FILTERS ###
+
+# Linear models are generated as filters of white noise along the time axis,
+# for all paths at once, instead of loops over time and lags.
+
+def ma_filter(a, coeffs):
+    """
+    Returns the Moving Average filter a_t + coeffs[0] * a_{t-1} + ... + coeffs[Q-1] * a_{t-Q}
+    of noise paths of shape (n_paths, T), with a_t = 0 for t < 0.
+    """
+    
+    if len(coeffs) == 0:
+        return a
+    
+    return lfilter(np.r_[1., coeffs], [1.], a, axis=1)
+
+
+def ar_filter(u, coeffs, start_values):
+    """
+    Returns the Auto-Regressive recursion x_t = u_t + coeffs[0] * x_{t-1} + ... + coeffs[P-1] * x_{t-P}
+    of input paths of shape (n_paths, T), where the P first values of each path
+    are set to start_values and the P first inputs are not used.
+    """
+    
+    P = len(coeffs)
+    n_paths, T = u.shape
+    if P == 0:
+        return u
+    
+    # Initial conditions of the filter from the starting values
+    den = np.r_[1., -np.asarray(coeffs, dtype=float)]
+    zi = lfiltic([1.], den, y=np.asarray(start_values, dtype=float)[::-1])
+    zi = np.tile(zi, (n_paths, 1))
+    
+    x = np.empty((n_paths, T))
+    x[:,:P] = start_values
+    x[:,P:] = lfilter([1.], den, u[:,P:], axis=1, zi=zi)[0]
+    
+    return x
+
+
+def covariance_factor(cov_matrix):
+    """
+    Returns a matrix L such that L L^T = cov_matrix, from a Cholesky factorization,
+    or from an eigen-decomposition if the matrix is only semi-definite.
+    """
+    
+    cov_matrix = np.asarray(cov_matrix, dtype=float)
+    try:
+        return np.linalg.cholesky(cov_matrix)
+    except np.linalg.LinAlgError:
+        w, V = np.linalg.eigh(cov_matrix)
+        return V * np.sqrt(np.maximum(w, 0.))
+
+
+def random_coefficient_filter(u, ARcoeffs, coeffs):
+    """
+    Returns the solution of the recursion with random coefficients
+    x_t = u_t + Sum_{m=0}^{M-1} (ARcoeffs[m] + coeffs[t,m]) * x_{t-m-1}
+    for inputs u of shape (n_paths, T) and coefficients of shape (n_paths, T, M),
+    with x_t = 0 for t < 0.
+    
+    Notes
+    -----
+      The recursion of all paths is written as a single lower-triangular banded
+      linear system of size n_paths*T and bandwidth M, with the lags crossing
+      the start of a path set to zero, and solved by forward substitution in
+      one compiled call instead of a loop over time.
+    """
+    
+    # Initializations
+    n_paths, T, M = coeffs.shape
+    n = n_paths * T
+    if M == 0:
+        return u
+    all_coeffs = (np.asarray(ARcoeffs, dtype=float) + coeffs).reshape(n, M)
+    t = np.tile(np.arange(T), n_paths)
+    
+    # Banded matrix: unit diagonal, minus the coefficient of lag k on the k-th subdiagonal
+    ab = np.zeros((M+1, n))
+    ab[0] = 1.
+    for k in range(1, M+1):
+        ab[k,:n-k] = np.where(t[k:] >= k, -all_coeffs[k:,k-1], 0.)
+    
+    x = solve_banded((M,0), ab, u.ravel(), check_finite=False)
+    
+    return x.reshape(n_paths, T)
+
+
+@functools.lru_cache(maxsize=128)
+def date_index(start_date, end_date, frequency):
+    """
+    Returns the index of dates between start_date and end_date with a given frequency.
+    
+    Notes
+    -----
+      Indexes are cached, so that repeated generations with the same dates
+      share the same (immutable) index instead of rebuilding it.
+    """
+    return pd.date_range(start=start_date, end=end_date, freq=frequency)
+
+
+def paths_to_series(x, data_index, tz=None, name="", as_array=False):
+    """
+    Returns a TimeSeries for a single path and a DataFrame with one column per path
+    (i.e. a panel of time series) for several paths of shape (n_paths, T).
+    If as_array is True, the values are returned as an array of shape (T,)
+    for a single path and (n_paths, T) otherwise.
+    """
+    
+    if as_array:
+        return x[0] if x.shape[0] == 1 else x
+    
+    if x.shape[0] == 1:
+        df = pd.DataFrame(index=data_index, data=x[0])
+        return TimeSeries(df, tz=tz, name=name)
+    
+    panel = pd.DataFrame(index=data_index, data=x.T)
+    if tz is not None:
+        panel = panel.tz_localize(tz)
+    
+    return panel
+
+
+
 ### TIME SERIES MODELS ###
 
 
 # Simple models
 
 
-def constant(start_date, end_date, frequency, cst=0., sigma=0., tz=None, name=""):
+def constant(start_date, end_date, frequency, cst=0., sigma=0., tz=None, name="", seed=None, as_array=False, verbose=False):
     """
     Defines a time series with constant numerical value
     and eventually add a noise to it.
@@ -42,10 +225,16 @@ def constant(start_date, end_date, frequency, cst=0., sigma=0., tz=None, name=""
       Standard deviation for the Gaussian noise.
     name : str
       Name or nickname of the series.
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers, the global NumPy random state if None.
+    as_array : bool
+      Option to return the values as a numpy array instead of a TimeSeries.
+    verbose : bool
+      Option to print the theoretical moments of the process. Silent by default.
 
     Returns
     -------
-    TimeSeries
+    TimeSeries or numpy.ndarray
       The constant time series with eventual Gaussian noise.
     
     Raises
@@ -68,15 +257,24 @@ def constant(start_date, end_date, frequency, cst=0., sigma=0., tz=None, name=""
     assert(isinstance(sigma, int) or isinstance(sigma, float))
     
     # Generate index
-    data_index = pd.date_range(start=start_date, end=end_date, freq=frequency)
+    data_index = date_index(start_date, end_date, frequency)
     T = len(data_index)
     
     # Generate data
     if float(sigma) != 0.:
-        rand_val = np.random.normal(loc=0., scale=sigma, size=T)
-        data_vals = [cst] * T + rand_val
+        rng = get_generator(seed)
+        rand_val = rng.normal(loc=0., scale=sigma, size=T)
+        data_vals = cst + rand_val
     else:
-        data_vals = [cst] * T
+        data_vals = np.full(T, float(cst))
+    
+    # Compute theoretical values
+    if verbose:
+        print("The expected value for this constant model is: " + str(cst) \
+              + " , with a standard deviation of: " + str(sigma) + "\n")
+    
+    if as_array:
+        return data_vals
 
     # Make time series
     df = pd.DataFrame(index=data_index, data=data_vals)
@@ -91,7 +289,8 @@ def constant(start_date, end_date, frequency, cst=0., sigma=0., tz=None, name=""
 # These models describe the evolution of time series.
 
 
-def auto_regressive(start_date, end_date, frequency, start_values, cst, order, coeffs, sigma, tz=None, name=""):
+def auto_regressive(start_date, end_date, frequency, start_values, cst, order, coeffs, sigma,
+                    tz=None, name="", n_paths=1, seed=None, as_array=False, verbose=True):
     """
     Generates a time series from the Auto-Regressive (AR) model of arbitrary order P.
     
@@ -121,11 +320,20 @@ def auto_regressive(start_date, end_date, frequency, start_values, cst, order, c
       Standard deviation of the Gaussian white noise.
     name : str
       Name or nickname of the series.
+    n_paths : int
+      Number of independent paths to generate.
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers, the global NumPy random state if None.
+    as_array : bool
+      Option to return the values as a numpy array instead of a TimeSeries.
+    verbose : bool
+      Option to print the theoretical moments of the process.
     
     Returns
     -------
-    TimeSeries
-      The time series resulting from the Auto-Regressive process.
+    TimeSeries, DataFrame or numpy.ndarray
+      The time series resulting from the Auto-Regressive process,
+      or a panel with one column per path if n_paths > 1.
     
     Raises
     ------
@@ -148,34 +356,29 @@ def auto_regressive(start_date, end_date, frequency, start_values, cst, order, c
     P = len(start_values)
     
     # Generate index
-    data_index = pd.date_range(start=start_date, end=end_date, freq=frequency)
+    data_index = date_index(start_date, end_date, frequency)
     T = len(data_index)
     
+    # Random numbers generator
+    rng = get_generator(seed)
+    
     # Generate the white noise (Note: p first values are not used)
-    a = np.random.normal(loc=0., scale=sigma, size=T)
+    a = rng.normal(loc=0., scale=sigma, size=(n_paths,T))
     
     # Generate the random series
-    x = [0.] * T
-    for t_ini in range(P):
-        x[t_ini] = start_values[t_ini]
-    for t in range(P,T,1):
-        x[t] = cst + a[t]
-        for p in range(P):
-            x[t] += coeffs[p] * x[t-p-1]
+    x = ar_filter(cst + a, coeffs, start_values)
     
     # Compute theoretical expectation value
-    E = cst / (1 - sum(coeffs))
-    print("Under stationarity assumption, the expected value for this AR("
-          + str(P) + ") model is: " + str(E) + "\n")
+    if verbose:
+        E = cst / (1 - sum(coeffs))
+        print("Under stationarity assumption, the expected value for this AR("
+              + str(P) + ") model is: " + str(E) + "\n")
     
     # Combine them into a time series
-    df = pd.DataFrame(index=data_index, data=x)
-    rs = TimeSeries(df, tz=tz, name=name)
-    
-    return rs
+    return paths_to_series(x, data_index, tz=tz, name=name, as_array=as_array)
 
 
-def random_walk(start_date, end_date, frequency, start_value, sigma, tz=None, name=""):
+def random_walk(start_date, end_date, frequency, start_value, sigma, tz=None, name="", seed=None, as_array=False, verbose=False):
     """
     Generates a time series from the Random Walk process,
     i.e. an AR(1) model with {cst = 0, coeff[0] = 1}.
@@ -198,10 +401,16 @@ def random_walk(start_date, end_date, frequency, start_value, sigma, tz=None, na
       Standard deviation of the Gaussian white noise.
     name : str
       Name or nickname of the series.
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers, the global NumPy random state if None.
+    as_array : bool
+      Option to return the values as a numpy array instead of a TimeSeries.
+    verbose : bool
+      Option to print the theoretical moments of the process. Silent by default.
     
     Returns
     -------
-    TimeSeries
+    TimeSeries or numpy.ndarray
       The time series resulting from the Random Walk process.
     
     Raises
@@ -220,17 +429,27 @@ def random_walk(start_date, end_date, frequency, start_value, sigma, tz=None, na
     """
     
     # Generate index
-    data_index = pd.date_range(start=start_date, end=end_date, freq=frequency)
+    data_index = date_index(start_date, end_date, frequency)
     T = len(data_index)
     
+    # Random numbers generator
+    rng = get_generator(seed)
+    
     # Generate the white noise (Note: first value is not used)
-    a = np.random.normal(loc=0., scale=sigma, size=T)
+    a = rng.normal(loc=0., scale=sigma, size=T)
     
     # Generate the random series
-    x = [0.] * T
-    x[0] = start_value
-    for t in range(1,T,1):
-        x[t] = x[t-1] + a[t]
+    a[0] = start_value
+    x = np.cumsum(a)
+    
+    # Compute theoretical values
+    if verbose:
+        print("The expected value for this random walk is: " + str(start_value))
+        print("The theoretical standard deviation at the last date is: " \
+              + str(sigma * np.sqrt(T-1)) + "\n")
+    
+    if as_array:
+        return x
     
     # Combine them into a time series
     df = pd.DataFrame(index=data_index, data=x)
@@ -239,7 +458,7 @@ def random_walk(start_date, end_date, frequency, start_value, sigma, tz=None, na
     return rs
 
 
-def drift_random_walk(start_date, end_date, frequency, start_value, drift, sigma, tz=None, name=""):
+def drift_random_walk(start_date, end_date, frequency, start_value, drift, sigma, tz=None, name="", seed=None, as_array=False, verbose=False):
     """
     Generates a time series from the Random Walk with Drift process,
     i.e. an AR(1) model with {cst != 0, coeffs[0] = 1}.
@@ -264,10 +483,16 @@ def drift_random_walk(start_date, end_date, frequency, start_value, drift, sigma
       Standard deviation of the Gaussian white noise.
     name : str
       Name or nickname of the series.
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers, the global NumPy random state if None.
+    as_array : bool
+      Option to return the values as a numpy array instead of a TimeSeries.
+    verbose : bool
+      Option to print the theoretical moments of the process. Silent by default.
     
     Returns
     -------
-    TimeSeries
+    TimeSeries or numpy.ndarray
       The time series resulting from the Random Walk process with drift.
     
     Raises
@@ -286,17 +511,29 @@ def drift_random_walk(start_date, end_date, frequency, start_value, drift, sigma
     """
     
     # Generate index
-    data_index = pd.date_range(start=start_date, end=end_date, freq=frequency)
+    data_index = date_index(start_date, end_date, frequency)
     T = len(data_index)
     
+    # Random numbers generator
+    rng = get_generator(seed)
+    
     # Generate the white noise (Note: first value is not used)
-    a = np.random.normal(loc=0., scale=sigma, size=T)
+    a = rng.normal(loc=0., scale=sigma, size=T)
     
     # Generate the random series
-    x = [0.] * T
-    x[0] = start_value
-    for t in range(1,T,1):
-        x[t] = drift + x[t-1] + a[t]
+    a[1:] += drift
+    a[0] = start_value
+    x = np.cumsum(a)
+    
+    # Compute theoretical values
+    if verbose:
+        print("The expected value for this random walk with drift at the last date is: " \
+              + str(start_value + drift * (T-1)))
+        print("The theoretical standard deviation at the last date is: " \
+              + str(sigma * np.sqrt(T-1)) + "\n")
+    
+    if as_array:
+        return x
     
     # Combine them into a time series
     df = pd.DataFrame(index=data_index, data=x)
@@ -305,7 +542,8 @@ def drift_random_walk(start_date, end_date, frequency, start_value, drift, sigma
     return rs
 
 
-def moving_average(start_date, end_date, frequency, cst, order, coeffs, sigma, tz=None, name=""):
+def moving_average(start_date, end_date, frequency, cst, order, coeffs, sigma,
+                   tz=None, name="", n_paths=1, seed=None, as_array=False, verbose=True):
     """
     Generates a time series from the Moving Average (MA) model of arbitrary order Q.
     
@@ -338,11 +576,20 @@ def moving_average(start_date, end_date, frequency, cst, order, coeffs, sigma, t
       Standard deviation of the Gaussian white noise.
     name : str
       Name or nickname of the series.
+    n_paths : int
+      Number of independent paths to generate.
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers, the global NumPy random state if None.
+    as_array : bool
+      Option to return the values as a numpy array instead of a TimeSeries.
+    verbose : bool
+      Option to print the theoretical moments of the process.
       
     Returns
     -------
-    TimeSeries
-      The time series resulting from the Moving Average process.
+    TimeSeries, DataFrame or numpy.ndarray
+      The time series resulting from the Moving Average process,
+      or a panel with one column per path if n_paths > 1.
     
     Raises
     ------
@@ -364,45 +611,41 @@ def moving_average(start_date, end_date, frequency, cst, order, coeffs, sigma, t
     Q = order
     
     # Generate index
-    data_index = pd.date_range(start=start_date, end=end_date, freq=frequency)
+    data_index = date_index(start_date, end_date, frequency)
     T = len(data_index)
     
+    # Random numbers generator
+    rng = get_generator(seed)
+    
     # Generate the white noise
-    a = np.random.normal(loc=0., scale=sigma, size=T)
+    a = rng.normal(loc=0., scale=sigma, size=(n_paths,T))
     
     # Generate the random series
-    x = [0.] * T
-    for t in range(T):
-        x[t] = cst + a[t]
-        for q in range(Q):
-            if t-q > 0:
-                x[t] -= coeffs[q] * a[t-q-1]
+    x = cst + ma_filter(a, coeffs)
     
     # Compute theoretical values
-    V = 1.
-    for q in range(Q):
-        V += coeffs[q]**2
-    V *= sigma**2
-    print("The expected value for this MA(" + str(Q) + ") model is: " + str(cst))
-    print("The estimation of the variance for this MA(" + str(Q) + ") model is: " + str(V) + \
-          " , i.e. a standard deviation of: " + str(np.sqrt(V)) + "\n")
+    if verbose:
+        V = 1.
+        for q in range(Q):
+            V += coeffs[q]**2
+        V *= sigma**2
+        print("The expected value for this MA(" + str(Q) + ") model is: " + str(cst))
+        print("The estimation of the variance for this MA(" + str(Q) + ") model is: " + str(V) + \
+              " , i.e. a standard deviation of: " + str(np.sqrt(V)) + "\n")
     
     # Combine them into a time series
-    df = pd.DataFrame(index=data_index, data=x)
-    rs = TimeSeries(df, tz=tz, name=name)
-    
-    return rs
+    return paths_to_series(x, data_index, tz=tz, name=name, as_array=as_array)
 
 
 
 def arma(start_date, end_date, frequency, start_values,
-         cst, ARorder, ARcoeffs, MAorder, MAcoeffs, sigma, tz=None, name=""):
+         cst, ARorder, ARcoeffs, MAorder, MAcoeffs, sigma, tz=None, name="", n_paths=1, seed=None, as_array=False, verbose=False):
     """
     Function generating a time series from the Auto-Regressive Moving Average (ARMA)
     model of orders (P,Q).
     
     The model is of the form:
-    x_t = cst + Sum_{i=0}^{P-1} ARcoeffs[i] * a_{t-i-1}
+    x_t = cst + Sum_{i=0}^{P-1} ARcoeffs[i] * x_{t-i-1}
         + a_t + Sum_{j=0}^{Q-1} MAcoeffs[j] * a_{t-j-1}
     where {a_t} is the white noise series with standard deviation sigma.
     
@@ -432,11 +675,20 @@ def arma(start_date, end_date, frequency, start_values,
       Standard deviation of the Gaussian white noise.
     name : str
       Name or nickname of the series.
+    n_paths : int
+      Number of independent paths to generate.
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers, the global NumPy random state if None.
+    as_array : bool
+      Option to return the values as a numpy array instead of a TimeSeries.
+    verbose : bool
+      Option to print the theoretical moments of the process. Silent by default.
     
     Returns
     -------
-    TimeSeries
-      The time series resulting from the ARMA process.
+    TimeSeries, DataFrame or numpy.ndarray
+      The time series resulting from the ARMA process,
+      or a panel with one column per path if n_paths > 1.
     
     Raises
     ------
@@ -461,35 +713,32 @@ def arma(start_date, end_date, frequency, start_values,
     Q = MAorder
     
     # Generate index
-    data_index = pd.date_range(start=start_date, end=end_date, freq=frequency)
+    data_index = date_index(start_date, end_date, frequency)
     T = len(data_index)
     
+    # Random numbers generator
+    rng = get_generator(seed)
+    
     # Generate the white noise
-    a = np.random.normal(loc=0., scale=sigma, size=T)
+    a = rng.normal(loc=0., scale=sigma, size=(n_paths,T))
     
     # Generate the random series
-    x = [0.] * T
-    # Taking care of {x_0, x_1, ..., x_P}
-    for t_ini in range(P):
-        x[t_ini] = start_values[t_ini]
-    # Taking care of the rest
-    for t in range(P,T,1):
-        x[t] = cst + a[t]
-        for p in range(P):
-            x[t] += ARcoeffs[p] * x[t-p]
-        for q in range(Q):
-            if t-q > 0:
-                x[t] -= MAcoeffs[q] * x[t-q-1]
+    # (MA part as a FIR filter of the noise, then AR part as an IIR filter)
+    x = ar_filter(cst + ma_filter(a, MAcoeffs), ARcoeffs, start_values)
     
-    # Combine them into a time series
-    df = pd.DataFrame(index=data_index, data=x)
-    rs = TimeSeries(df, tz=tz, name=name)
+    # Compute theoretical expectation value
+    if verbose:
+        E = cst / (1 - sum(ARcoeffs))
+        print("Under stationarity assumption, the expected value for this ARMA("
+              + str(P) + "," + str(Q) + ") model is: " + str(E) + "\n")
     
-    return rs
+    # Combine them into a time series
+    return paths_to_series(x, data_index, tz=tz, name=name, as_array=as_array)
 
 
 
-def rca(start_date, end_date, frequency, cst, order, ARcoeffs, cov_matrix, sigma, tz=None, name=""):
+def rca(start_date, end_date, frequency, cst, order, ARcoeffs, cov_matrix, sigma,
+        tz=None, name="", n_paths=1, seed=None, as_array=False, verbose=False):
     """
     Function generating a time series from the Random Coefficient Auto-Regressive (RCA)
     model of order M.
@@ -522,11 +771,20 @@ def rca(start_date, end_date, frequency, cst, order, ARcoeffs, cov_matrix, sigma
       Standard deviation of the Gaussian white noise.
     name : str
       Name or nickname of the series.
+    n_paths : int
+      Number of independent paths to generate.
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers, the global NumPy random state if None.
+    as_array : bool
+      Option to return the values as a numpy array instead of a TimeSeries.
+    verbose : bool
+      Option to print the theoretical moments of the process. Silent by default.
       
     Returns
     -------
-    TimeSeries
-      The time series resulting from the RCA process.
+    TimeSeries, DataFrame or numpy.ndarray
+      The time series resulting from the RCA process,
+      or a panel with one column per path if n_paths > 1.
     
     Raises
     ------
@@ -560,27 +818,30 @@ def rca(start_date, end_date, frequency, cst, order, ARcoeffs, cov_matrix, sigma
     M = order
     
     # Generate index
-    data_index = pd.date_range(start=start_date, end=end_date, freq=frequency)
+    data_index = date_index(start_date, end_date, frequency)
     T = len(data_index)
     
+    # Random numbers generator
+    rng = get_generator(seed)
+    
     # Generate the white noise
-    a = np.random.normal(loc=0., scale=sigma, size=T)
+    a = rng.normal(loc=0., scale=sigma, size=(n_paths,T))
+    
+    # Generate all the coefficients from a single factorization
+    L = covariance_factor(cov_matrix)
+    coeffs = rng.normal(loc=0., scale=1., size=(n_paths,T,M)) @ L.T
     
     # Generate the random series
-    x = [0.] * T
-    for t in range(T):
-        x[t] = cst + a[t]
-        # Generate the list of coefficients
-        coeffs = np.random.multivariate_normal(mean=[0.] * M, cov=cov_matrix, size=1)[0]
-        for m in range(M):
-            if t-m > 0:
-                x[t] += (ARcoeffs[m] + coeffs[m]) * a[t-m-1]
+    x = random_coefficient_filter(cst + a, ARcoeffs, coeffs)
     
-    # Combine them into a time series
-    df = pd.DataFrame(index=data_index, data=a)
-    rs = TimeSeries(df, tz=tz, name=name)
+    # Compute theoretical expectation value
+    if verbose:
+        E = cst / (1 - sum(ARcoeffs))
+        print("Under stationarity assumption, the expected value for this RCA("
+              + str(M) + ") model is: " + str(E) + "\n")
     
-    return rs
+    # Combine them into a time series
+    return paths_to_series(x, data_index, tz=tz, name=name, as_array=as_array)
 
 
 
@@ -588,7 +849,85 @@ def rca(start_date, end_date, frequency, cst, order, ARcoeffs, cov_matrix, sigma
 
 # These models describe the volatility of a time series.
 
-def arch(start_date, end_date, frequency, cst, order, coeffs, tz=None, name=""):
+def garch_paths(cst, coeffs_a, coeffs_sig, T, n_paths=1, eps=None, seed=None):
+    """
+    Generates paths of the GARCH model, vectorized across paths and lags.
+    
+    The model is of the form:
+    a_t = sig_t * eps_t
+    with sig_t^2 = cst + Sum_{i=0}^{M-1} coeffs_a[i] * a_{t-i-1}^2 
+                       + Sum_{j=0}^{S-1} coeffs_sig[j] * sig_{t-j-1}^2,
+    where values before t=0 are taken equal to zero.
+    
+    Parameters
+    ----------
+    cst : float
+      Constant value of the process.
+    coeffs_a : list
+      List of coefficients of the a_t part of the process (empty for ARCH).
+    coeffs_sig : list
+      List of coefficients of the sig_t part of the process.
+    T : int
+      Number of time steps.
+    n_paths : int
+      Number of independent paths.
+    eps : numpy.ndarray or None
+      Unit white noise of shape (T, n_paths), drawn from a standard Gaussian if None.
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers, the global NumPy random state if None.
+    
+    Returns
+    -------
+    numpy.ndarray, numpy.ndarray
+      Values a_t and volatilities sig_t, both of shape (T, n_paths).
+    
+    Notes
+    -----
+      The time recursion is kept, but each step updates all paths at once.
+      Squared values of the last M and S steps are kept in ring buffers of
+      shape (M, n_paths) and (S, n_paths), combined with the coefficients
+      in the order matching the current position in the buffers.
+    """
+    
+    # Initializations
+    coeffs_a = np.asarray(coeffs_a, dtype=float)
+    coeffs_sig = np.asarray(coeffs_sig, dtype=float)
+    M = len(coeffs_a)
+    S = len(coeffs_sig)
+    if eps is None:
+        rng = get_generator(seed)
+        eps = rng.normal(loc=0., scale=1., size=(T, n_paths))
+    assert(eps.shape == (T, n_paths))
+    
+    a = np.empty((T, n_paths))
+    sig = np.empty((T, n_paths))
+    sig2 = np.empty(n_paths)
+    a2_buffer = np.zeros((M, n_paths))
+    sig2_buffer = np.zeros((S, n_paths))
+    
+    # Weights of the buffer slots for each position in the ring,
+    # slot k holding the value at lag (t-1-k)%M + 1
+    weights_a = np.array([coeffs_a[(t - 1 - np.arange(M)) % M] for t in range(M)]).reshape(M, M)
+    weights_sig = np.array([coeffs_sig[(t - 1 - np.arange(S)) % S] for t in range(S)]).reshape(S, S)
+    
+    # Time recursion, with in-place operations on all paths
+    for t in range(T):
+        sig2.fill(cst)
+        if M > 0:
+            sig2 += weights_a[t % M] @ a2_buffer
+        if S > 0:
+            sig2 += weights_sig[t % S] @ sig2_buffer
+        np.sqrt(sig2, out=sig[t])
+        np.multiply(sig[t], eps[t], out=a[t])
+        if M > 0:
+            np.square(a[t], out=a2_buffer[t % M])
+        if S > 0:
+            sig2_buffer[t % S] = sig2
+    
+    return a, sig
+
+
+def arch(start_date, end_date, frequency, cst, order, coeffs, tz=None, name="", n_paths=1, seed=None, as_array=False, verbose=True):
     """
     Function generating a volatility series from the
     Auto-Regressive Conditional Heteroscedastic (ARCH) model of order M.
@@ -619,11 +958,20 @@ def arch(start_date, end_date, frequency, cst, order, coeffs, tz=None, name=""):
       List of coefficients of the process.
     name : str
       Name or nickname of the series.
+    n_paths : int
+      Number of independent paths to generate.
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers, the global NumPy random state if None.
+    as_array : bool
+      Option to return the values as a numpy array instead of a TimeSeries.
+    verbose : bool
+      Option to print the theoretical moments of the process.
       
     Returns
     -------
-    TimeSeries
-      The time series resulting from the ARCH process.
+    TimeSeries, DataFrame or numpy.ndarray
+      The time series resulting from the ARCH process,
+      or a panel with one column per path if n_paths > 1.
     
     Raises
     ------
@@ -656,38 +1004,27 @@ def arch(start_date, end_date, frequency, cst, order, coeffs, tz=None, name=""):
     M = order
     
     # Generate index
-    data_index = pd.date_range(start=start_date, end=end_date, freq=frequency)
+    data_index = date_index(start_date, end_date, frequency)
     T = len(data_index)
     
-    # Generate the "unit" white noise
-    eps = np.random.normal(loc=0., scale=1, size=T)
-
     # Generate the random series
-    a = [0.] * T
-    for t in range(T):
-        sig_square = cst
-        for m in range(M):
-            if t-m > 0:
-                sig_square += coeffs[m] * a[t-m-1]**2
-        sig = np.sqrt(sig_square)
-        a[t] = sig * eps[t]
+    a, _ = garch_paths(cst, coeffs, [], T, n_paths=n_paths, seed=seed)
     
     # Compute theoretical values
-    print("The expected value for this ARCH(" + str(M) \
-          + ") model is 0, like any other ARCH model, and the estimated value is : " \
-          + str(np.mean(a)))
-    V = cst / (1 - sum(coeffs))
-    print("The theoretical standard deviation value for this ARCH(" + str(M) \
-          + ") model is: " + str(V))
+    if verbose:
+        print("The expected value for this ARCH(" + str(M) \
+              + ") model is 0, like any other ARCH model, and the estimated value is : " \
+              + str(np.mean(a)))
+        V = cst / (1 - sum(coeffs))
+        print("The theoretical standard deviation value for this ARCH(" + str(M) \
+              + ") model is: " + str(V))
     
     # Combine them into a time series
-    df = pd.DataFrame(index=data_index, data=a)
-    rs = TimeSeries(df, tz=tz, name=name)
-    
-    return rs
+    return paths_to_series(a.T, data_index, tz=tz, name=name, as_array=as_array)
 
 
-def garch(start_date, end_date, frequency, cst, order_a, coeffs_a, order_sig, coeffs_sig, tz=None, name=""):
+def garch(start_date, end_date, frequency, cst, order_a, coeffs_a, order_sig, coeffs_sig,
+          tz=None, name="", n_paths=1, seed=None, as_array=False, verbose=True):
     """
     Function generating a volatility series from the
     Generalized ARCH (GARCH) model of order M.
@@ -723,11 +1060,20 @@ def garch(start_date, end_date, frequency, cst, order_a, coeffs_a, order_sig, co
       List of coefficients of the sig_t part of the process.
     name : str
       Name or nickname of the series.
+    n_paths : int
+      Number of independent paths to generate.
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers, the global NumPy random state if None.
+    as_array : bool
+      Option to return the values as a numpy array instead of a TimeSeries.
+    verbose : bool
+      Option to print the theoretical moments of the process.
       
     Returns
     -------
-    TimeSeries
-      The time series resulting from the GARCH process.
+    TimeSeries, DataFrame or numpy.ndarray
+      The time series resulting from the GARCH process,
+      or a panel with one column per path if n_paths > 1.
     
     Raises
     ------
@@ -762,39 +1108,23 @@ def garch(start_date, end_date, frequency, cst, order_a, coeffs_a, order_sig, co
     S = order_sig
     
     # Generate index
-    data_index = pd.date_range(start=start_date, end=end_date, freq=frequency)
+    data_index = date_index(start_date, end_date, frequency)
     T = len(data_index)
     
-    # Generate the "unit" white noise
-    eps = np.random.normal(loc=0., scale=1, size=T)
-
     # Generate the random series
-    a = [0.] * T
-    sig = [0.] * T
-    for t in range(T):
-        sig_square = cst
-        for m in range(M):
-            if t-m > 0:
-                sig_square += coeffs_a[m] * a[t-m-1]**2
-        for s in range(S):
-            if t-s > 0:
-                sig_square += coeffs_sig[s] * sig[t-s-1]**2
-        sig[t] = np.sqrt(sig_square)
-        a[t] = sig[t] * eps[t]
+    a, _ = garch_paths(cst, coeffs_a, coeffs_sig, T, n_paths=n_paths, seed=seed)
 
     # Compute theoretical values
-    V = cst / (1 - sum(coeffs_a) - sum(coeffs_sig))
-    print("The theoretical standard deviation for this GARCH(" + str(M) \
-          + "," + str(S) + ") model is: " + str(np.sqrt(V)))
+    if verbose:
+        V = cst / (1 - sum(coeffs_a) - sum(coeffs_sig))
+        print("The theoretical standard deviation for this GARCH(" + str(M) \
+              + "," + str(S) + ") model is: " + str(np.sqrt(V)))
     
     # Combine them into a time series
-    df = pd.DataFrame(index=data_index, data=a)
-    rs = TimeSeries(df, tz=tz, name=name)
-    
-    return rs
+    return paths_to_series(a.T, data_index, tz=tz, name=name, as_array=as_array)
 
 
-def charma(start_date, end_date, frequency, order, cov_matrix, sigma, tz=None, name=""):
+def charma(start_date, end_date, frequency, order, cov_matrix, sigma, tz=None, name="", n_paths=1, seed=None, as_array=False, verbose=False):
     """
     Function generating a volatility series from the
     Conditional Heterescedastic ARMA (CHARMA) model of order M.
@@ -821,11 +1151,20 @@ def charma(start_date, end_date, frequency, order, cov_matrix, sigma, tz=None, n
       Standard deviation of the Gaussian white noise.
     name : str
       Name or nickname of the series.
+    n_paths : int
+      Number of independent paths to generate.
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers, the global NumPy random state if None.
+    as_array : bool
+      Option to return the values as a numpy array instead of a TimeSeries.
+    verbose : bool
+      Option to print the theoretical moments of the process. Silent by default.
       
     Returns
     -------
-    TimeSeries
-      The time series resulting from the CHARMA process.
+    TimeSeries, DataFrame or numpy.ndarray
+      The time series resulting from the CHARMA process,
+      or a panel with one column per path if n_paths > 1.
     
     Raises
     ------
@@ -854,28 +1193,486 @@ def charma(start_date, end_date, frequency, order, cov_matrix, sigma, tz=None, n
     M = order
     
     # Generate index
-    data_index = pd.date_range(start=start_date, end=end_date, freq=frequency)
+    data_index = date_index(start_date, end_date, frequency)
     T = len(data_index)
     
+    # Random numbers generator
+    rng = get_generator(seed)
+    
     # Generate the "unit" white noise
-    eta = np.random.normal(loc=0., scale=sigma, size=T)
+    eta = rng.normal(loc=0., scale=sigma, size=(n_paths,T))
+    
+    # Generate all the coefficients from a single factorization
+    L = covariance_factor(cov_matrix)
+    coeffs = rng.normal(loc=0., scale=1., size=(n_paths,T,M)) @ L.T
     
     # Generate the random series
-    a = [0.] * T
-    for t in range(T):
-        a[t] = eta[t]
-        # Generate the list of coefficients
-        coeffs = np.random.multivariate_normal(mean=[0.] * M, cov=cov_matrix, size=1)[0]
-        for m in range(M):
-            if t-m > 0:
-                a[t] += coeffs[m] * a[t-m-1]
+    a = random_coefficient_filter(eta, np.zeros(M), coeffs)
+    
+    # Compute theoretical values
+    if verbose:
+        print("The expected value for this CHARMA(" + str(M) \
+              + ") model is 0, and the estimated value is : " + str(np.mean(a)) + "\n")
     
     # Combine them into a time series
-    df = pd.DataFrame(index=data_index, data=a)
-    rs = TimeSeries(df, tz=tz, name=name)
+    return paths_to_series(a, data_index, tz=tz, name=name, as_array=as_array)
+
+
+
+### CONTINUOUS-TIME MODELS ###
+
+# These models are simulated with exact or quasi-exact schemes over the dates of the index,
+# with time steps measured in years, so that parameters are annualized.
+# Paths are generated by chunks of chunk_size paths, which bounds the memory of intermediate
+# arrays (e.g. random draws) only: the output of shape (T, n_paths) is always allocated.
+# To summarize many paths in a memory independent of their number,
+# feed them chunk by chunk to aggregators with montecarlo.aggregate_series().
+
+def year_fractions(data_index):
+    """
+    Returns the time steps between consecutive dates of an index, in years.
+    """
     
-    return rs
+    t = index_to_int64(data_index)
+    
+    return np.diff(t) / NSPY
+
 
+def ornstein_uhlenbeck(start_date, end_date, frequency, start_value, theta, mu, sigma,
+                       tz=None, name="", n_paths=1, seed=None, as_array=False, chunk_size=10000):
+    """
+    Generates a time series from the Ornstein-Uhlenbeck process
+    dx_t = theta * (mu - x_t) * dt + sigma * dW_t,
+    with its exact discretization.
+    
+    Parameters
+    ----------
+    start_date : str or datetime
+      Starting date of the time series.
+    end_date : str or datetime
+      Ending date of the time series.
+    frequency : str or DateOffset
+      Indicates the frequency of data as an offset alias (e.g. 'D' for days, 'M' for months, etc.).
+    start_value : float
+      Initial value of the process.
+    theta : float
+      Speed of mean reversion (annualized, > 0).
+    mu : float
+      Long-term mean.
+    sigma : float
+      Volatility (annualized).
+    name : str
+      Name or nickname of the series.
+    n_paths : int
+      Number of independent paths to generate.
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers, the global NumPy random state if None.
+    as_array : bool
+      Option to return the values as a numpy array instead of a TimeSeries.
+    chunk_size : int
+      Number of paths generated at once, bounding the memory of intermediate
+      arrays (but not of the output).
+    
+    Returns
+    -------
+    TimeSeries, DataFrame or numpy.ndarray
+      The time series resulting from the Ornstein-Uhlenbeck process,
+      or a panel with one column per path if n_paths > 1.
+    
+    Notes
+    -----
+      The exact transition is Gaussian with mean mu + (x_t - mu) e^{-theta dt}
+      and variance sigma^2 (1 - e^{-2 theta dt}) / (2 theta), so there is
+      no discretization error whatever the time steps.
+    """
+    
+    # Checks
+    assert(theta > 0 and sigma >= 0)
+    
+    # Generate index and transition coefficients
+    data_index = date_index(start_date, end_date, frequency)
+    T = len(data_index)
+    decay = np.exp(-theta * year_fractions(data_index))
+    std = sigma * np.sqrt((1. - decay**2) / (2. * theta))
+    rng = get_generator(seed)
+    
+    # Generate the random series by chunks of paths
+    x = np.empty((T, n_paths))
+    x[0] = start_value
+    for first in range(0, n_paths, chunk_size):
+        chunk = slice(first, min(first + chunk_size, n_paths))
+        Z = rng.normal(loc=0., scale=1., size=(T-1, chunk.stop - chunk.start))
+        for t in range(1, T):
+            x[t,chunk] = mu + (x[t-1,chunk] - mu) * decay[t-1] + std[t-1] * Z[t-1]
+    
+    # Combine them into a time series
+    return paths_to_series(x.T, data_index, tz=tz, name=name, as_array=as_array)
+
+
+def heston(start_date, end_date, frequency, start_value, drift, v0, kappa, theta, xi, rho,
+           tz=None, name="", n_paths=1, seed=None, as_array=False, chunk_size=10000,
+           return_variance=False):
+    """
+    Generates a price series from the Heston stochastic volatility model
+    dS_t = drift * S_t * dt + sqrt(v_t) * S_t * dW_t,
+    dv_t = kappa * (theta - v_t) * dt + xi * sqrt(v_t) * dZ_t,
+    with correlation rho between W_t and Z_t,
+    using the Quadratic-Exponential (QE) scheme.
+    
+    Parameters
+    ----------
+    start_date : str or datetime
+      Starting date of the time series.
+    end_date : str or datetime
+      Ending date of the time series.
+    frequency : str or DateOffset
+      Indicates the frequency of data as an offset alias (e.g. 'D' for days, 'M' for months, etc.).
+    start_value : float
+      Initial price.
+    drift : float
+      Drift of the price (annualized).
+    v0 : float
+      Initial variance.
+    kappa : float
+      Speed of mean reversion of the variance (annualized, > 0).
+    theta : float
+      Long-term variance.
+    xi : float
+      Volatility of the variance (> 0).
+    rho : float
+      Correlation between the price and variance shocks.
+    name : str
+      Name or nickname of the series.
+    n_paths : int
+      Number of independent paths to generate.
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers, the global NumPy random state if None.
+    as_array : bool
+      Option to return the values as a numpy array instead of a TimeSeries.
+    chunk_size : int
+      Number of paths generated at once, bounding the memory of intermediate
+      arrays (but not of the output).
+    return_variance : bool
+      Option to also return the variance paths.
+    
+    Returns
+    -------
+    TimeSeries, DataFrame or numpy.ndarray (or a list of 2 of them)
+      The prices resulting from the Heston process, or a panel with one column
+      per path if n_paths > 1, followed by the variances if return_variance is True.
+    
+    Notes
+    -----
+      The variance is drawn from the QE scheme of L. Andersen (2008),
+      which matches the first two moments of the exact non-central chi-square
+      transition and keeps the variance non-negative. The log-price uses
+      the matching central discretization of the integrated variance.
+    """
+    
+    # Checks
+    assert(kappa > 0 and theta >= 0 and xi > 0 and v0 >= 0)
+    assert(-1. <= rho <= 1.)
+    
+    # Generate index and scheme coefficients
+    data_index = date_index(start_date, end_date, frequency)
+    T = len(data_index)
+    dt = year_fractions(data_index)
+    ekdt = np.exp(-kappa * dt)
+    K0 = -rho * kappa * theta / xi * dt
+    K1 = 0.5 * dt * (kappa * rho / xi - 0.5) - rho / xi
+    K2 = 0.5 * dt * (kappa * rho / xi - 0.5) + rho / xi
+    K3 = 0.5 * dt * (1. - rho**2)
+    psi_c = 1.5
+    rng = get_generator(seed)
+    
+    # Generate the random series by chunks of paths
+    # (variances are only stored for all dates if they are returned)
+    logS = np.empty((T, n_paths))
+    logS[0] = np.log(start_value)
+    if return_variance:
+        v = np.empty((T, n_paths))
+        v[0] = v0
+    for first in range(0, n_paths, chunk_size):
+        chunk = slice(first, min(first + chunk_size, n_paths))
+        size = chunk.stop - chunk.start
+        v_next = np.full(size, float(v0))
+        for t in range(1, T):
+            
+            # Variance: moments of the exact transition
+            vt = v_next
+            m = theta + (vt - theta) * ekdt[t-1]
+            s2 = vt * xi**2 * ekdt[t-1] / kappa * (1. - ekdt[t-1]) \
+                 + theta * xi**2 / (2. * kappa) * (1. - ekdt[t-1])**2
+            psi = s2 / np.maximum(m**2, 1e-300)
+            
+            # Quadratic part (psi <= psi_c) and exponential part (psi > psi_c)
+            U = rng.uniform(size=size)
+            Zv = rng.normal(loc=0., scale=1., size=size)
+            quad = psi <= psi_c
+            with np.errstate(divide='ignore', invalid='ignore'):
+                b2 = np.where(quad, 2./psi - 1. + np.sqrt(2./psi) * np.sqrt(np.maximum(2./psi - 1., 0.)), 0.)
+                a = m / (1. + b2)
+                p = np.where(quad, 0., (psi - 1.) / (psi + 1.))
+                beta = (1. - p) / m
+                v_exp = np.where(U <= p, 0., np.log((1. - p) / np.maximum(1. - U, 1e-300)) / beta)
+            v_next = np.where(quad, a * (np.sqrt(b2) + Zv)**2, v_exp)
+            if return_variance:
+                v[t,chunk] = v_next
+            
+            # Log-price
+            Z = rng.normal(loc=0., scale=1., size=size)
+            logS[t,chunk] = logS[t-1,chunk] + drift * dt[t-1] + K0[t-1] + K1[t-1] * vt + K2[t-1] * v_next \
+                            + np.sqrt(np.maximum(K3[t-1] * (vt + v_next), 0.)) * Z
+    
+    # Combine them into time series
+    prices = paths_to_series(np.exp(logS, out=logS).T, data_index, tz=tz, name=name, as_array=as_array)
+    if return_variance:
+        return [prices, paths_to_series(v.T, data_index, tz=tz, name=name, as_array=as_array)]
+    
+    return prices
+
+
+def merton_jump_diffusion(start_date, end_date, frequency, start_value, drift, sigma,
+                          jump_rate, jump_mean, jump_std, tz=None, name="", n_paths=1,
+                          seed=None, as_array=False, chunk_size=10000):
+    """
+    Generates a price series from the Merton jump-diffusion model
+    dS_t / S_t = (drift - jump_rate * k) * dt + sigma * dW_t + (J - 1) * dN_t,
+    where N_t is a Poisson process of intensity jump_rate, log(J) is Gaussian
+    with mean jump_mean and standard deviation jump_std, and k = E[J - 1].
+    
+    Parameters
+    ----------
+    start_date : str or datetime
+      Starting date of the time series.
+    end_date : str or datetime
+      Ending date of the time series.
+    frequency : str or DateOffset
+      Indicates the frequency of data as an offset alias (e.g. 'D' for days, 'M' for months, etc.).
+    start_value : float
+      Initial price.
+    drift : float
+      Drift of the price (annualized).
+    sigma : float
+      Volatility of the diffusion (annualized).
+    jump_rate : float
+      Average number of jumps per year.
+    jump_mean : float
+      Mean of the logarithm of jump sizes.
+    jump_std : float
+      Standard deviation of the logarithm of jump sizes.
+    name : str
+      Name or nickname of the series.
+    n_paths : int
+      Number of independent paths to generate.
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers, the global NumPy random state if None.
+    as_array : bool
+      Option to return the values as a numpy array instead of a TimeSeries.
+    chunk_size : int
+      Number of paths generated at once, bounding the memory of intermediate
+      arrays (but not of the output).
+    
+    Returns
+    -------
+    TimeSeries, DataFrame or numpy.ndarray
+      The prices resulting from the Merton jump-diffusion process,
+      or a panel with one column per path if n_paths > 1.
+    
+    Notes
+    -----
+      The scheme is exact: over a step, the log-return is Gaussian given the
+      number of jumps n, with mean (drift - sigma^2/2 - jump_rate k) dt + n jump_mean
+      and variance sigma^2 dt + n jump_std^2. No loop over time is needed.
+    """
+    
+    # Checks
+    assert(sigma >= 0 and jump_rate >= 0 and jump_std >= 0)
+    
+    # Generate index
+    data_index = date_index(start_date, end_date, frequency)
+    T = len(data_index)
+    dt = year_fractions(data_index)[:,np.newaxis]
+    k = np.exp(jump_mean + 0.5 * jump_std**2) - 1.
+    rng = get_generator(seed)
+    
+    # Generate the random series by chunks of paths
+    logS = np.empty((T, n_paths))
+    logS[0] = np.log(start_value)
+    for first in range(0, n_paths, chunk_size):
+        chunk = slice(first, min(first + chunk_size, n_paths))
+        size = (T-1, chunk.stop - chunk.start)
+        n_jumps = rng.poisson(lam=jump_rate * dt, size=size)
+        Z = rng.normal(loc=0., scale=1., size=size)
+        log_returns = (drift - 0.5 * sigma**2 - jump_rate * k) * dt + n_jumps * jump_mean \
+                      + np.sqrt(sigma**2 * dt + n_jumps * jump_std**2) * Z
+        logS[1:,chunk] = logS[0,chunk] + np.cumsum(log_returns, axis=0)
     
+    # Combine them into a time series
+    return paths_to_series(np.exp(logS, out=logS).T, data_index, tz=tz, name=name, as_array=as_array)
+
+
+
+### LONG-MEMORY MODELS ###
+
+def fgn_autocovariances(hurst, n):
+    """
+    Returns the autocovariances of the unit fractional Gaussian noise at lags 0 to n.
+    """
+    
+    k = np.arange(n+1, dtype=float)
+    
+    return 0.5 * (np.abs(k+1)**(2*hurst) - 2*k**(2*hurst) + np.abs(k-1)**(2*hurst))
+
 
-#---------#---------#---------#---------#---------#---------#---------#---------#---------#
\ No newline at end of file
+def davies_harte(T, hurst, n_paths=1, seed=None):
+    """
+    Generates paths of the unit fractional Gaussian noise with the
+    Davies-Harte (circulant embedding) method.
+    
+    Parameters
+    ----------
+    T : int
+      Number of time steps.
+    hurst : float
+      Hurst exponent, between 0 and 1.
+    n_paths : int
+      Number of independent paths.
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers, the global NumPy random state if None.
+    
+    Returns
+    -------
+    numpy.ndarray
+      Noise of shape (n_paths, T).
+    
+    Notes
+    -----
+      The covariance matrix is embedded in a circulant matrix of size 2T,
+      diagonalized by the FFT, which costs O(T log T) per path instead of
+      O(T^3) for a Cholesky factorization. The real and imaginary parts of
+      each complex sample are two independent paths.
+    """
+    
+    # Checks
+    assert(0 < hurst < 1)
+    
+    # Eigenvalues of the circulant embedding
+    gamma = fgn_autocovariances(hurst, T)
+    row = np.concatenate([gamma, gamma[-2:0:-1]])
+    M = len(row)
+    eigenvalues = np.fft.fft(row).real
+    if np.any(eigenvalues < -1e-10 * eigenvalues.max()):
+        raise ValueError("Circulant embedding is not non-negative definite.")
+    scale = np.sqrt(np.maximum(eigenvalues, 0.) / M)
+    
+    # Two paths per complex sample
+    rng = get_generator(seed)
+    n_complex = (n_paths + 1) // 2
+    W = rng.normal(loc=0., scale=1., size=(n_complex, M)) \
+        + 1j * rng.normal(loc=0., scale=1., size=(n_complex, M))
+    Y = np.fft.fft(scale * W, axis=1)[:,:T]
+    
+    return np.concatenate([Y.real, Y.imag])[:n_paths]
+
+
+def fractional_gaussian_noise(start_date, end_date, frequency, hurst, sigma=1., tz=None, name="",
+                              n_paths=1, seed=None, as_array=False):
+    """
+    Generates a time series of fractional Gaussian noise, i.e. the increments
+    of a fractional Brownian motion, whose autocovariances are
+    gamma(k) = sigma^2/2 * (|k+1|^{2H} - 2|k|^{2H} + |k-1|^{2H}).
+    
+    Parameters
+    ----------
+    start_date : str or datetime
+      Starting date of the time series.
+    end_date : str or datetime
+      Ending date of the time series.
+    frequency : str or DateOffset
+      Indicates the frequency of data as an offset alias (e.g. 'D' for days, 'M' for months, etc.).
+    hurst : float
+      Hurst exponent H, between 0 and 1 (0.5 for a white noise).
+    sigma : float
+      Standard deviation of the noise.
+    name : str
+      Name or nickname of the series.
+    n_paths : int
+      Number of independent paths to generate.
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers, the global NumPy random state if None.
+    as_array : bool
+      Option to return the values as a numpy array instead of a TimeSeries.
+    
+    Returns
+    -------
+    TimeSeries, DataFrame or numpy.ndarray
+      The fractional Gaussian noise, or a panel with one column per path if n_paths > 1.
+    
+    Notes
+    -----
+      Values are generated with the Davies-Harte method (see davies_harte()).
+    """
+    
+    # Generate index
+    data_index = date_index(start_date, end_date, frequency)
+    T = len(data_index)
+    
+    # Generate the random series
+    x = sigma * davies_harte(T, hurst, n_paths=n_paths, seed=seed)
+    
+    # Combine them into a time series
+    return paths_to_series(x, data_index, tz=tz, name=name, as_array=as_array)
+
+
+def fractional_brownian_motion(start_date, end_date, frequency, start_value, hurst, sigma=1.,
+                               tz=None, name="", n_paths=1, seed=None, as_array=False):
+    """
+    Generates a time series from the fractional Brownian motion,
+    i.e. the cumulative sum of a fractional Gaussian noise.
+    
+    Parameters
+    ----------
+    start_date : str or datetime
+      Starting date of the time series.
+    end_date : str or datetime
+      Ending date of the time series.
+    frequency : str or DateOffset
+      Indicates the frequency of data as an offset alias (e.g. 'D' for days, 'M' for months, etc.).
+    start_value : float
+      Initial value of the process.
+    hurst : float
+      Hurst exponent H, between 0 and 1 (0.5 for a random walk).
+    sigma : float
+      Standard deviation of the increments.
+    name : str
+      Name or nickname of the series.
+    n_paths : int
+      Number of independent paths to generate.
+    seed : None, int, SeedSequence or Generator
+      Seed or generator of random numbers, the global NumPy random state if None.
+    as_array : bool
+      Option to return the values as a numpy array instead of a TimeSeries.
+    
+    Returns
+    -------
+    TimeSeries, DataFrame or numpy.ndarray
+      The fractional Brownian motion, or a panel with one column per path if n_paths > 1.
+    """
+    
+    # Generate index
+    data_index = date_index(start_date, end_date, frequency)
+    T = len(data_index)
+    
+    # Generate the random series (first increment is not used)
+    x = sigma * davies_harte(T, hurst, n_paths=n_paths, seed=seed)
+    x[:,0] = start_value
+    x = np.cumsum(x, axis=1)
+    
+    # Combine them into a time series
+    return paths_to_series(x, data_index, tz=tz, name=name, as_array=as_array)
+
+
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
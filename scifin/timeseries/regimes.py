@@ -0,0 +1,291 @@
+# Created on 2020/9/4
+
+# This module is for detecting regimes in time series with hidden Markov models.
+
+# Standard library imports
+# /
+
+# Third party imports
+import numpy as np
+import pandas as pd
+from scipy.special import logsumexp
+
+# Local application imports
+from .timeseries import TimeSeries, CatTimeSeries, build_panel
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+def log_gaussian_densities(X, means, variances):
+    """
+    Returns the log-densities of the observations for each Gaussian state.
+    
+    Parameters
+    ----------
+    X : numpy.ndarray
+      Observations of shape (N, T).
+    means : numpy.ndarray
+      Means of the states, of shape (N, K).
+    variances : numpy.ndarray
+      Variances of the states, of shape (N, K).
+    
+    Returns
+    -------
+    numpy.ndarray
+      Log-densities of shape (N, T, K).
+    """
+    
+    diff2 = (X[:,:,None] - means[:,None,:])**2
+    return -0.5 * (np.log(2*np.pi*variances)[:,None,:] + diff2 / variances[:,None,:])
+
+
+def forward_backward(log_b, log_pi, log_A):
+    """
+    Runs the forward-backward algorithm in log-space,
+    vectorized across states and batched across series.
+    
+    Parameters
+    ----------
+    log_b : numpy.ndarray
+      Log-densities of the observations, of shape (N, T, K).
+    log_pi : numpy.ndarray
+      Log-probabilities of the initial states, of shape (N, K).
+    log_A : numpy.ndarray
+      Log-probabilities of transition, of shape (N, K, K),
+      where log_A[n,i,j] is the log-probability to go from state i to state j.
+    
+    Returns
+    -------
+    numpy.ndarray, numpy.ndarray, numpy.ndarray
+      Forward log-probabilities (N, T, K), backward log-probabilities (N, T, K)
+      and log-likelihood of each series (N,).
+    """
+    
+    # Initializations
+    N, T, K = log_b.shape
+    log_alpha = np.empty((N,T,K))
+    log_beta = np.empty((N,T,K))
+    A = np.exp(log_A)
+    
+    # Forward pass
+    # The log-sum-exp over previous states is done by shifting with the maximum,
+    # so that the sum itself is a batched (N,1,K) x (N,K,K) matrix product.
+    log_alpha[:,0] = log_pi + log_b[:,0]
+    for t in range(1,T):
+        m = log_alpha[:,t-1].max(axis=1, keepdims=True)
+        s = np.matmul(np.exp(log_alpha[:,t-1] - m)[:,None,:], A)[:,0]
+        log_alpha[:,t] = np.log(s) + m + log_b[:,t]
+    
+    # Backward pass
+    log_beta[:,T-1] = 0.
+    for t in range(T-2,-1,-1):
+        v = log_b[:,t+1] + log_beta[:,t+1]
+        m = v.max(axis=1, keepdims=True)
+        s = np.matmul(A, np.exp(v - m)[:,:,None])[:,:,0]
+        log_beta[:,t] = np.log(s) + m
+    
+    # Log-likelihood
+    loglik = logsumexp(log_alpha[:,T-1], axis=1)
+    
+    return log_alpha, log_beta, loglik
+
+
+def viterbi(log_b, log_pi, log_A):
+    """
+    Returns the most likely sequences of states (Viterbi paths),
+    vectorized across states and batched across series.
+    
+    Parameters
+    ----------
+    log_b : numpy.ndarray
+      Log-densities of the observations, of shape (N, T, K).
+    log_pi : numpy.ndarray
+      Log-probabilities of the initial states, of shape (N, K).
+    log_A : numpy.ndarray
+      Log-probabilities of transition, of shape (N, K, K).
+    
+    Returns
+    -------
+    numpy.ndarray
+      States of shape (N, T).
+    """
+    
+    # Initializations
+    N, T, K = log_b.shape
+    psi = np.empty((N,T,K), dtype=np.intp)
+    rows = np.arange(N)
+    
+    # Forward pass keeping the best predecessors
+    delta = log_pi + log_b[:,0]
+    for t in range(1,T):
+        scores = delta[:,:,None] + log_A
+        psi[:,t] = np.argmax(scores, axis=1)
+        delta = scores[rows[:,None], psi[:,t], np.arange(K)[None,:]] + log_b[:,t]
+    
+    # Backtracking
+    states = np.empty((N,T), dtype=np.intp)
+    states[:,T-1] = np.argmax(delta, axis=1)
+    for t in range(T-2,-1,-1):
+        states[:,t] = psi[rows, t+1, states[:,t+1]]
+    
+    return states
+
+
+def fit_gaussian_hmm(X, n_states=2, n_iter=100, tol=1e-6, min_var=1e-12):
+    """
+    Fits Gaussian hidden Markov models to several series at once
+    with the Baum-Welch (expectation-maximization) algorithm.
+    
+    Parameters
+    ----------
+    X : numpy.ndarray
+      Observations of shape (N, T), one row per series.
+    n_states : int
+      Number of hidden states (regimes).
+    n_iter : int
+      Maximum number of iterations.
+    tol : float
+      Convergence threshold on the log-likelihood of each series.
+    min_var : float
+      Lower bound on the variances of the states.
+    
+    Returns
+    -------
+    dict
+      Parameters 'means' (N, K), 'variances' (N, K), 'startprob' (N, K),
+      'transmat' (N, K, K), log-likelihood 'loglik' (N,) and number of iterations 'n_iter'.
+    
+    Notes
+    -----
+      States are initialized from the quantiles of each series
+      and are finally sorted by increasing mean.
+      Series which have converged are left unchanged in later iterations.
+    """
+    
+    # Checks
+    assert(isinstance(n_states, int) and n_states>1)
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+    N, T = X.shape
+    K = n_states
+    assert(T > K)
+    
+    # Initializations
+    qs = (np.arange(K) + 0.5) / K
+    means = np.quantile(X, qs, axis=1).T
+    variances = np.repeat(X.var(axis=1)[:,None] / K, K, axis=1) + min_var
+    startprob = np.full((N,K), 1./K)
+    transmat = np.full((N,K,K), 0.1/(K-1))
+    transmat[:, np.arange(K), np.arange(K)] = 0.9
+    loglik = np.full(N, -np.inf)
+    active = np.ones(N, dtype=bool)
+    
+    # Expectation-maximization loop
+    for it in range(n_iter):
+        
+        # Expectation step on active series
+        Xa = X[active]
+        log_b = log_gaussian_densities(Xa, means[active], variances[active])
+        log_A = np.log(transmat[active])
+        log_alpha, log_beta, new_loglik = forward_backward(log_b, np.log(startprob[active]), log_A)
+        gamma = np.exp(log_alpha + log_beta - new_loglik[:,None,None])
+        
+        # Expected transitions, normalized at each date without (N,T,K,K) arrays
+        a_hat = np.exp(log_alpha[:,:-1] - log_alpha[:,:-1].max(axis=2, keepdims=True))
+        e = log_b[:,1:] + log_beta[:,1:]
+        e_hat = np.exp(e - e.max(axis=2, keepdims=True))
+        A = np.exp(log_A)
+        norm = np.einsum('nti,nij,ntj->nt', a_hat, A, e_hat)
+        xi_sum = A * np.einsum('nti,ntj->nij', a_hat / norm[:,:,None], e_hat)
+        
+        # Maximization step
+        weights = gamma.sum(axis=1)
+        new_means = np.einsum('ntk,nt->nk', gamma, Xa) / weights
+        new_vars = np.einsum('ntk,ntk->nk', gamma, (Xa[:,:,None] - new_means[:,None,:])**2) / weights
+        
+        idx = np.flatnonzero(active)
+        means[idx] = new_means
+        variances[idx] = np.maximum(new_vars, min_var)
+        startprob[idx] = gamma[:,0]
+        transmat[idx] = xi_sum / xi_sum.sum(axis=2, keepdims=True)
+        
+        # Convergence
+        converged = np.abs(new_loglik - loglik[idx]) < tol
+        loglik[idx] = new_loglik
+        active[idx[converged]] = False
+        if not active.any():
+            break
+    
+    # Sort states by increasing mean
+    order = np.argsort(means, axis=1)
+    rows = np.arange(N)[:,None]
+    means = means[rows, order]
+    variances = variances[rows, order]
+    startprob = startprob[rows, order]
+    transmat = transmat[rows[:,:,None], order[:,:,None], order[:,None,:]]
+    
+    return {'means': means, 'variances': variances, 'startprob': startprob,
+            'transmat': transmat, 'loglik': loglik, 'n_iter': it+1}
+
+
+def hmm_regimes(Series, n_states=2, n_iter=100, tol=1e-6, name=""):
+    """
+    Detects the regimes of a time series, or of all series of a panel,
+    with a Gaussian hidden Markov model.
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Time series (e.g. of returns) or panel to label.
+    n_states : int
+      Number of regimes.
+    n_iter : int
+      Maximum number of Baum-Welch iterations.
+    tol : float
+      Convergence threshold on the log-likelihood.
+    name : str
+      Name or nickname of the categorical time series.
+    
+    Returns
+    -------
+    For a TimeSeries:
+      CatTimeSeries, DataFrame, dict
+        Regimes from the Viterbi path (labelled 'Regime 0', 'Regime 1', ...
+        by increasing mean), smoothed state probabilities, fitted parameters.
+    For a panel:
+      DataFrame, numpy.ndarray, dict
+        Regime numbers (T, N), smoothed state probabilities (N, T, K),
+        fitted parameters.
+    """
+    
+    # Fit the models
+    panel = build_panel(Series)
+    X = panel.values.T
+    params = fit_gaussian_hmm(X, n_states=n_states, n_iter=n_iter, tol=tol)
+    
+    # State probabilities and Viterbi paths
+    log_b = log_gaussian_densities(X, params['means'], params['variances'])
+    log_pi = np.log(params['startprob'])
+    log_A = np.log(params['transmat'])
+    log_alpha, log_beta, loglik = forward_backward(log_b, log_pi, log_A)
+    probas = np.exp(log_alpha + log_beta - loglik[:,None,None])
+    states = viterbi(log_b, log_pi, log_A)
+    
+    # Return results for a single time series
+    if isinstance(Series, TimeSeries):
+        labels = np.array(["Regime " + str(k) for k in range(n_states)])[states[0]]
+        cat_df = pd.DataFrame(index=panel.index, data=labels)
+        cts = CatTimeSeries(cat_df, tz=Series.tz, name=name)
+        probas_df = pd.DataFrame(index=panel.index, data=probas[0],
+                                 columns=["Regime " + str(k) for k in range(n_states)])
+        return cts, probas_df, params
+    
+    # Return results for a panel
+    states_df = pd.DataFrame(index=panel.index, data=states.T, columns=panel.columns)
+    
+    return states_df, probas, params
+
+
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
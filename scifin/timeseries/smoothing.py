@@ -0,0 +1,337 @@
+# Created on 2020/9/11
+
+# This module is for exponential smoothing (Holt-Winters) forecasts of time series.
+
+# Standard library imports
+# /
+
+# Third party imports
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+import scipy.stats as stats
+
+# Local application imports
+from .timeseries import TimeSeries, build_panel
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+def initial_states(Y, period=None, trend=None, seasonal=None):
+    """
+    Returns the initial level, trend and seasonal states of several series.
+    
+    Parameters
+    ----------
+    Y : numpy.ndarray
+      Observations of shape (N, T).
+    period : int or None
+      Period of seasonality.
+    trend : None or 'add'
+      Type of trend.
+    seasonal : None, 'add' or 'mul'
+      Type of seasonality.
+    
+    Returns
+    -------
+    numpy.ndarray, numpy.ndarray, numpy.ndarray
+      Levels (N,), trends (N,) and seasonal factors (N, period).
+    """
+    
+    N = Y.shape[0]
+    
+    if seasonal is None:
+        level = Y[:,0].copy()
+        slope = Y[:,1] - Y[:,0] if trend is not None else np.zeros(N)
+        season = np.zeros((N,1))
+    else:
+        m = period
+        level = Y[:,:m].mean(axis=1)
+        if trend is not None:
+            slope = (Y[:,m:2*m].mean(axis=1) - level) / m
+        else:
+            slope = np.zeros(N)
+        if seasonal == 'add':
+            season = Y[:,:m] - level[:,None]
+        else:
+            season = Y[:,:m] / level[:,None]
+    
+    return level, slope, season
+
+
+def holt_winters_recursion(Y, alpha, beta=0., gamma=0., phi=1., period=None,
+                           trend=None, seasonal=None, store=True):
+    """
+    Runs the Holt-Winters recursions on several series at once.
+    
+    Parameters
+    ----------
+    Y : numpy.ndarray
+      Observations of shape (N, T).
+    alpha, beta, gamma : float or numpy.ndarray
+      Smoothing parameters of level, trend and seasonality, for each series (N,).
+    phi : float or numpy.ndarray
+      Damping parameter of the trend (1 means no damping).
+    period : int or None
+      Period of seasonality.
+    trend : None or 'add'
+      Type of trend.
+    seasonal : None, 'add' or 'mul'
+      Type of seasonality.
+    store : bool
+      Option to store the one-step-ahead fitted values.
+    
+    Returns
+    -------
+    dict
+      Sum of squared one-step errors 'sse' (N,), final states 'level' (N,),
+      'trend' (N,) and 'season' (N, period), and fitted values 'fitted' (N, T)
+      when store=True.
+    
+    Notes
+    -----
+      The time recursion is unavoidable, but every step is vectorized
+      across series, so that N series cost about as much as one.
+      Seasonal factors are updated from the new level (Winters' form),
+      i.e. gamma corresponds to gamma / (1 - alpha) in the error-correction
+      form used by statsmodels' ExponentialSmoothing.
+    """
+    
+    # Initializations
+    Y = np.atleast_2d(Y)
+    N, T = Y.shape
+    level, slope, season = initial_states(Y, period, trend, seasonal)
+    season = season.copy()
+    m = season.shape[1]
+    rows = np.arange(N)
+    phi = phi if trend is not None else 0.
+    sse = np.zeros(N)
+    fitted = np.empty((N,T)) if store else None
+    
+    # Recursions
+    for t in range(T):
+        y = Y[:,t]
+        s = season[:,t%m]
+        base = level + phi * slope
+        if seasonal == 'mul':
+            yhat = base * s
+            new_level = alpha * y / s + (1-alpha) * base
+            season[:,t%m] = gamma * y / new_level + (1-gamma) * s
+        else:
+            yhat = base + s
+            new_level = alpha * (y - s) + (1-alpha) * base
+            if seasonal == 'add':
+                season[:,t%m] = gamma * (y - new_level) + (1-gamma) * s
+        if trend is not None:
+            slope = beta * (new_level - level) + (1-beta) * phi * slope
+        level = new_level
+        sse += (y - yhat)**2
+        if store:
+            fitted[:,t] = yhat
+    
+    return {'sse': sse, 'level': level, 'trend': slope, 'season': season,
+            'fitted': fitted, 'T': T}
+
+
+def fit_holt_winters(Y, period=None, trend=None, damped=False, seasonal=None, maxiter=100,
+                     chunk_size=10000):
+    """
+    Fits the smoothing parameters of Holt-Winters models
+    to several series at once by minimizing the one-step squared errors.
+    
+    Parameters
+    ----------
+    Y : numpy.ndarray
+      Observations of shape (N, T).
+    period : int or None
+      Period of seasonality.
+    trend : None or 'add'
+      Type of trend.
+    damped : bool
+      Option to damp the trend.
+    seasonal : None, 'add' or 'mul'
+      Type of seasonality.
+    maxiter : int
+      Maximum number of iterations of the optimizer.
+    chunk_size : int
+      Maximum number of (series, grid point) pairs run at once in the grid search.
+    
+    Returns
+    -------
+    numpy.ndarray
+      Parameters (alpha, beta, gamma, phi) of shape (N, 4).
+    
+    Notes
+    -----
+      A single objective, returning the squared errors of all series,
+      is built once and reused: first on a coarse grid of parameters
+      (grid points of all series in vectorized runs of up to chunk_size rows,
+      so that memory stays bounded by max(N, chunk_size) copies of a series),
+      then by L-BFGS-B.
+      Since the errors of different series are independent, the gradient
+      with respect to one parameter of all series comes from one batched run.
+    """
+    
+    # Checks
+    if trend not in [None, 'add']:
+        raise ValueError("trend must be None or 'add'.")
+    if seasonal not in [None, 'add', 'mul']:
+        raise ValueError("seasonal must be None, 'add' or 'mul'.")
+    if seasonal is not None:
+        assert(isinstance(period, int) and period>1)
+    assert(isinstance(chunk_size, int) and chunk_size>0)
+    
+    # Initializations
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    N = Y.shape[0]
+    free = [True, trend is not None, seasonal is not None, damped and (trend is not None)]
+    p = sum(free)
+    lower = np.array([1e-4, 1e-4, 1e-4, 0.8])[free]
+    upper = np.array([1-1e-4, 1-1e-4, 1-1e-4, 0.999])[free]
+    defaults = np.array([0., 0., 0., 1.])
+    
+    # Single objective: squared errors of each series for parameters (M, p)
+    def sse(theta, Ytiled):
+        full = np.tile(defaults, (theta.shape[0],1))
+        full[:,free] = theta
+        return holt_winters_recursion(Ytiled, full[:,0], full[:,1], full[:,2], full[:,3],
+                                      period=period, trend=trend, seasonal=seasonal,
+                                      store=False)['sse']
+    
+    # Coarse grid search
+    axes = [np.array([0.1, 0.4, 0.8]) if k < 3 else np.array([0.9, 0.98])
+            for k in range(4) if free[k]]
+    grid = np.array(np.meshgrid(*axes, indexing='ij')).reshape(p,-1).T
+    G = grid.shape[0]
+    grid_sse = np.empty((N,G))
+    step = max(1, chunk_size // N)
+    for g in range(0, G, step):
+        block = grid[g:g+step]
+        k = block.shape[0]
+        Yk = Y if k == 1 else np.repeat(Y, k, axis=0)
+        grid_sse[:,g:g+k] = sse(np.tile(block, (N,1)), Yk).reshape(N,k)
+    grid_sse = np.where(np.isfinite(grid_sse), grid_sse, np.inf)
+    x0 = grid[np.argmin(grid_sse, axis=1)]
+    
+    # Refinement with batched finite-difference gradients
+    h = 1e-6
+    def objective(x):
+        theta = x.reshape(N,p)
+        f0 = sse(theta, Y)
+        grad = np.empty((N,p))
+        for j in range(p):
+            shifted = theta.copy()
+            shifted[:,j] += h
+            grad[:,j] = (sse(shifted, Y) - f0) / h
+        return f0.sum(), grad.ravel()
+    
+    res = minimize(objective, x0.ravel(), jac=True, method='L-BFGS-B',
+                   bounds=list(zip(np.tile(lower,N), np.tile(upper,N))),
+                   options={'maxiter': maxiter})
+    
+    # Keep the grid point when the refinement did not improve it
+    theta = res.x.reshape(N,p)
+    worse = ~(sse(theta, Y) <= sse(x0, Y))
+    theta[worse] = x0[worse]
+    params = np.tile(defaults, (N,1))
+    params[:,free] = theta
+    
+    return params
+
+
+def holt_winters_forecast(Series, horizon, trend=None, damped=False, seasonal=None,
+                          period=None, params=None, level=0.95):
+    """
+    Forecasts a time series, or all series of a panel, with the Holt-Winters
+    exponential smoothing method, and returns prediction intervals.
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Time series or panel to forecast.
+    horizon : int
+      Number of dates to forecast.
+    trend : None or 'add'
+      Type of trend.
+    damped : bool
+      Option to damp the trend.
+    seasonal : None, 'add' or 'mul'
+      Type of seasonality.
+    period : int or None
+      Period of seasonality.
+    params : numpy.ndarray or None
+      Parameters (alpha, beta, gamma, phi) of shape (4,) or (N, 4). If None, they are fitted.
+    level : float
+      Confidence level of the prediction intervals.
+    
+    Returns
+    -------
+    For a TimeSeries:
+      List of 3 TimeSeries
+        Forecast, lower and upper bounds of the prediction interval.
+    For a panel:
+      List of 3 DataFrames
+        Forecasts, lower and upper bounds of the prediction intervals.
+    
+    Notes
+    -----
+      Intervals use the variance of the additive error models:
+      sigma^2 (1 + Sum_{j=1}^{h-1} c_j^2) with
+      c_j = alpha (1 + beta (phi + ... + phi^j)) + gamma (1 - alpha) 1{j mod period = 0},
+      which is only an approximation for multiplicative seasonality.
+      See R. J. Hyndman et al., Forecasting with Exponential Smoothing (2008).
+    """
+    
+    # Checks
+    assert(isinstance(horizon, int) and horizon>0)
+    assert(0 < level < 1)
+    
+    # Fit parameters and run the recursions
+    panel = build_panel(Series)
+    Y = panel.values.T
+    N, T = Y.shape
+    if params is None:
+        params = fit_holt_winters(Y, period=period, trend=trend, damped=damped, seasonal=seasonal)
+    params = np.broadcast_to(np.asarray(params, dtype=float), (N,4))
+    alpha, beta, gamma, phi = params.T
+    phi = phi if trend is not None else np.zeros(N)
+    res = holt_winters_recursion(Y, alpha, beta, gamma, phi, period=period,
+                                 trend=trend, seasonal=seasonal, store=False)
+    sigma2 = res['sse'] / T
+    
+    # Point forecasts
+    h = np.arange(1, horizon+1)
+    damp_sum = np.cumsum(phi[:,None] ** h[None,:], axis=1)
+    base = res['level'][:,None] + damp_sum * res['trend'][:,None]
+    m = res['season'].shape[1]
+    s = res['season'][:, (T + h - 1) % m]
+    forecast = base * s if seasonal == 'mul' else base + s
+    
+    # Prediction intervals
+    j = np.arange(1, horizon)
+    c = alpha[:,None] * (1 + (beta[:,None] if trend is not None else 0.) * damp_sum[:,:horizon-1])
+    if seasonal is not None:
+        c = c + gamma[:,None] * (1-alpha[:,None]) * (j % m == 0)[None,:]
+    var_h = sigma2[:,None] * np.concatenate([np.ones((N,1)), 1 + np.cumsum(c**2, axis=1)], axis=1)
+    z = stats.norm.ppf(0.5 + level/2)
+    lower = forecast - z * np.sqrt(var_h)
+    upper = forecast + z * np.sqrt(var_h)
+    
+    # Index of the forecasts
+    freq = panel.index.freq or pd.infer_freq(panel.index) or (panel.index[-1] - panel.index[-2])
+    new_index = pd.date_range(start=panel.index[-1], periods=horizon+1, freq=freq)[1:]
+    dfs = [pd.DataFrame(index=new_index, data=x.T, columns=panel.columns)
+           for x in [forecast, lower, upper]]
+    
+    # Return TimeSeries for a TimeSeries
+    if isinstance(Series, TimeSeries):
+        names = ['Forecast', 'Forecast lower bound', 'Forecast upper bound']
+        return [TimeSeries(df, tz=Series.tz, unit=Series.unit, name=n) for df,n in zip(dfs,names)]
+    
+    return dfs
+
+
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
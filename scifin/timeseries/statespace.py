@@ -0,0 +1,266 @@
+# Created on 2020/9/9
+
+# This module is for state-space models (Kalman filter and smoother) of time series.
+
+# Standard library imports
+# /
+
+# Third party imports
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+
+# Local application imports
+from .timeseries import TimeSeries, build_panel
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+def state_space_matrices(model='level'):
+    """
+    Returns the transition matrix and the observation vector
+    of the local level or local linear trend model.
+    
+    Parameters
+    ----------
+    model : str
+      'level' for the local level model,
+      'trend' for the local linear trend model.
+    
+    Returns
+    -------
+    numpy.ndarray, numpy.ndarray
+      Transition matrix (m, m) and observation vector (m,).
+    """
+    
+    if model == 'level':
+        return np.array([[1.]]), np.array([1.])
+    elif model == 'trend':
+        return np.array([[1.,1.],[0.,1.]]), np.array([1.,0.])
+    else:
+        raise ValueError("model must be 'level' or 'trend'.")
+
+
+def kalman_filter(Y, obs_var, state_vars, model='level', smooth=True):
+    """
+    Runs the Kalman filter, and optionally the Rauch-Tung-Striebel smoother,
+    on several univariate series at once.
+    
+    The local level model is:
+    y_t = mu_t + eps_t,  mu_{t+1} = mu_t + eta_t,
+    and the local linear trend model adds a slope:
+    mu_{t+1} = mu_t + nu_t + eta_t,  nu_{t+1} = nu_t + zeta_t.
+    
+    Parameters
+    ----------
+    Y : numpy.ndarray
+      Observations of shape (N, T), NaN values being treated as missing.
+    obs_var : float or numpy.ndarray
+      Variance of the observation noise eps_t, for each series (N,).
+    state_vars : float, list or numpy.ndarray
+      Variances of the state noises (eta_t, and zeta_t for the trend model),
+      of shape (m,) or (N, m).
+    model : str
+      'level' or 'trend'.
+    smooth : bool
+      Option to run the smoother after the filter.
+    
+    Returns
+    -------
+    dict
+      Filtered states 'filtered' (N, T, m) and their variances 'filtered_var' (N, T, m, m),
+      smoothed states 'smoothed' and variances 'smoothed_var' (when smooth=True),
+      and log-likelihood 'loglik' (N,).
+    
+    Notes
+    -----
+      The recursions loop over time only, all the operations
+      are vectorized across the N series, so that the cost is O(N T m^3).
+      The initial state is diffuse (large variance) and the first m
+      observations are left out of the log-likelihood.
+      See J. Durbin and S. J. Koopman, Time Series Analysis by State Space Methods (2012).
+    """
+    
+    # Initializations
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    N, T = Y.shape
+    Tm, Z = state_space_matrices(model)
+    m = len(Z)
+    H = np.broadcast_to(np.asarray(obs_var, dtype=float), (N,))
+    Q = np.zeros((N,m,m))
+    Q[:, np.arange(m), np.arange(m)] = np.broadcast_to(np.asarray(state_vars, dtype=float), (N,m))
+    
+    # Diffuse initial state around the first available observation
+    first = np.where(np.isnan(Y), np.nan, Y)
+    first = first[np.arange(N), np.argmax(~np.isnan(Y), axis=1)]
+    a = np.zeros((N,m))
+    a[:,0] = np.nan_to_num(first)
+    scale = np.nanvar(Y, axis=1) + 1.
+    P = np.eye(m)[None,:,:] * (1e6 * scale)[:,None,None]
+    
+    # Storage
+    a_pred = np.empty((N,T,m))
+    P_pred = np.empty((N,T,m,m))
+    a_filt = np.empty((N,T,m))
+    P_filt = np.empty((N,T,m,m))
+    loglik = np.zeros(N)
+    n_obs = np.zeros(N, dtype=int)
+    
+    # Filter
+    for t in range(T):
+        a_pred[:,t] = a
+        P_pred[:,t] = P
+        
+        # Update with the observation (when available)
+        y = Y[:,t]
+        obs = ~np.isnan(y)
+        v = np.where(obs, y - a @ Z, 0.)
+        PZ = P @ Z
+        F = PZ @ Z + H
+        K = PZ / F[:,None]
+        a = a + K * v[:,None]
+        P = P - obs[:,None,None] * (K[:,:,None] * K[:,None,:] * F[:,None,None])
+        
+        # Log-likelihood, leaving out the diffuse part
+        use = obs & (n_obs >= m)
+        loglik -= 0.5 * use * (np.log(2*np.pi*F) + v**2 / F)
+        n_obs += obs
+        
+        a_filt[:,t] = a
+        P_filt[:,t] = P
+        
+        # Prediction
+        a = a @ Tm.T
+        P = Tm @ P @ Tm.T + Q
+    
+    results = {'filtered': a_filt, 'filtered_var': P_filt, 'loglik': loglik}
+    if smooth == False:
+        return results
+    
+    # Rauch-Tung-Striebel smoother
+    a_smooth = np.empty((N,T,m))
+    P_smooth = np.empty((N,T,m,m))
+    a_smooth[:,T-1] = a_filt[:,T-1]
+    P_smooth[:,T-1] = P_filt[:,T-1]
+    for t in range(T-2,-1,-1):
+        # J_t = P_filt[t] Tm' P_pred[t+1]^{-1}
+        J = np.linalg.solve(P_pred[:,t+1], Tm @ P_filt[:,t]).transpose(0,2,1)
+        a_smooth[:,t] = a_filt[:,t] + (J @ (a_smooth[:,t+1] - a_pred[:,t+1])[:,:,None])[:,:,0]
+        P_smooth[:,t] = P_filt[:,t] + J @ (P_smooth[:,t+1] - P_pred[:,t+1]) @ J.transpose(0,2,1)
+    
+    results['smoothed'] = a_smooth
+    results['smoothed_var'] = P_smooth
+    
+    return results
+
+
+def fit_state_space(Y, model='level', maxiter=200):
+    """
+    Fits the noise variances of local level or local linear trend models
+    to several series at once by maximum likelihood.
+    
+    Parameters
+    ----------
+    Y : numpy.ndarray
+      Observations of shape (N, T), NaN values being treated as missing.
+    model : str
+      'level' or 'trend'.
+    maxiter : int
+      Maximum number of iterations of the optimizer.
+    
+    Returns
+    -------
+    numpy.ndarray, numpy.ndarray, numpy.ndarray
+      Observation variances (N,), state variances (N, m) and log-likelihoods (N,).
+    
+    Notes
+    -----
+      Variances are optimized in log-space with L-BFGS-B. The log-likelihoods
+      of the series are independent, so the gradient with respect to one
+      parameter of all series is obtained from a single batched filter run:
+      a full gradient only costs m+2 runs of the filter, whatever N.
+    """
+    
+    # Initializations
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    N = Y.shape[0]
+    m = len(state_space_matrices(model)[1])
+    p = m + 1
+    var_diff = np.nanvar(np.diff(Y, axis=1), axis=1) + 1e-12
+    x0 = np.log(np.repeat(var_diff[:,None] / p, p, axis=1)).ravel()
+    h = 1e-5
+    
+    def neg_loglik(theta):
+        v = np.exp(theta.reshape(N,p))
+        return -kalman_filter(Y, v[:,0], v[:,1:], model=model, smooth=False)['loglik']
+    
+    def objective(x):
+        theta = x.reshape(N,p)
+        f0 = neg_loglik(theta)
+        grad = np.empty((N,p))
+        for j in range(p):
+            shifted = theta.copy()
+            shifted[:,j] += h
+            grad[:,j] = (neg_loglik(shifted) - f0) / h
+        return f0.sum(), grad.ravel()
+    
+    # Optimize
+    res = minimize(objective, x0, jac=True, method='L-BFGS-B',
+                   bounds=[(-30,30)] * (N*p), options={'maxiter': maxiter})
+    v = np.exp(res.x.reshape(N,p))
+    
+    return v[:,0], v[:,1:], -neg_loglik(res.x)
+
+
+def kalman_smoother(Series, model='level', obs_var=None, state_vars=None):
+    """
+    Extracts the trend of a time series, or of all series of a panel,
+    with a local level or local linear trend Kalman smoother.
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Time series or panel, possibly with missing (NaN) values.
+    model : str
+      'level' or 'trend'.
+    obs_var : float, numpy.ndarray or None
+      Variance of the observation noise. If None, variances are fitted.
+    state_vars : float, list, numpy.ndarray or None
+      Variances of the state noises. If None, variances are fitted.
+    
+    Returns
+    -------
+    For a TimeSeries:
+      TimeSeries, TimeSeries, float
+        Filtered and smoothed levels, and log-likelihood.
+    For a panel:
+      DataFrame, DataFrame, numpy.ndarray
+        Filtered and smoothed levels, and log-likelihoods.
+    """
+    
+    # Initializations
+    panel = build_panel(Series)
+    Y = panel.values.T
+    
+    # Fit variances when not given
+    if (obs_var is None) or (state_vars is None):
+        obs_var, state_vars, _ = fit_state_space(Y, model=model)
+    
+    # Filter and smooth
+    res = kalman_filter(Y, obs_var, state_vars, model=model, smooth=True)
+    filt_df = pd.DataFrame(index=panel.index, data=res['filtered'][:,:,0].T, columns=panel.columns)
+    smooth_df = pd.DataFrame(index=panel.index, data=res['smoothed'][:,:,0].T, columns=panel.columns)
+    
+    # Return TimeSeries for a TimeSeries
+    if isinstance(Series, TimeSeries):
+        filt_ts = TimeSeries(filt_df, tz=Series.tz, unit=Series.unit, name='Filtered level')
+        smooth_ts = TimeSeries(smooth_df, tz=Series.tz, unit=Series.unit, name='Smoothed level')
+        return filt_ts, smooth_ts, res['loglik'][0]
+    
+    return filt_df, smooth_df, res['loglik']
+
+
+
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
@@ -8,6 +8,7 @@ from datetime import datetime
 # Third party imports
 import matplotlib.pyplot as plt
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
 import pytz
 import scipy.stats as stats
@@ -20,7 +21,7 @@ from statsmodels.tsa.stattools import acf, pacf
 from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
 
 # Local application imports
-# /
+from .caching import cached_fit
 
 
 # Dictionary of Pandas' Offset Aliases
@@ -31,6 +32,9 @@ DPOA = {'D': 365, 'B': 252, 'W': 52,
         'BQ': 4, 'BQS': 4, 'Q': 4, 'QS': 4,
         'Y': 1, 'A':1}
 
+# Number of nanoseconds in a year (of 365.25 days)
+NSPY = 365.25 * 24 * 3600 * 1e9
+
 # Datetimes format
 fmt = "%Y-%m-%d %H:%M:%S"
 fmtz = "%Y-%m-%d %H:%M:%S %Z%z"
@@ -45,6 +49,14 @@ def get_list_timezones():
     """
     print(pytz.all_timezones)
     return None
+
+
+def index_to_int64(index):
+    """
+    Returns a DatetimeIndex as an array of int64 values,
+    i.e. the number of nanoseconds elapsed since the epoch (UTC).
+    """
+    return np.asarray(index.values.astype('datetime64[ns]').astype(np.int64))
         
 
 
@@ -179,16 +191,20 @@ class Series:
         Returns a boolean value True when the sampling is uniform, False otherwise.
         """
         # Prepare data
-        sampling = [datetime.timestamp(x) for x in self.data.index]
+        sampling = self.get_int64_index()
         assert(len(sampling)==self.nvalues)
-        intervals = [sampling[x] - sampling[x-1] for x in range(1,self.nvalues,1)]
+        intervals = np.diff(sampling)
 
-        # Testing
-        prev = intervals[0]
-        for i in range(1,len(intervals),1):
-            if intervals[i] - prev > 1.e-6:
-                return False
-        return True
+        # Testing (tolerance of 1 microsecond)
+        return bool(np.all(np.abs(intervals - intervals[0]) <= 1000))
+    
+    
+    def get_int64_index(self):
+        """
+        Returns the index of the series as an array of int64 values,
+        i.e. the number of nanoseconds elapsed since the epoch (UTC).
+        """
+        return index_to_int64(self.data.index)
     
 
     
@@ -417,9 +433,53 @@ class TimeSeries(Series):
         title = "Multiple lag plots of time series " + self.name
         fig.suptitle(title, )
         plt.show()
-        
+
         return None
-    
+
+
+    def lag_matrix(self, nlags, start=None, end=None):
+        """
+        Returns the lag (embedding) matrix of the time series values,
+        i.e. an array of shape (T-nlags+1, nlags) whose row t reads
+        (x_t, x_{t+1}, ..., x_{t+nlags-1}).
+
+        Parameters
+        ----------
+        nlags : int
+          Number of lags, i.e. width of the embedding window.
+        start : str or datetime
+          Starting date.
+        end : str or datetime
+          Ending date.
+
+        Returns
+        -------
+        numpy.ndarray
+          Read-only strided view on the time series values.
+
+        Notes
+        -----
+          No copy of the values is made, the matrix is a view
+          obtained from numpy.lib.stride_tricks.sliding_window_view.
+          The last column is the most recent value of each window,
+          the column j contains the values lagged by nlags-1-j.
+          Use np.ascontiguousarray() if a writable copy is needed.
+        """
+
+        # Checks
+        try:
+            assert(isinstance(nlags, int) and nlags>0)
+        except AssertionError:
+            raise AssertionError("nlags must be an integer equal or more than 1.")
+
+        # Prepare data
+        data = self.specify_data(start, end)
+        values = data.values[:,0]
+        if nlags > len(values):
+            raise ValueError("nlags cannot exceed the number of values.")
+
+        return sliding_window_view(values, window_shape=nlags)
+
     
     ### SIMPLE DATA EXTRACTION ON THE TIME SERIES ###
     
@@ -643,6 +703,123 @@ class TimeSeries(Series):
     
     
     
+    ### TIME-WEIGHTED METHODS FOR IRREGULARLY SAMPLED TIME SERIES ###
+    
+    def time_weights(self, start=None, end=None):
+        """
+        Returns the values of the time series between two dates
+        together with the time (in seconds) during which each value holds,
+        i.e. the interval until the next observation.
+        
+        Returns
+        -------
+        numpy.ndarray, numpy.ndarray
+          Values and their durations. The last value has a zero duration.
+        """
+        
+        # Prepare data
+        data = self.specify_data(start, end)
+        values = data.values[:,0]
+        idx = index_to_int64(data.index)
+        
+        # Durations in seconds
+        dt = np.zeros(len(idx))
+        dt[:-1] = np.diff(idx) / 1e9
+        
+        return values, dt
+    
+    
+    def time_weighted_avg(self, start=None, end=None):
+        """
+        Returns the time-weighted average of the time series
+        between two dates (default is the whole series).
+        
+        Notes
+        -----
+          Each value is weighted by the time elapsed until the next observation,
+          which is the natural average for irregularly sampled (e.g. tick) data.
+        """
+        
+        # Compute average
+        values, dt = self.time_weights(start, end)
+        
+        # Checks
+        if np.sum(dt) <= 0:
+            raise ValueError("At least two dates are needed between start and end.")
+        
+        return np.sum(values * dt) / np.sum(dt)
+    
+    
+    def time_weighted_variance(self, start=None, end=None):
+        """
+        Returns the time-weighted variance of the time series
+        between two dates (default is the whole series).
+        
+        Notes
+        -----
+          Each value is weighted by the time elapsed until the next observation.
+        """
+        
+        # Compute variance
+        values, dt = self.time_weights(start, end)
+        
+        # Checks
+        if np.sum(dt) <= 0:
+            raise ValueError("At least two dates are needed between start and end.")
+        avg = np.sum(values * dt) / np.sum(dt)
+        
+        return np.sum(dt * (values - avg)**2) / np.sum(dt)
+    
+    
+    def time_weighted_std(self, start=None, end=None):
+        """
+        Returns the time-weighted standard deviation of the time series
+        between two dates (default is the whole series).
+        """
+        return np.sqrt(self.time_weighted_variance(start, end))
+    
+    
+    def realized_vol(self, start=None, end=None):
+        """
+        Returns the realized volatility of the time series between two dates,
+        i.e. the square root of the sum of squared log-returns.
+        
+        Notes
+        -----
+          The realized volatility does not require a uniform sampling
+          and is the volatility accumulated over the whole period.
+        """
+        
+        # Prepare data
+        data = self.specify_data(start, end)
+        log_returns = np.diff(np.log(data.values[:,0]))
+        
+        return np.sqrt(np.sum(log_returns**2))
+    
+    
+    def annualized_realized_vol(self, start=None, end=None):
+        """
+        Returns the annualized realized volatility of the time series
+        between two dates (default is the whole series).
+        
+        The annualization is based on the time elapsed between the first
+        and last observations, not on the frequency of the time series,
+        so that irregularly sampled series can be used directly.
+        """
+        
+        # Prepare data
+        data = self.specify_data(start, end)
+        idx = index_to_int64(data.index)
+        elapsed_years = (idx[-1] - idx[0]) / NSPY
+        
+        # Checks
+        if elapsed_years <= 0:
+            raise ValueError('Annualized realized volatility could not be evaluated.')
+        
+        return self.realized_vol(start, end) / np.sqrt(elapsed_years)
+    
+    
+    
     ### METHODS RELATED TO VALUE AT RISK ###
     
     def hist_var(self, p, start=None, end=None):
@@ -1014,14 +1191,23 @@ class TimeSeries(Series):
     def rolling_avg(self, pts=1):
         """
         Transforms the time series into a rolling window average time series.
-        """
-        new_values = [self.data[x-pts+1:x].mean() for x in range(pts-1, self.nvalues, 1)]
+        The windows containing NaN values give NaN values.
+        """
+        # Windows of pts values ending at each date, from cumulative sums
+        # of the values and of the number of NaN values
+        values = self.data.values.flatten().astype(float)
+        missing = np.isnan(values)
+        cumsum = np.cumsum(np.concatenate([[0.], np.where(missing, 0., values)]))
+        n_missing = np.cumsum(np.concatenate([[0], missing]))
+        new_values = (cumsum[pts:] - cumsum[:-pts]) / pts
+        new_values[(n_missing[pts:] - n_missing[:-pts]) > 0] = np.nan
         new_df = pd.DataFrame(index=self.data.index[pts-1:self.nvalues], data=new_values)
         new_ts = TimeSeries(new_df, tz=self.tz)
         
         return new_ts
     
     
+    @cached_fit
     def polyfit(self, order=1, start=None, end=None):
         """
         Provides a polynomial fit of the time series.
@@ -1104,6 +1290,7 @@ class TimeSeries(Series):
         return new_ts
         
     
+    @cached_fit
     def decompose(self, polyn_order=None, start=None, end=None, 
                   extract_seasonality=False, period=None):
         """
@@ -1224,6 +1411,7 @@ class TimeSeries(Series):
 
     
 
+    @cached_fit
     def gaussian_process(self, rbf_scale, rbf_scale_bounds, noise, noise_bounds,
                          alpha=1e-10, plotting=False, figsize=(12,5), dpi=100):
         """
@@ -1705,8 +1893,167 @@ def multi_plot_distrib(Series, bins=20, figsize=(10,4), dpi=100):
     plt.gca().set(title=title2, xlabel="Value", ylabel="Hits")
 
     return None
+
+
+
+### FUNCTIONS BUILDING AND USING PANELS OF TIMESERIES ###
+
+
+def build_panel(Series):
+    """
+    Returns a panel, i.e. a DataFrame with a shared time index
+    and one column per time series.
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Time series sharing the same index. A DataFrame is returned as it is.
     
+    Returns
+    -------
+    DataFrame
+      Panel of shape (T, N) whose columns are named after the time series.
+    
+    Raises
+    ------
+      IndexError: when the time series do not share the same index.
+    """
+    
+    # Trivial cases
+    if isinstance(Series, pd.DataFrame):
+        return Series
+    if isinstance(Series, TimeSeries):
+        Series = [Series]
+    
+    # Checks
+    assert(len(Series)>0)
+    for s in Series:
+        assert(s.type=='TimeSeries')
+    shared_index = Series[0].data.index
+    for s in Series[1:]:
+        if not s.data.index.equals(shared_index):
+            raise IndexError("Time series do not have the same index, use align_series() first.")
+    
+    # Build the panel with a single copy of the values
+    values = np.column_stack([s.data.values[:,0] for s in Series])
+    names = [s.name if s.name != "" else "TS " + str(i) for i,s in enumerate(Series)]
+    panel = pd.DataFrame(index=shared_index, data=values, columns=names)
+    
+    return panel
+
 
+def same_type_as(panel, Series):
+    """
+    Returns a panel as a TimeSeries when the original input was a TimeSeries,
+    and as it is otherwise.
+    """
+    
+    if isinstance(Series, TimeSeries):
+        return TimeSeries(panel, tz=Series.tz, unit=Series.unit, name=Series.name)
+    
+    return panel
+
+
+def lag_panel(Series, nlags):
+    """
+    Returns the lag (embedding) matrices of a panel of time series,
+    stacked in an array of shape (N, T-nlags+1, nlags).
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Panel of time series sharing the same index.
+    nlags : int
+      Number of lags, i.e. width of the embedding window.
+    
+    Returns
+    -------
+    numpy.ndarray
+      Read-only strided view on the panel values.
+    
+    Notes
+    -----
+      Element [i,t,j] is the value of series i at date t+j.
+      No copy is made when the panel values are stored in a single block,
+      which is the case for panels made with build_panel().
+    """
+    
+    # Checks
+    assert(isinstance(nlags, int) and nlags>0)
+    
+    # Initializations
+    values = build_panel(Series).values
+    T = values.shape[0]
+    if nlags > T:
+        raise ValueError("nlags cannot exceed the number of dates.")
     
+    # Window along time axis, then put series first
+    windows = sliding_window_view(values, window_shape=nlags, axis=0)
     
-#---------#---------#---------#---------#---------#---------#---------#---------#---------#
\ No newline at end of file
+    return windows.transpose(1,0,2)
+
+
+def lag_batches(Series, nlags, batch_size=100, difference=0, normalize=None):
+    """
+    Yields the lag matrices of a panel of time series by batches of series,
+    applying the differencing and normalization only to the batch at hand.
+    
+    Parameters
+    ----------
+    Series : TimeSeries, list of TimeSeries or DataFrame
+      Panel of time series sharing the same index.
+    nlags : int
+      Number of lags, i.e. width of the embedding window.
+    batch_size : int
+      Number of series per batch.
+    difference : int
+      Order of differencing applied to the values before embedding.
+    normalize : None, 'series' or 'window'
+      Normalization (zero mean and unit variance) applied per series
+      or per window (i.e. per row of the lag matrix).
+      Constant series or windows are mapped to zeros.
+    
+    Returns
+    -------
+    Generator of (list of str, numpy.ndarray)
+      Names of the series in the batch and stacked lag matrix
+      of shape (n_batch * (T-difference-nlags+1), nlags).
+    
+    Notes
+    -----
+      Rows of the stacked lag matrix are ordered series by series,
+      then by date, so that a batch can be fed directly to a model.
+      Only one batch of values is materialized at a time.
+    """
+    
+    # Checks
+    assert(isinstance(batch_size, int) and batch_size>0)
+    assert(isinstance(difference, int) and difference>=0)
+    if normalize not in [None, 'series', 'window']:
+        raise ValueError("normalize must be None, 'series' or 'window'.")
+    
+    # Initializations
+    panel = build_panel(Series)
+    values = panel.values
+    names = panel.columns.tolist()
+    N = values.shape[1]
+    
+    # Loop over batches of series
+    for i in range(0, N, batch_size):
+        x = values[:,i:i+batch_size]
+        if difference > 0:
+            x = np.diff(x, n=difference, axis=0)
+        if normalize == 'series':
+            std = x.std(axis=0)
+            x = np.where(std > 0, (x - x.mean(axis=0)) / np.where(std > 0, std, 1.), 0.)
+        windows = sliding_window_view(x, window_shape=nlags, axis=0).transpose(1,0,2)
+        if normalize == 'window':
+            std = windows.std(axis=2, keepdims=True)
+            windows = np.where(std > 0, (windows - windows.mean(axis=2, keepdims=True))
+                                        / np.where(std > 0, std, 1.), 0.)
+        yield names[i:i+batch_size], windows.reshape(-1, nlags)
+    
+    
+    
+    
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
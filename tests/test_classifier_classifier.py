@@ -0,0 +1,62 @@
+# Solving relative path problem
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(__file__), '..'))
+
+# Import Unittest
+import unittest
+
+# Import my package
+import numpy as np
+import pandas as pd
+from scifin.timeseries import timeseries as ts
+from scifin.classifier import classifier as cl
+    
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+class TestEntropies(unittest.TestCase):
+    """
+    Tests sample and approximate entropies against O(n^2) brute force.
+    """
+    
+    def setUp(self):
+        
+        self.x = np.random.default_rng(0).normal(size=300)
+        self.idx = pd.date_range('2020-01-01', periods=300, freq='D')
+        self.ts1 = ts.TimeSeries(pd.DataFrame(index=self.idx, data=self.x))
+    
+    
+    def distances(self, k, n_templates):
+        templates = np.array([self.x[i:i+k] for i in range(n_templates)])
+        return np.abs(templates[:,None] - templates[None]).max(axis=2)
+    
+    
+    def brute_force(self, m, r):
+        
+        # Sample entropy: pairs i<j among the first N-m templates
+        N = len(self.x)
+        B = (np.sum(self.distances(m, N-m) <= r) - (N-m)) / 2
+        A = (np.sum(self.distances(m+1, N-m) <= r) - (N-m)) / 2
+        sampen = -np.log(A / B)
+        
+        # Approximate entropy: self-matches included
+        phi = [np.mean(np.log(np.mean(self.distances(k, N-k+1) <= r, axis=1))) for k in [m, m+1]]
+        
+        return sampen, phi[0] - phi[1]
+    
+    
+    def test_entropies(self):
+        
+        for m in [1, 2]:
+            sampen, apen = self.brute_force(m, 0.2 * np.std(self.x))
+            self.assertAlmostEqual(cl.sample_entropy(self.ts1, m=m), sampen)
+            self.assertAlmostEqual(cl.approximate_entropy(self.ts1, m=m), apen)
+        
+        features = cl.entropy_features(pd.DataFrame({'a': self.x}, index=self.idx))
+        self.assertAlmostEqual(features.loc['a', 'sample_entropy'], cl.sample_entropy(self.ts1))
+
+
+if __name__ == '__main__':
+    unittest.main()
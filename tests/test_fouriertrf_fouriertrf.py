@@ -0,0 +1,57 @@
+# Solving relative path problem
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(__file__), '..'))
+
+# Import Unittest
+import unittest
+
+# Import my package
+import numpy as np
+import pandas as pd
+from scifin.timeseries import timeseries as ts
+from scifin.fouriertrf import fouriertrf as ft
+    
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+class TestCrossCorrelation(unittest.TestCase):
+    """
+    Tests FFT cross-correlations against numpy and injected shifts.
+    """
+    
+    def setUp(self):
+        
+        # The second series follows the first one with a delay of 5 dates
+        rng = np.random.default_rng(0)
+        z = rng.normal(size=305)
+        self.x = z[5:]
+        self.y = z[:-5] + 0.1 * rng.normal(size=300)
+        idx = pd.date_range('2020-01-01', periods=300, freq='D')
+        self.ts1 = ts.TimeSeries(pd.DataFrame(index=idx, data=self.x), name="TS1")
+        self.ts2 = ts.TimeSeries(pd.DataFrame(index=idx, data=self.y), name="TS2")
+    
+    
+    def test_cross_correlation(self):
+        
+        xcorr = ft.cross_correlation(self.ts1, self.ts2)
+        xs = (self.x - self.x.mean()) / self.x.std()
+        ys = (self.y - self.y.mean()) / self.y.std()
+        expected = np.correlate(ys, xs, mode='full') / len(xs)
+        self.assertTrue(np.allclose(xcorr.values, expected))
+        self.assertEqual(xcorr.index[0], -299)
+    
+    
+    def test_lead_lag(self):
+        
+        lag, corr = ft.lead_lag(self.ts1, self.ts2, max_lag=20)
+        self.assertEqual(lag, 5)
+        self.assertGreater(corr, 0.9)
+        lags, _ = ft.lead_lag_panel([self.ts1, self.ts2], max_lag=20)
+        self.assertEqual(lags.loc['TS1', 'TS2'], 5)
+        self.assertEqual(lags.loc['TS2', 'TS1'], -5)
+
+
+if __name__ == '__main__':
+    unittest.main()
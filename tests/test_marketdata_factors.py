@@ -0,0 +1,80 @@
+# Solving relative path problem
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(__file__), '..'))
+
+# Import Unittest
+import unittest
+
+# Import my package
+import numpy as np
+import pandas as pd
+from scifin.marketdata import factors
+    
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+class TestRollingRegression(unittest.TestCase):
+    """
+    Tests rolling regressions against per-window least squares.
+    """
+    
+    def setUp(self):
+        
+        # Two factors and three assets, one of them with a missing value
+        rng = np.random.default_rng(0)
+        idx = pd.date_range('2020-01-01', periods=80, freq='D')
+        F = rng.normal(size=(80,2))
+        Y = 0.1 + F @ np.array([[1., 0.5, -1.], [0.2, -0.3, 2.]]) + 0.1 * rng.normal(size=(80,3))
+        Y[30,2] = np.nan
+        self.factors = pd.DataFrame(F, index=idx, columns=['F1', 'F2'])
+        self.assets = pd.DataFrame(Y, index=idx, columns=['A', 'B', 'C'])
+        self.window = 20
+    
+    
+    def lstsq(self, i, t):
+        y = self.assets.values[t-self.window+1:t+1, i]
+        X = np.column_stack([np.ones(self.window), self.factors.values[t-self.window+1:t+1]])
+        keep = np.isfinite(y)
+        coefs, ssr, _, _ = np.linalg.lstsq(X[keep], y[keep], rcond=None)
+        return coefs, np.sqrt(ssr[0] / (keep.sum() - 3))
+    
+    
+    def test_rolling_regression(self):
+        
+        res = factors.rolling_regression(self.assets, self.factors, window=self.window,
+                                         min_periods=15)
+        for i in range(3):
+            for t in [self.window-1, 35, 79]:
+                coefs, resid_vol = self.lstsq(i, t)
+                self.assertAlmostEqual(res['alpha'].iloc[t,i], coefs[0])
+                self.assertAlmostEqual(res['betas']['F1'].iloc[t,i], coefs[1])
+                self.assertAlmostEqual(res['betas']['F2'].iloc[t,i], coefs[2])
+                self.assertAlmostEqual(res['resid_vol'].iloc[t,i], resid_vol)
+        self.assertTrue(res['alpha'].iloc[:14].isnull().values.all())
+    
+    
+    def test_missing_values_stay_local(self):
+        
+        res = factors.rolling_regression(self.assets, self.factors, window=self.window)
+        missing = res['alpha']['C'].isnull().values
+        self.assertTrue(missing[30:30+self.window].all())
+        self.assertFalse(missing[30+self.window:].any())
+        self.assertFalse(res['alpha'][['A', 'B']].iloc[self.window-1:].isnull().values.any())
+    
+    
+    def test_constant_factor(self):
+        
+        # The first factor is zero on dates 40 to 59 included
+        factors_df = self.factors.copy()
+        factors_df.iloc[40:60, 0] = 0.
+        res = factors.rolling_regression(self.assets, factors_df, window=self.window)
+        for f in ['F1', 'F2']:
+            self.assertTrue(res['betas'][f].iloc[59].isnull().all())
+            self.assertFalse(res['betas'][f].iloc[[58, 60]].isnull().values.any())
+        self.assertTrue(res['r2'].iloc[59].isnull().all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+# Solving relative path problem
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(__file__), '..'))
+
+# Import Unittest
+import unittest
+
+# Import my package
+import numpy as np
+from scifin.timeseries import randomseries as rs
+from scifin.montecarlo import montecarlo as mc
+    
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+class TestGenerateSeries(unittest.TestCase):
+    """
+    Tests the reproducibility of generated series across processes.
+    """
+    
+    def setUp(self):
+        self.kwargs = {'start_date': '2020-01-01', 'end_date': '2020-02-01', 'frequency': 'D',
+                       'start_value': 0., 'sigma': 1., 'verbose': False}
+    
+    
+    def test_seed_and_n_jobs(self):
+        
+        L1 = mc.generate_series(4, rs.random_walk, seed=3, **self.kwargs)
+        L2 = mc.generate_series(4, rs.random_walk, seed=3, n_jobs=2, **self.kwargs)
+        values1 = np.array([x.data.values[:,0] for x in L1])
+        values2 = np.array([x.data.values[:,0] for x in L2])
+        self.assertTrue(np.array_equal(values1, values2))
+        self.assertFalse(np.array_equal(values1[0], values1[1]))
+
+    
+    def test_simulate_panel(self):
+        
+        # Vectorized model
+        kwargs = {'start_date': '2020-01-01', 'end_date': '2020-02-01', 'frequency': 'D',
+                  'start_value': 0., 'theta': 2., 'mu': 0., 'sigma': 1.}
+        P1 = mc.simulate_panel(7, rs.ornstein_uhlenbeck, seed=5, chunk_size=3, **kwargs)
+        P2 = mc.simulate_panel(7, rs.ornstein_uhlenbeck, seed=5, chunk_size=3, n_jobs=2, **kwargs)
+        self.assertEqual(P1.shape, (32,7))
+        self.assertEqual(P1.index[0], np.datetime64('2020-01-01'))
+        self.assertTrue(np.array_equal(P1.values, P2.values))
+        self.assertEqual(len(np.unique(P1.values[-1])), 7)
+        
+        # Model called path by path, with the global random state
+        np.random.seed(0)
+        before = np.random.get_state()[1].copy()
+        P1 = mc.simulate_panel(5, legacy_random_walk, seed=5, chunk_size=2, **self.kwargs)
+        self.assertTrue(np.array_equal(np.random.get_state()[1], before))
+        P2 = mc.simulate_panel(5, legacy_random_walk, seed=5, chunk_size=2, n_jobs=2, **self.kwargs)
+        self.assertEqual(P1.shape, (32,5))
+        self.assertTrue(np.array_equal(P1.values, P2.values))
+
+
+
+def legacy_random_walk(start_date, end_date, frequency, start_value, sigma, verbose=True):
+    """
+    Random walk drawing from the global NumPy random state, without a seed argument.
+    """
+    return rs.random_walk(start_date, end_date, frequency, start_value, sigma, verbose=verbose)
+
+
+
+class TestAggregators(unittest.TestCase):
+    """
+    Tests the streaming aggregators against statistics of the full sample.
+    """
+    
+    def setUp(self):
+        self.X = np.random.default_rng(0).standard_normal((5000, 20))
+    
+    
+    def test_RunningMoments(self):
+        agg = mc.RunningMoments()
+        for chunk in np.array_split(self.X, 7):
+            agg.update(chunk)
+        res = agg.result()
+        self.assertTrue(np.allclose(res['mean'], self.X.mean(axis=0)))
+        self.assertTrue(np.allclose(res['std'], self.X.std(axis=0, ddof=1)))
+    
+    
+    def test_P2Quantiles(self):
+        agg = mc.P2Quantiles([0.1, 0.5, 0.9])
+        agg.update(self.X)
+        exact = np.quantile(self.X, [0.1, 0.5, 0.9], axis=0).T
+        self.assertLess(np.abs(agg.result().values - exact).max(), 0.1)
+    
+    
+    def test_HistogramQuantiles(self):
+        
+        agg = mc.HistogramQuantiles([0.1, 0.5, 0.9], bins=500)
+        for chunk in np.array_split(self.X, 4):
+            agg.update(chunk)
+        exact = np.quantile(self.X, [0.1, 0.5, 0.9], axis=0)
+        self.assertTrue(np.all(np.abs(agg.quantiles() - exact) < 2 * agg.width))
+        self.assertEqual(agg.counts.sum() + agg.underflow.sum() + agg.overflow.sum(), self.X.size)
+    
+    
+    def test_HistogramQuantiles_nan_and_short_chunks(self):
+        
+        # NaN values and chunks of 10 paths, shorter than n_init
+        X = self.X.copy()
+        X[::10, 3] = np.nan
+        agg = mc.HistogramQuantiles([0.1, 0.5, 0.9], bins=500, n_init=100)
+        agg.update(X[:10])
+        self.assertTrue(np.allclose(agg.quantiles(), np.nanquantile(X[:10], [0.1, 0.5, 0.9], axis=0)))
+        for chunk in np.array_split(X[10:], 499):
+            agg.update(chunk)
+        exact = np.nanquantile(X, [0.1, 0.5, 0.9], axis=0)
+        self.assertTrue(np.all(np.abs(agg.quantiles() - exact) < 2 * agg.width))
+        self.assertEqual(agg.counts.sum() + agg.underflow.sum() + agg.overflow.sum(), np.isfinite(X).sum())
+    
+    
+    def test_aggregate_series(self):
+        
+        kwargs = {'start_date': '2020-01-01', 'end_date': '2020-02-01', 'frequency': 'D',
+                  'start_value': 0., 'theta': 2., 'mu': 0., 'sigma': 1.}
+        panel = mc.simulate_panel(3000, rs.ornstein_uhlenbeck, seed=1, chunk_size=1000, **kwargs)
+        moments, quantiles = mc.aggregate_series(3000, rs.ornstein_uhlenbeck,
+                                                 [mc.RunningMoments(), mc.HistogramQuantiles([0.5])],
+                                                 seed=1, chunk_size=1000, **kwargs)
+        self.assertTrue(quantiles.index.equals(panel.index))
+        self.assertTrue(np.allclose(moments['mean'].values, panel.mean(axis=1).values))
+        self.assertTrue(np.allclose(quantiles[0.5].values, panel.median(axis=1).values, atol=0.01))
+    
+    
+    def test_StreamingHistogram(self):
+        agg = mc.StreamingHistogram(bins=20, range=(-2, 2), terminal=False)
+        for chunk in np.array_split(self.X, 3):
+            agg.update(chunk)
+        counts, _ = np.histogram(self.X[:,4], bins=20, range=(-2, 2))
+        self.assertTrue(np.array_equal(agg.counts[4], counts))
+        self.assertEqual(agg.counts.sum() + agg.underflow.sum() + agg.overflow.sum(), self.X.size)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# Solving relative path problem
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(__file__), '..'))
+
+# Import Unittest
+import unittest
+
+# Import my package
+import numpy as np
+import pandas as pd
+from scifin.timeseries import timeseries as ts
+from scifin.timeseries import alignment as al
+    
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+
+
+class TestAlignSeries(unittest.TestCase):
+    """
+    Tests the alignment of time series with different indexes.
+    """
+    
+    def setUp(self):
+        
+        idx1 = pd.to_datetime(['2020-01-01 10:00:00', '2020-01-01 10:01:00', '2020-01-01 10:05:00'])
+        idx2 = pd.to_datetime(['2020-01-01 10:00:30', '2020-01-01 10:01:00', '2020-01-01 10:07:00'])
+        self.ts1 = ts.TimeSeries(pd.DataFrame(index=idx1, data=[1.,2.,3.]), name="A")
+        self.ts2 = ts.TimeSeries(pd.DataFrame(index=idx2, data=[10.,20.,30.]), name="B")
+        
+    
+    def test_merge_indexes(self):
+        
+        list_idx = [np.array([1,3,5]), np.array([2,3,6]), np.array([3,5,6])]
+        self.assertEqual(al.merge_indexes(list_idx, how='union').tolist(), [1,2,3,5,6])
+        self.assertEqual(al.merge_indexes(list_idx, how='intersection').tolist(), [3])
+        
+    
+    def test_merge_indexes_repeated_values(self):
+        
+        list_idx = [np.array([1,1,3,5]), np.array([1,3,3,6])]
+        self.assertEqual(al.merge_indexes(list_idx, how='union').tolist(), [1,3,5,6])
+        self.assertEqual(al.merge_indexes(list_idx, how='intersection').tolist(), [1,3])
+        list_idx = [np.array([1,1]), np.array([2])]
+        self.assertEqual(al.merge_indexes(list_idx, how='intersection').tolist(), [])
+    
+    
+    def test_asof_values(self):
+        
+        idx = np.array([10, 20, 20, 40])
+        values = np.array([1., 2., 3., 4.])
+        grid = np.array([5, 20, 25, 30, 45])
+        out = al.asof_values(idx, values, grid)
+        self.assertTrue(np.allclose(out, [np.nan, 3., 3., 3., 4.], equal_nan=True))
+        out = al.asof_values(idx, values, grid, tolerance=5)
+        self.assertTrue(np.allclose(out, [np.nan, 3., 3., np.nan, 4.], equal_nan=True))
+        out = al.asof_values(idx[:0], values[:0], grid, tolerance=5)
+        self.assertTrue(np.isnan(out).all() and len(out) == 5)
+    
+    
+    def test_union(self):
+        
+        panel = al.align_series([self.ts1, self.ts2], how='union')
+        self.assertEqual(panel.shape, (5,2))
+        self.assertTrue(np.isnan(panel['B'].iloc[0]))
+        self.assertEqual(panel['A'].tolist(), [1.,1.,2.,3.,3.])
+        self.assertEqual(panel['B'].tolist()[1:], [10.,20.,20.,30.])
+        
+        
+    def test_reference_tolerance(self):
+        
+        grid = pd.date_range(start='2020-01-01 10:00', periods=5, freq='2min')
+        panel = al.align_series([self.ts1, self.ts2], how='reference',
+                                reference=grid, tolerance='1min')
+        self.assertEqual(panel['A'].iloc[1], 2.)
+        self.assertTrue(np.isnan(panel['A'].iloc[2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
+    
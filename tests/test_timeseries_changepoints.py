@@ -0,0 +1,82 @@
+# Solving relative path problem
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(__file__), '..'))
+
+# Import Unittest
+import unittest
+
+# Import my package
+import numpy as np
+import pandas as pd
+import scifin.timeseries as timeseries
+from scifin.timeseries import timeseries as ts
+from scifin.timeseries import changepoints as cp
+    
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+class TestChangepoints(unittest.TestCase):
+    """
+    Tests the recovery of known break points in piecewise-constant series.
+    """
+    
+    def setUp(self):
+        
+        # Piecewise-constant series with breaks at 100 and 250
+        rng = np.random.default_rng(0)
+        self.x = np.concatenate([np.zeros(100), 3.*np.ones(150), -1.*np.ones(100)]) \
+                 + 0.5 * rng.normal(size=350)
+        self.idx = pd.date_range('2020-01-01', periods=350, freq='D')
+        self.ts1 = ts.TimeSeries(pd.DataFrame(index=self.idx, data=self.x), name="TS1")
+    
+    
+    def test_module_not_shadowed(self):
+        
+        from scifin.timeseries import changepoints
+        self.assertTrue(hasattr(changepoints, 'pelt'))
+        self.assertTrue(callable(timeseries.detect_changepoints))
+    
+    
+    def test_pelt(self):
+        
+        self.assertEqual(cp.pelt(self.x, model='mean'), [100, 250])
+        self.assertEqual(cp.pelt(self.x), [100, 250])
+    
+    
+    def test_discretized_values(self):
+        
+        # Rounding to a tick gives segments of equal values with a zero variance
+        rng = np.random.default_rng(1)
+        x = np.round(rng.normal(size=500), 1)
+        self.assertEqual(cp.pelt(x), [])
+        self.assertEqual(cp.binary_segmentation(x), [])
+        self.assertEqual(cp.pelt(np.round(self.x, 1)), [100, 250])
+    
+    
+    def test_binary_segmentation(self):
+        
+        self.assertEqual(cp.binary_segmentation(self.x), [100, 250])
+        self.assertEqual(cp.binary_segmentation(self.x, n_bkps=1), [250])
+    
+    
+    def test_detect_changepoints(self):
+        
+        dates = cp.detect_changepoints(self.ts1, method='binseg')
+        self.assertEqual(dates.tolist(), self.idx[[100, 250]].tolist())
+        cts = cp.detect_changepoints(self.ts1, as_cat=True)
+        self.assertEqual(cts.data.values[[99, 100, 250], 0].tolist(),
+                         ['Segment 0', 'Segment 1', 'Segment 2'])
+    
+    
+    def test_changepoints_panel(self):
+        
+        panel = pd.DataFrame(index=self.idx, data=np.stack([self.x, self.x[::-1]], axis=1))
+        segments = cp.changepoints_panel(panel)
+        self.assertEqual(np.flatnonzero(np.diff(segments.values[:,0])).tolist(), [99, 249])
+        self.assertEqual(np.flatnonzero(np.diff(segments.values[:,1])).tolist(), [99, 249])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# Solving relative path problem
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(__file__), '..'))
+
+# Import Unittest
+import unittest
+
+# Import my package
+import numpy as np
+import pandas as pd
+from scifin.timeseries import timeseries as ts
+from scifin.timeseries import cleaning as cl
+    
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+class TestCleaning(unittest.TestCase):
+    """
+    Tests the detection and filling of gaps and the Hampel filter.
+    """
+    
+    def setUp(self):
+        
+        # Daily series with two gaps (2020-01-03 and 2020-01-06/07)
+        idx = pd.DatetimeIndex(['2020-01-01', '2020-01-02', '2020-01-04', '2020-01-05',
+                                '2020-01-08', '2020-01-09'])
+        self.ts1 = ts.TimeSeries(pd.DataFrame(index=idx, data=[1., 2., 4., 5., 8., 9.]), name="TS1")
+        
+        # Minute series with off-grid timestamps
+        idx = pd.DatetimeIndex(['2020-01-01 00:00:00', '2020-01-01 00:01:00', '2020-01-01 00:02:00',
+                                '2020-01-01 00:03:30', '2020-01-01 00:04:30'])
+        self.ts2 = ts.TimeSeries(pd.DataFrame(index=idx, data=[1., 2., 3., 4., 5.]), name="TS2")
+    
+    
+    def test_detect_gaps(self):
+        
+        gaps = cl.detect_gaps(self.ts1)
+        self.assertEqual(gaps['n_missing'].tolist(), [1, 2])
+        self.assertEqual(gaps['start'].tolist(), [pd.Timestamp('2020-01-03'), pd.Timestamp('2020-01-06')])
+        self.assertEqual(gaps['end'].tolist(), [pd.Timestamp('2020-01-03'), pd.Timestamp('2020-01-07')])
+    
+    
+    def test_fill_gaps(self):
+        
+        filled = cl.fill_gaps(self.ts1, method='ffill')
+        self.assertIsInstance(filled, ts.TimeSeries)
+        self.assertEqual(filled.data.values[:,0].tolist(), [1., 2., 2., 4., 5., 5., 5., 8., 9.])
+        filled = cl.fill_gaps(self.ts1, method='interpolate')
+        self.assertEqual(filled.data.values[:,0].tolist(), [1., 2., 3., 4., 5., 6., 7., 8., 9.])
+    
+    
+    def test_off_grid_values_are_kept(self):
+        
+        filled = cl.fill_gaps(self.ts2, method='ffill')
+        self.assertEqual(filled.data.loc['2020-01-01 00:03:30'].iloc[0], 4.)
+        self.assertEqual(filled.data.loc['2020-01-01 00:04:30'].iloc[0], 5.)
+        self.assertEqual(filled.data.loc['2020-01-01 00:04:00'].iloc[0], 4.)
+        _, report = cl.clean_series(self.ts2)
+        self.assertEqual(report.loc['TS2', 'off_grid_values'], 2)
+        self.assertEqual(report.loc['TS2', 'dates_added'], 2)
+    
+    
+    def test_hampel_filter(self):
+        
+        idx = pd.date_range('2020-01-01', periods=100, freq='D')
+        x = np.random.default_rng(0).normal(size=100)
+        x[50] = 20.
+        filtered, outliers = cl.hampel_filter(ts.TimeSeries(pd.DataFrame(index=idx, data=x)), window=11, n_sigmas=5.)
+        self.assertEqual(np.flatnonzero(outliers.values[:,0]).tolist(), [50])
+        self.assertLess(abs(filtered.data.values[50,0]), 1.)
+    
+    
+    def test_hampel_after_filled_gap(self):
+        
+        # Ten missing dates forward-filled, followed by normal moves and one outlier
+        idx = pd.date_range('2020-01-01', periods=40, freq='D')
+        x = 100. + np.random.default_rng(2).normal(size=40)
+        x[30] = 110.
+        panel = pd.DataFrame(index=idx, data=x, columns=['TS4']).drop(idx[10:20])
+        filtered, outliers = cl.hampel_filter(cl.fill_gaps(panel), window=11)
+        self.assertEqual(np.flatnonzero(outliers.values[:,0]).tolist(), [30])
+        self.assertTrue(np.allclose(filtered.values[20:30,0], x[20:30]))
+    
+    
+    def test_clean_series_report(self):
+        
+        # Two missing dates, one NaN value and one outlier
+        idx = pd.date_range('2020-01-01', periods=60, freq='D')
+        x = np.random.default_rng(1).normal(size=60)
+        x[30] = 20.
+        x[10] = np.nan
+        panel = pd.DataFrame(index=idx, data=x, columns=['TS3']).drop(idx[[20, 21]])
+        cleaned, report = cl.clean_series(panel, method='ffill', window=11, n_sigmas=5.)
+        self.assertEqual(report.loc['TS3'].tolist(), [2, 3, 1, 0])
+        self.assertEqual(len(cleaned), 60)
+        self.assertFalse(cleaned.isnull().values.any())
+
+
+if __name__ == '__main__':
+    unittest.main()
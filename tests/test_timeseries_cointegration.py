@@ -0,0 +1,52 @@
+# Solving relative path problem
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(__file__), '..'))
+
+# Import Unittest
+import unittest
+
+# Import my package
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.stattools import coint
+from scifin.timeseries import cointegration as co
+    
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+class TestCointegration(unittest.TestCase):
+    """
+    Tests the Engle-Granger scanner against statsmodels.
+    """
+    
+    def setUp(self):
+        
+        # Two series sharing a common stochastic trend, and an independent one
+        rng = np.random.default_rng(0)
+        T = 500
+        w = np.cumsum(rng.normal(size=T))
+        self.panel = pd.DataFrame({'A': w + rng.normal(size=T),
+                                   'B': 0.5*w + rng.normal(size=T),
+                                   'C': np.cumsum(rng.normal(size=T))},
+                                  index=pd.date_range('2020-01-01', periods=T, freq='D'))
+    
+    
+    def test_cointegration_scan(self):
+        
+        table = co.cointegration_scan(self.panel, nlags=1)
+        self.assertEqual(table.loc[0, ['series_y', 'series_x']].tolist(), ['A', 'B'])
+        for _, row in table.iterrows():
+            stat, pvalue, _ = coint(self.panel[row['series_y']], self.panel[row['series_x']],
+                                    trend='c', maxlag=1, autolag=None)
+            self.assertAlmostEqual(row['adf_stat'], stat)
+            self.assertAlmostEqual(row['pvalue'], pvalue)
+        
+        # Same results with several processes
+        table2 = co.cointegration_scan(self.panel, nlags=1, n_jobs=2, chunk_size=1)
+        self.assertTrue(np.allclose(table['adf_stat'], table2['adf_stat']))
+
+
+if __name__ == '__main__':
+    unittest.main()
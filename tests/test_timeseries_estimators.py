@@ -0,0 +1,80 @@
+# Solving relative path problem
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(__file__), '..'))
+
+# Import Unittest
+import unittest
+
+# Import my package
+import numpy as np
+import pandas as pd
+from scifin.timeseries import randomseries as rs
+from scifin.timeseries import estimators as es
+    
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+
+
+class TestEstimators(unittest.TestCase):
+    """
+    Tests the estimation of AR and GARCH models on simulated panels.
+    """
+    
+    def test_ar_estimators(self):
+        
+        panel = rs.auto_regressive('2000-01-01', '2010-12-31', 'D', [0.,0.], 1., 2, [0.5,-0.3], 1.,
+                                   n_paths=3, seed=0, verbose=False)
+        yw = es.yule_walker(panel, 2)
+        bg = es.burg(panel, 2)
+        
+        self.assertEqual(yw.shape, (3,4))
+        self.assertTrue(np.allclose(yw[['coeff_1','coeff_2']], [0.5,-0.3], atol=0.05))
+        self.assertTrue(np.allclose(bg[['coeff_1','coeff_2']], yw[['coeff_1','coeff_2']], atol=0.01))
+    
+    
+    def test_hannan_rissanen(self):
+        
+        panel = rs.arma('2000-01-01', '2010-12-31', 'D', [0.], 1., 1, [0.5], 1, [0.3], 1.,
+                        n_paths=3, seed=0, verbose=False)
+        hr = es.hannan_rissanen(panel, 1, 1)
+        
+        self.assertEqual(hr.columns.tolist(), ['cst', 'ARcoeff_1', 'MAcoeff_1', 'sigma'])
+        self.assertTrue(np.allclose(hr[['ARcoeff_1','MAcoeff_1','sigma']], [0.5,0.3,1.], atol=0.05))
+        self.assertTrue(np.allclose(hr['cst'], 1., atol=0.1))
+    
+    
+    def test_fit_garch(self):
+        
+        panel = rs.garch('2000-01-01', '2010-12-31', 'D', 0.1, 1, [0.1], 1, [0.8],
+                         n_paths=3, seed=0, verbose=False)
+        fit = es.fit_garch(panel)
+        
+        self.assertTrue(np.allclose(fit['mean'], 0., atol=0.05))
+        self.assertTrue(np.allclose(fit[['cst','coeff_a_1','coeff_sig_1']].mean(), [0.1,0.1,0.8], atol=0.05))
+        self.assertTrue(np.allclose(fit['coeff_a_1'] + fit['coeff_sig_1'], 0.9, atol=0.05))
+        
+        # The objective is separable: a series alone gives the same fit
+        single = es.fit_garch(panel[[panel.columns[0]]])
+        self.assertTrue(np.allclose(single.values[0,:4], fit.values[0,:4], atol=1e-2))
+        self.assertAlmostEqual(single['loglik'].iloc[0], fit['loglik'].iloc[0], places=2)
+    
+    
+    def test_garch_gradient(self):
+        
+        A = np.random.default_rng(0).normal(size=(200,2))
+        params = np.array([[0.1,0.2], [0.1,0.05], [0.8,0.7]])
+        _, grad = es.garch_loglikelihood(params, A)
+        
+        for k in range(3):
+            h = np.zeros_like(params)
+            h[k] = 1e-6
+            up = es.garch_loglikelihood(params + h, A, gradient=False)[0]
+            down = es.garch_loglikelihood(params - h, A, gradient=False)[0]
+            self.assertTrue(np.allclose(grad[k], (up - down) / 2e-6, atol=1e-4))
+
+
+if __name__ == '__main__':
+    unittest.main()
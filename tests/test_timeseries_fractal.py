@@ -0,0 +1,49 @@
+# Solving relative path problem
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(__file__), '..'))
+
+# Import Unittest
+import unittest
+
+# Import my package
+import numpy as np
+import pandas as pd
+from scifin.timeseries import timeseries as ts
+from scifin.timeseries import randomseries as rs
+from scifin.timeseries import fractal
+    
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+class TestFractal(unittest.TestCase):
+    """
+    Tests the Hurst exponents on white noise and fractional Gaussian noise.
+    """
+    
+    def test_white_noise(self):
+        
+        panel = pd.DataFrame(np.random.default_rng(0).normal(size=(4096,3)))
+        self.assertTrue(np.allclose(fractal.hurst_rs(panel).values, 0.5, atol=0.08))
+        self.assertTrue(np.allclose(fractal.dfa(panel).values, 0.5, atol=0.05))
+        idx = pd.date_range('2020-01-01', periods=4096, freq='D')
+        s = ts.TimeSeries(pd.DataFrame(index=idx, data=panel[0].values))
+        self.assertIsInstance(fractal.dfa(s), float)
+    
+    
+    def test_fractional_gaussian_noise(self):
+        
+        estimates = {}
+        for hurst in [0.3, 0.7]:
+            panel = pd.DataFrame(rs.davies_harte(4096, hurst, n_paths=3, seed=1).T)
+            self.assertTrue(np.allclose(fractal.dfa(panel).values, hurst, atol=0.06))
+            estimates[hurst] = fractal.hurst_rs(panel).values
+        
+        # R/S is known to be biased towards 0.5 for anti-persistent series
+        self.assertTrue(np.allclose(estimates[0.7], 0.7, atol=0.06))
+        self.assertTrue(np.all(estimates[0.3] < 0.45))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+# Solving relative path problem
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(__file__), '..'))
+
+# Import Unittest
+import unittest
+
+# Import my package
+import numpy as np
+import pandas as pd
+from scifin.timeseries import timeseries as ts
+from scifin.timeseries import indicators as ind
+    
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+
+
+class TestIndicators(unittest.TestCase):
+    """
+    Tests technical indicators against their pandas definitions.
+    """
+    
+    def setUp(self):
+        
+        np.random.seed(0)
+        idx = pd.date_range('2020-01-01', periods=100)
+        self.panel = pd.DataFrame(index=idx, data=100+np.cumsum(np.random.normal(size=(100,3)), axis=0))
+    
+    
+    def test_ema_sma(self):
+        
+        ema = ind.ema(self.panel, span=10)
+        sma = ind.sma(self.panel, 20)
+        
+        self.assertTrue(np.allclose(ema.values, self.panel.ewm(span=10, adjust=False).mean().values))
+        self.assertTrue(np.allclose(sma.values[19:], self.panel.rolling(20).mean().values[19:]))
+    
+    
+    def test_bollinger_on_timeseries(self):
+        
+        s = ts.TimeSeries(self.panel[[0]], name="A")
+        middle, upper, lower = ind.bollinger_bands(s, window=20)
+        
+        self.assertIsInstance(upper, ts.TimeSeries)
+        self.assertTrue(np.allclose((upper.data - middle.data).values[19:],
+                                    2*self.panel[[0]].rolling(20).std(ddof=0).values[19:]))
+    
+    
+    def test_missing_value_stays_local(self):
+        
+        panel = self.panel.copy()
+        panel.iloc[30,0] = np.nan
+        sma = ind.sma(panel, 20)
+        self.assertTrue(np.allclose(sma.values[19:], panel.rolling(20).mean().values[19:], equal_nan=True))
+        self.assertTrue(sma.iloc[30:50,0].isnull().all())
+        self.assertFalse(sma.iloc[50:,0].isnull().any())
+        _, upper, _ = ind.bollinger_bands(panel, window=20)
+        self.assertFalse(upper.iloc[50:].isnull().values.any())
+    
+    
+    def test_missing_value_in_recursions(self):
+        
+        panel = self.panel.copy()
+        panel.iloc[30,0] = np.nan
+        ema = ind.ema(panel, span=10)
+        expected = panel.ewm(span=10, adjust=False, ignore_na=True).mean()
+        self.assertTrue(np.isnan(ema.iloc[30,0]))
+        self.assertTrue(np.allclose(ema.drop(ema.index[30]).values,
+                                    expected.drop(expected.index[30]).values))
+        self.assertTrue(np.allclose(ema.iloc[:,1:].values, self.panel.ewm(span=10, adjust=False).mean().values[:,1:]))
+        rsi = ind.rsi(panel, period=14)
+        self.assertEqual(rsi.iloc[:,0].isnull().sum(), 3)
+        line, sig, hist = ind.macd(panel)
+        self.assertFalse(sig.iloc[31:].isnull().values.any())
+    
+    
+    def test_stochastic_flat_range(self):
+        
+        # Flat prices for 20 dates in the middle of the series
+        close = self.panel.copy()
+        close.iloc[40:60] = 100.
+        K, D = ind.stochastic(close, close, close, k_window=14, d_window=3)
+        self.assertTrue(np.allclose(K.values[53:60], 50.))
+        self.assertFalse(D.iloc[15:].isnull().values.any())
+    
+    
+    
+    
+    
+
+    
+if __name__ == '__main__':
+    unittest.main()
+    
@@ -0,0 +1,198 @@
+# Solving relative path problem
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(__file__), '..'))
+
+# Import Unittest
+import unittest
+
+# Import my package
+import contextlib
+import io
+import numpy as np
+import pandas as pd
+from scifin.timeseries import randomseries as rs
+    
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+
+
+class TestFilters(unittest.TestCase):
+    """
+    Tests the vectorized filters against explicit recursions.
+    """
+    
+    def setUp(self):
+        
+        np.random.seed(0)
+        self.u = np.random.normal(size=(3,50))
+        self.coeffs = 0.1 * np.random.normal(size=(3,50,2))
+    
+    
+    def test_ar_filter(self):
+        
+        x = rs.ar_filter(self.u, [0.5,-0.2], [1.,2.])
+        t = 10
+        self.assertTrue(np.allclose(x[:,:2], [1.,2.]))
+        self.assertTrue(np.allclose(x[:,t], self.u[:,t] + 0.5*x[:,t-1] - 0.2*x[:,t-2]))
+    
+    
+    def test_random_coefficient_filter(self):
+        
+        x = rs.random_coefficient_filter(self.u, [0.5,-0.2], self.coeffs)
+        t = 10
+        expected = self.u[:,t] + (0.5 + self.coeffs[:,t,0]) * x[:,t-1] \
+                               + (-0.2 + self.coeffs[:,t,1]) * x[:,t-2]
+        self.assertTrue(np.allclose(x[:,0], self.u[:,0]))
+        self.assertTrue(np.allclose(x[:,t], expected))
+    
+    
+    def test_garch_paths(self):
+        
+        eps = np.random.normal(size=(20,4))
+        a, sig = rs.garch_paths(0.1, [0.2], [0.5], 20, n_paths=4, eps=eps)
+        t = 5
+        self.assertTrue(np.allclose(sig[t]**2, 0.1 + 0.2*a[t-1]**2 + 0.5*sig[t-1]**2))
+        self.assertTrue(np.allclose(a, sig*eps))
+    
+    
+    def test_davies_harte(self):
+        
+        X = rs.davies_harte(256, 0.8, n_paths=2001, seed=0)
+        lag1 = np.mean(X[:,:-1] * X[:,1:])
+        self.assertEqual(X.shape, (2001,256))
+        self.assertAlmostEqual(lag1, rs.fgn_autocovariances(0.8, 1)[1], places=1)
+
+
+
+class TestSeeds(unittest.TestCase):
+    """
+    Tests the reproducibility and independence of random streams.
+    """
+    
+    def setUp(self):
+        self.kwargs = {'start_date': '2020-01-01', 'end_date': '2020-03-01', 'frequency': 'D',
+                       'start_values': [0.], 'cst': 0., 'order': 1, 'coeffs': [0.5], 'sigma': 1.,
+                       'verbose': False}
+    
+    
+    def test_same_seed(self):
+        
+        x1 = rs.auto_regressive(seed=42, **self.kwargs)
+        x2 = rs.auto_regressive(seed=42, **self.kwargs)
+        x3 = rs.auto_regressive(seed=43, **self.kwargs)
+        self.assertTrue(np.array_equal(x1.data.values, x2.data.values))
+        self.assertFalse(np.array_equal(x1.data.values, x3.data.values))
+        self.assertTrue(np.array_equal(rs.get_generator(7).normal(size=5),
+                                       rs.get_generator(7).normal(size=5)))
+        g = np.random.default_rng(0)
+        self.assertIs(rs.get_generator(g), g)
+    
+    
+    def test_spawned_generators(self):
+        
+        draws = np.array([g.normal(size=100) for g in rs.spawn_generators(3, seed=0)])
+        self.assertFalse(np.array_equal(draws[0], draws[1]))
+        self.assertLess(np.abs(np.corrcoef(draws)[0,1:]).max(), 0.3)
+        again = np.array([g.normal(size=100) for g in rs.spawn_generators(3, seed=0)])
+        self.assertTrue(np.array_equal(draws, again))
+
+
+
+
+class TestOutputs(unittest.TestCase):
+    """
+    Tests the array outputs and the quiet mode of the generators.
+    """
+    
+    def setUp(self):
+        self.dates = {'start_date': '2020-01-01', 'end_date': '2020-01-31', 'frequency': 'D'}
+    
+    
+    def test_as_array_shapes(self):
+        
+        x = rs.random_walk(start_value=0., sigma=1., as_array=True, verbose=False, **self.dates)
+        self.assertEqual(x.shape, (31,))
+        x = rs.constant(cst=1., as_array=True, verbose=False, **self.dates)
+        self.assertEqual(x.shape, (31,))
+        x = rs.arma(start_values=[0.], cst=0., ARorder=1, ARcoeffs=[0.5], MAorder=1, MAcoeffs=[0.2],
+                    sigma=1., n_paths=4, as_array=True, verbose=False, **self.dates)
+        self.assertEqual(x.shape, (4,31))
+        x = rs.charma(order=1, cov_matrix=[[0.1]], sigma=1., as_array=True, verbose=False, **self.dates)
+        self.assertEqual(x.shape, (31,))
+    
+    
+    def test_cached_date_index(self):
+        
+        rs.date_index.cache_clear()
+        rs.random_walk(start_value=0., sigma=1., verbose=False, **self.dates)
+        rs.random_walk(start_value=0., sigma=1., verbose=False, **self.dates)
+        info = rs.date_index.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+        self.assertIs(rs.date_index(*self.dates.values()), rs.date_index(*self.dates.values()))
+    
+    
+    def test_quiet_mode(self):
+        
+        for verbose in [True, False]:
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                rs.rca(cst=0., order=1, ARcoeffs=[0.5], cov_matrix=[[0.1]], sigma=1.,
+                       verbose=verbose, **self.dates)
+            self.assertEqual(len(out.getvalue()) > 0, verbose)
+        
+        # Generators that were silent stay silent by default
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            rs.constant(cst=1., **self.dates)
+            rs.random_walk(start_value=0., sigma=1., **self.dates)
+            rs.drift_random_walk(start_value=0., drift=0.1, sigma=1., **self.dates)
+            rs.arma(start_values=[0.], cst=0., ARorder=1, ARcoeffs=[0.5], MAorder=1, MAcoeffs=[0.2],
+                    sigma=1., **self.dates)
+            rs.rca(cst=0., order=1, ARcoeffs=[0.5], cov_matrix=[[0.1]], sigma=1., **self.dates)
+            rs.charma(order=1, cov_matrix=[[0.1]], sigma=1., **self.dates)
+        self.assertEqual(out.getvalue(), "")
+
+
+
+class TestContinuousTime(unittest.TestCase):
+    """
+    Tests the moments of the continuous-time models against closed forms.
+    """
+    
+    def test_continuous_time_moments(self):
+        
+        # Ornstein-Uhlenbeck: exact mean and variance at the last date
+        dates = {'start_date': '2020-01-01', 'end_date': '2021-01-01', 'frequency': 'D'}
+        x = rs.ornstein_uhlenbeck(start_value=1., theta=3., mu=0.5, sigma=0.4, n_paths=20000,
+                                  seed=0, as_array=True, chunk_size=7000, **dates)
+        tau = rs.year_fractions(rs.date_index(*dates.values())).sum()
+        self.assertAlmostEqual(np.mean(x[:,-1]), 0.5 + 0.5*np.exp(-3.*tau), places=2)
+        self.assertLess(abs(np.var(x[:,-1]) / (0.16 * (1 - np.exp(-6.*tau)) / 6.) - 1.), 0.05)
+        
+        # Merton: mean and variance of the total log-return
+        S = rs.merton_jump_diffusion(start_value=1., drift=0.05, sigma=0.2, jump_rate=2.,
+                                     jump_mean=-0.1, jump_std=0.15, n_paths=20000, seed=1,
+                                     as_array=True, **dates)
+        k = np.exp(-0.1 + 0.5*0.15**2) - 1.
+        r = np.log(S[:,-1])
+        self.assertAlmostEqual(np.mean(r), (0.05 - 0.02 - 2.*k)*tau - 0.2*tau, places=2)
+        self.assertLess(abs(np.var(r) / (0.04*tau + 2.*tau*(0.15**2 + 0.1**2)) - 1.), 0.05)
+        
+        # Heston: non-negative variance reverting to its long-term mean
+        _, v = rs.heston(start_value=1., drift=0., v0=0.09, kappa=2., theta=0.04, xi=0.5, rho=-0.7,
+                         n_paths=20000, seed=2, as_array=True, return_variance=True, **dates)
+        self.assertTrue(np.all(v >= 0.))
+        self.assertAlmostEqual(np.mean(v[:,-1]), 0.04 + 0.05*np.exp(-2.*tau), places=3)
+    
+    
+    
+    
+    
+
+    
+if __name__ == '__main__':
+    unittest.main()
+    
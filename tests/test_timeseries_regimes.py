@@ -0,0 +1,72 @@
+# Solving relative path problem
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(__file__), '..'))
+
+# Import Unittest
+import unittest
+
+# Import my package
+import itertools
+import numpy as np
+import pandas as pd
+from scifin.timeseries import regimes as rg
+    
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+class TestRegimes(unittest.TestCase):
+    """
+    Tests the Gaussian HMM against brute force and known regimes.
+    """
+    
+    def setUp(self):
+        
+        # Tiny model with 2 states, for brute force enumeration
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(1,6))
+        self.means = np.array([[-0.5, 0.8]])
+        self.variances = np.array([[0.5, 1.5]])
+        self.log_pi = np.log(np.array([[0.6, 0.4]]))
+        self.log_A = np.log(np.array([[[0.7, 0.3], [0.2, 0.8]]]))
+    
+    
+    def path_log_probas(self, log_b):
+        paths = list(itertools.product(range(2), repeat=self.X.shape[1]))
+        scores = [self.log_pi[0,p[0]] + log_b[0,0,p[0]]
+                  + sum(self.log_A[0,p[t-1],p[t]] + log_b[0,t,p[t]] for t in range(1,len(p)))
+                  for p in paths]
+        return paths, np.array(scores)
+    
+    
+    def test_viterbi_and_likelihood(self):
+        
+        log_b = rg.log_gaussian_densities(self.X, self.means, self.variances)
+        paths, scores = self.path_log_probas(log_b)
+        states = rg.viterbi(log_b, self.log_pi, self.log_A)
+        self.assertEqual(tuple(states[0]), paths[np.argmax(scores)])
+        _, _, loglik = rg.forward_backward(log_b, self.log_pi, self.log_A)
+        self.assertAlmostEqual(loglik[0], np.log(np.sum(np.exp(scores))))
+    
+    
+    def test_recovers_regimes(self):
+        
+        # Sticky two-state chain with well separated means
+        rng = np.random.default_rng(1)
+        T = 1000
+        states = np.zeros(T, dtype=int)
+        for t in range(1, T):
+            states[t] = states[t-1] if rng.random() < 0.98 else 1 - states[t-1]
+        x = np.array([-2., 2.])[states] + rng.normal(size=T)
+        panel = pd.DataFrame(index=pd.date_range('2020-01-01', periods=T, freq='D'),
+                             data=np.stack([x, -x], axis=1))
+        regimes, _, params = rg.hmm_regimes(panel, n_states=2)
+        self.assertGreater(np.mean(regimes.values[:,0] == states), 0.98)
+        self.assertGreater(np.mean(regimes.values[:,1] == 1 - states), 0.98)
+        self.assertTrue(np.allclose(params['means'][0], [-2., 2.], atol=0.2))
+        self.assertTrue(np.allclose(np.diagonal(params['transmat'][0]), 0.98, atol=0.02))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# Solving relative path problem
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(__file__), '..'))
+
+# Import Unittest
+import unittest
+
+# Import my package
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.holtwinters import ExponentialSmoothing
+from statsmodels.tsa.exponential_smoothing.ets import ETSModel
+from scifin.timeseries import smoothing as sm
+    
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+class TestHoltWinters(unittest.TestCase):
+    """
+    Tests Holt-Winters fits and forecasts against statsmodels.
+    """
+    
+    def setUp(self):
+        
+        # Seasonal series with a trend
+        rng = np.random.default_rng(0)
+        self.m = 12
+        t = np.arange(120)
+        self.y = 10 + 0.1*t + 3*np.sin(2*np.pi*t/self.m) + rng.normal(scale=0.5, size=120)
+        self.idx = pd.date_range('2020-01-01', periods=120, freq='MS')
+        
+        # Statsmodels model with the same initial states
+        level, slope, season = sm.initial_states(self.y[None], self.m, 'add', 'add')
+        self.model = ExponentialSmoothing(pd.Series(self.y, self.idx), trend='add', seasonal='add',
+                                          seasonal_periods=self.m, initialization_method='known',
+                                          initial_level=level[0], initial_trend=slope[0],
+                                          initial_seasonal=season[0])
+    
+    
+    def test_fit_and_forecast(self):
+        
+        params = sm.fit_holt_winters(self.y[None], period=self.m, trend='add', seasonal='add')
+        alpha, beta, gamma, _ = params[0]
+        res = sm.holt_winters_recursion(self.y[None], alpha, beta, gamma, period=self.m,
+                                        trend='add', seasonal='add')
+        
+        # Same recursions for the same parameters
+        fit = self.model.fit(smoothing_level=alpha, smoothing_trend=beta,
+                             smoothing_seasonal=gamma*(1-alpha), optimized=False)
+        self.assertTrue(np.allclose(res['fitted'][0], fit.fittedvalues.values))
+        forecast = sm.holt_winters_forecast(pd.DataFrame({'y': self.y}, index=self.idx), self.m-1,
+                                            trend='add', seasonal='add', period=self.m, params=params)[0]
+        self.assertTrue(np.allclose(forecast.values[:,0], fit.forecast(self.m-1).values))
+        
+        # Fitted SSE close to the statsmodels optimum
+        best = self.model.fit()
+        self.assertLess(res['sse'][0], 1.01 * best.sse)
+    
+    
+    def test_prediction_intervals(self):
+        
+        params = sm.fit_holt_winters(self.y[None], period=self.m, trend='add', seasonal='add')
+        alpha, beta, gamma, _ = params[0]
+        forecast, lower, upper = sm.holt_winters_forecast(pd.DataFrame({'y': self.y}, index=self.idx),
+                                                          2*self.m, trend='add', seasonal='add',
+                                                          period=self.m, params=params, level=0.95)
+        
+        # Error-correction form: beta -> alpha beta, gamma -> gamma (1 - alpha)
+        level, slope, season = sm.initial_states(self.y[None], self.m, 'add', 'add')
+        model = ETSModel(pd.Series(self.y, self.idx), error='add', trend='add', seasonal='add',
+                         seasonal_periods=self.m, initialization_method='known',
+                         initial_level=level[0], initial_trend=slope[0], initial_seasonal=season[0])
+        fit = model.smooth([alpha, alpha*beta, gamma*(1-alpha)])
+        pred = fit.get_prediction(start=len(self.y), end=len(self.y)+2*self.m-1).summary_frame(alpha=0.05)
+        self.assertTrue(np.allclose(forecast.values[:,0], pred['mean'].values))
+        self.assertTrue(np.allclose(lower.values[:,0], pred['pi_lower'].values))
+        self.assertTrue(np.allclose(upper.values[:,0], pred['pi_upper'].values))
+    
+    
+    def test_chunked_grid_search(self):
+        
+        Y = np.stack([self.y, self.y[::-1], 2*self.y])
+        full = sm.fit_holt_winters(Y, period=self.m, trend='add', seasonal='add')
+        chunked = sm.fit_holt_winters(Y, period=self.m, trend='add', seasonal='add', chunk_size=1)
+        self.assertTrue(np.allclose(full, chunked))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+# Solving relative path problem
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(__file__), '..'))
+
+# Import Unittest
+import unittest
+
+# Import my package
+import numpy as np
+from statsmodels.tsa.statespace.structural import UnobservedComponents
+from scifin.timeseries import statespace as ss
+    
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+
+
+class TestKalmanFilter(unittest.TestCase):
+    """
+    Tests the Kalman filter and smoother against statsmodels.
+    """
+    
+    def setUp(self):
+        
+        rng = np.random.default_rng(0)
+        self.y = np.cumsum(rng.normal(0., 0.5, 200)) + rng.normal(0., 1., 200)
+        self.y[50:60] = np.nan
+        
+    
+    def test_local_level(self):
+        
+        res = ss.kalman_filter(self.y, 1., [0.25], model='level')
+        ref = UnobservedComponents(self.y, 'local level').smooth([1., 0.25])
+        self.assertTrue(np.allclose(res['smoothed'][0,:,0], ref.smoothed_state[0], atol=1e-5))
+        self.assertAlmostEqual(res['loglik'][0], ref.llf, places=4)
+        
+        
+    def test_local_trend(self):
+        
+        res = ss.kalman_filter(self.y, 1., [0.2, 0.01], model='trend')
+        ref = UnobservedComponents(self.y, 'local linear trend').smooth([1., 0.2, 0.01])
+        self.assertTrue(np.allclose(res['smoothed'][0,:,0], ref.smoothed_state[0], atol=1e-5))
+        self.assertAlmostEqual(res['loglik'][0], ref.llf, places=4)
+    
+    
+    
+    
+    
+
+    
+if __name__ == '__main__':
+    unittest.main()
+    
@@ -0,0 +1,151 @@
+# Solving relative path problem
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(__file__), '..'))
+
+# Import Unittest
+import unittest
+
+# Import my package
+import numpy as np
+import pandas as pd
+from scifin.timeseries import timeseries as ts
+from scifin.timeseries import caching
+    
+
+#---------#---------#---------#---------#---------#---------#---------#---------#---------#
+
+
+
+
+class TestLagMatrix(unittest.TestCase):
+    """
+    Tests the lag matrices of TimeSeries and panels.
+    """
+    
+    def setUp(self):
+        
+        # For the later tests
+        idx = pd.date_range(start='2020-01-01', periods=20, freq='D')
+        self.ts1 = ts.TimeSeries(pd.DataFrame(index=idx, data=np.arange(20.)), name="TS1")
+        self.ts2 = ts.TimeSeries(pd.DataFrame(index=idx, data=np.arange(20.)**2), name="TS2")
+        
+    
+    def test_lag_matrix(self):
+        
+        m = self.ts1.lag_matrix(nlags=3)
+        self.assertEqual(m.shape, (18,3))
+        self.assertEqual(m[4].tolist(), [4.,5.,6.])
+        self.assertTrue(np.shares_memory(m, self.ts1.data.values))
+        
+        
+    def test_lag_panel(self):
+        
+        panel = ts.build_panel([self.ts1, self.ts2])
+        self.assertEqual(panel.columns.tolist(), ["TS1", "TS2"])
+        lp = ts.lag_panel(panel, nlags=4)
+        self.assertEqual(lp.shape, (2,17,4))
+        self.assertEqual(lp[1,2].tolist(), [4.,9.,16.,25.])
+        
+        
+    def test_lag_batches(self):
+        
+        batches = list(ts.lag_batches([self.ts1, self.ts2], nlags=2, batch_size=1, difference=1))
+        self.assertEqual(len(batches), 2)
+        self.assertEqual(batches[0][0], ["TS1"])
+        self.assertEqual(batches[0][1].shape, (18,2))
+        self.assertTrue(np.allclose(batches[0][1], 1.))
+        
+        
+    def test_rolling_avg(self):
+        
+        values = np.arange(10.)
+        values[2] = np.nan
+        s = ts.TimeSeries(pd.DataFrame(index=pd.date_range('2020-01-01', periods=10), data=values))
+        avg = s.rolling_avg(pts=3).data.values.flatten()
+        expected = pd.Series(values).rolling(3).mean().values[2:]
+        self.assertTrue(np.allclose(avg, expected, equal_nan=True))
+        self.assertEqual(np.isnan(avg).sum(), 3)
+    
+    
+    def test_lag_checks_and_constant_series(self):
+        
+        with self.assertRaises(ValueError):
+            self.ts1.lag_matrix(nlags=21)
+        idx = self.ts1.data.index
+        cst = ts.TimeSeries(pd.DataFrame(index=idx, data=np.ones(20)), name="CST")
+        for normalize in ['series', 'window']:
+            _, x = next(ts.lag_batches([cst, self.ts1], nlags=3, batch_size=2, normalize=normalize))
+            self.assertTrue(np.all(np.isfinite(x)))
+            self.assertTrue(np.allclose(x[:18], 0.))
+        
+
+
+class TestTimeWeighted(unittest.TestCase):
+    """
+    Tests the time-weighted methods of TimeSeries.
+    """
+    
+    def setUp(self):
+        
+        # Irregularly sampled series
+        idx = pd.DatetimeIndex(['2020-01-01 00:00:00', '2020-01-01 00:00:01',
+                                '2020-01-01 00:00:04', '2020-01-01 00:00:05'])
+        self.ts1 = ts.TimeSeries(pd.DataFrame(index=idx, data=[1.,2.,4.,8.]))
+        
+    
+    def test_sampling(self):
+        
+        self.assertFalse(self.ts1.is_sampling_uniform())
+        self.assertEqual(self.ts1.time_weights()[1].tolist(), [1.,3.,1.,0.])
+        
+    
+    def test_time_weighted_stats(self):
+        
+        self.assertAlmostEqual(self.ts1.time_weighted_avg(), 2.2)
+        self.assertAlmostEqual(self.ts1.time_weighted_variance(), 0.96)
+        self.assertAlmostEqual(self.ts1.realized_vol(), np.sqrt(3)*np.log(2))
+        with self.assertRaises(ValueError):
+            self.ts1.time_weighted_avg(start='2020-01-01 00:00:04', end='2020-01-01 00:00:04')
+    
+    
+
+class TestFitCache(unittest.TestCase):
+    """
+    Tests the caching of fits of TimeSeries.
+    """
+    
+    def setUp(self):
+        
+        idx = pd.date_range(start='2020-01-01', periods=50, freq='D')
+        self.ts1 = ts.TimeSeries(pd.DataFrame(index=idx, data=np.arange(50.)**2))
+        self.cache = caching.enable_fit_cache()
+    
+    def tearDown(self):
+        
+        caching.disable_fit_cache()
+    
+    
+    def test_hits_and_invalidation(self):
+        
+        fit1 = self.ts1.polyfit(order=2)
+        fit2 = self.ts1.polyfit(order=2)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertTrue(np.allclose(fit1.data.values, fit2.data.values))
+        
+        # Changing the data or the parameters changes the key
+        self.ts1.data.iloc[0,0] = 1.
+        self.ts1.polyfit(order=2)
+        self.ts1.polyfit(order=1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 3))
+    
+    
+    
+    
+    
+    
+
+    
+if __name__ == '__main__':
+    unittest.main()
+    